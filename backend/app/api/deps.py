@@ -3,13 +3,27 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db  # re-export
+from app.database.session import get_db, get_read_db  # re-export
+from app.database.writer import Writer, get_writer  # re-export
 from app.models.user import User
 
 
-def get_current_user(db: Session = Depends(get_db)) -> User:
-    """Return the single default user. Swap for auth later."""
+def _default_user(db: Session) -> User:
     user = db.query(User).first()
     if user is None:
         raise HTTPException(status_code=500, detail="No default user found. Run seed.")
     return user
+
+
+def get_current_user(db: Session = Depends(get_db)) -> User:
+    """Return the single default user. Swap for auth later."""
+    return _default_user(db)
+
+
+def get_current_user_read(db: Session = Depends(get_read_db)) -> User:
+    """get_current_user for read-only routes, resolved on the get_read_db session.
+
+    Keeps those requests off the write engine entirely; FastAPI shares the
+    session with the route's own get_read_db dependency.
+    """
+    return _default_user(db)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 
+from app.core.config import settings
 from app.api.v1.categories import router as categories_router
 from app.api.v1.rewards import router as rewards_router
 from app.api.v1.wishes import router as wishes_router
@@ -16,6 +17,12 @@ from app.api.v1.achievements import router as achievements_router
 
 api_router = APIRouter(prefix="/api/v1")
 
+if settings.ASYNC_DB:
+    # Registered first so the async read routes take precedence
+    from app.api.v1.async_reads import router as async_reads_router
+
+    api_router.include_router(async_reads_router)
+
 api_router.include_router(categories_router)
 api_router.include_router(rewards_router)
 api_router.include_router(wishes_router)
@@ -27,3 +34,9 @@ api_router.include_router(power_router)
 api_router.include_router(analytics_router)
 api_router.include_router(status_router)
 api_router.include_router(achievements_router)
+
+if settings.ADMIN_ENABLED:
+    # Maintenance runs and backups have no user auth; opt-in only
+    from app.api.v1.admin import router as admin_router
+
+    api_router.include_router(admin_router)
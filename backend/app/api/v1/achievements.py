@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user_read, get_read_db
 from app.models.achievement import Achievement
 from app.models.user import User
 from app.schemas.achievement import AchievementResponse
@@ -13,8 +13,8 @@ router = APIRouter(prefix="/achievements", tags=["achievements"])
 
 @router.get("/", response_model=list[AchievementResponse])
 def list_achievements(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
     """Return all achievements for the current user, ordered by unlock date descending."""
     achievements = (
@@ -0,0 +1,91 @@
+"""Admin endpoints — database maintenance status, manual runs, and backups.
+
+Only mounted when ADMIN_ENABLED is set; with ADMIN_TOKEN configured every
+request must also send it in the X-Admin-Token header.
+"""
+
+import secrets
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.core.config import settings
+from app.database.backup import backup_from_settings, list_backups, sqlite_path
+from app.database.maintenance import get_maintenance_scheduler
+from app.schemas.admin import (
+    BackupFile,
+    BackupResponse,
+    MaintenanceStatus,
+    MaintenanceTaskStatus,
+)
+
+
+
+def require_admin_token(x_admin_token: str | None = Header(default=None)) -> None:
+    """Reject requests without the configured ADMIN_TOKEN (no-op when unset)."""
+    expected = settings.ADMIN_TOKEN
+    if expected and not secrets.compare_digest(x_admin_token or "", expected):
+        raise HTTPException(status_code=403, detail="Invalid or missing admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/maintenance", response_model=MaintenanceStatus)
+def maintenance_status():
+    scheduler = get_maintenance_scheduler()
+    if scheduler is None:
+        return MaintenanceStatus(enabled=False)
+    return MaintenanceStatus(
+        enabled=True,
+        idle_seconds=scheduler.idle_seconds,
+        tasks=scheduler.status(),
+    )
+
+
+@router.post("/maintenance/{task}", response_model=MaintenanceTaskStatus)
+def run_maintenance_task(task: str):
+    scheduler = get_maintenance_scheduler()
+    if scheduler is None:
+        raise HTTPException(status_code=409, detail="Maintenance scheduler is not running")
+    if task not in scheduler.tasks:
+        raise HTTPException(status_code=404, detail=f"Unknown maintenance task {task!r}")
+    scheduler.run_task(task)
+    return next(s for s in scheduler.status() if s["name"] == task)
+
+
+def _database_file() -> Path:
+    try:
+        return sqlite_path(settings.DATABASE_URL)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from None
+
+
+@router.post("/backup", response_model=BackupResponse, status_code=201)
+def create_backup():
+    _database_file()
+    result = backup_from_settings()
+    return BackupResponse(
+        path=str(result.path),
+        size_bytes=result.size_bytes,
+        pages=result.pages,
+        duration_ms=result.duration_ms,
+        removed=[str(path) for path in result.removed],
+    )
+
+
+@router.get("/backups", response_model=list[BackupFile])
+def get_backups():
+    stem = _database_file().stem
+    files = []
+    for path in list_backups(Path(settings.BACKUP_DIR), stem):
+        stat = path.stat()
+        files.append(
+            BackupFile(
+                name=path.name,
+                size_bytes=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            )
+        )
+    return files
@@ -1,13 +1,14 @@
-"""Analytics endpoints — summary stats, capsule history, wish history, off-day summary, completion trends."""
+"""Analytics endpoints — summary stats, capsule history, wish history, off-day summary,
+completion trends, rolling rates, weekday heatmap and per-habit completion matrix."""
 
 from datetime import date, timedelta
 from typing import Literal
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user_read, get_read_db
 from app.models.capsule_drop import CapsuleDrop
 from app.models.daily_log import DailyLog
 from app.models.habit import Habit
@@ -17,230 +18,345 @@ from app.models.streak import Streak
 from app.models.user import User
 from app.models.wish import Wish
 from app.models.wish_log import WishLog
+from app.services.analytics_engine import (
+    load_daily_series,
+    load_habit_matrix,
+    rolling_completion_rate,
+    weekday_totals,
+)
+from app.services.rollup_service import RollupTotals, period_totals, period_totals_query
 from app.schemas.analytics import (
     AnalyticsSummary,
     CapsuleHistoryItem,
     CompletionTrend,
+    HabitCompletionMatrix,
+    HabitCompletionRow,
     OffDaySummary,
+    RollingCompletionDay,
+    WeekdayStat,
     WishHistoryItem,
 )
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-@router.get("/summary", response_model=AnalyticsSummary)
-def analytics_summary(
-    period: Literal["week", "month", "all"] = Query(default="all"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
-    today = date.today()
+# Each report below is split into the statements it runs and a function that
+# shapes their rows, so the async routes (api/v1/async_reads.py) await the
+# very same queries on an AsyncSession.
 
-    query = db.query(DailyLog).filter(DailyLog.user_id == user.id)
 
-    if period == "week":
-        start = (today - timedelta(days=7)).isoformat()
-        query = query.filter(DailyLog.log_date >= start)
-    elif period == "month":
-        start = (today - timedelta(days=30)).isoformat()
-        query = query.filter(DailyLog.log_date >= start)
+def _period_start(period: str) -> str | None:
+    """First day of a week/month report period ending today; None for all."""
+    days = {"week": 7, "month": 30}.get(period)
+    return (date.today() - timedelta(days=days)).isoformat() if days else None
 
-    logs = query.all()
 
-    perfect_days = sum(1 for dl in logs if dl.is_perfect_day)
-    avg_completion = (
-        sum(dl.habit_completion_rate for dl in logs) / len(logs) if logs else 0.0
+# ── Summary ─────────────────────────────────────────────────────────────
+
+
+def summary_queries(user_id, period: str):
+    """(period totals statement or None, longest streak statement)."""
+    return (
+        period_totals_query(user_id, _period_start(period)),
+        select(Streak.best_streak).where(Streak.user_id == user_id).limit(1),
     )
-    total_xp = sum(dl.xp_earned for dl in logs)
-    days_tracked = len(logs)
 
-    # Longest streak
-    streak = db.query(Streak).filter(Streak.user_id == user.id).first()
-    longest_streak = streak.best_streak if streak else 0
 
+def summary_response(totals: RollupTotals, longest_streak: int | None) -> AnalyticsSummary:
     return AnalyticsSummary(
-        perfect_days=perfect_days,
-        avg_completion=round(avg_completion, 4),
-        total_xp=total_xp,
-        days_tracked=days_tracked,
-        longest_streak=longest_streak,
+        perfect_days=totals.perfect_days,
+        avg_completion=round(totals.avg_completion_rate, 4),
+        total_xp=totals.xp_earned,
+        days_tracked=totals.days_tracked,
+        longest_streak=longest_streak or 0,
     )
 
 
-@router.get("/capsule-history", response_model=list[CapsuleHistoryItem])
-def capsule_history(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+@router.get("/summary", response_model=AnalyticsSummary)
+def analytics_summary(
+    period: Literal["week", "month", "all"] = Query(default="all"),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
-    drops = (
-        db.query(CapsuleDrop, Reward, Habit)
+    totals_query, streak_query = summary_queries(user.id, period)
+    totals = RollupTotals.from_rows(db.execute(totals_query) if totals_query is not None else [])
+    return summary_response(totals, db.scalar(streak_query))
+
+
+# ── Capsule and wish history ────────────────────────────────────────────
+
+
+def capsule_history_query(user_id):
+    return (
+        select(CapsuleDrop.id, Reward.title, Reward.rarity, Habit.title, CapsuleDrop.dropped_at)
         .join(Reward, CapsuleDrop.reward_id == Reward.id)
         .join(Habit, CapsuleDrop.habit_id == Habit.id)
-        .filter(CapsuleDrop.user_id == user.id)
+        .where(CapsuleDrop.user_id == user_id)
         .order_by(CapsuleDrop.dropped_at.desc())
-        .all()
     )
 
+
+def capsule_history_response(rows) -> list[CapsuleHistoryItem]:
     return [
         CapsuleHistoryItem(
-            id=drop.id,
-            reward_title=reward.title,
-            reward_rarity=reward.rarity,
-            habit_title=habit.title,
-            dropped_at=drop.dropped_at,
+            id=drop_id,
+            reward_title=reward_title,
+            reward_rarity=reward_rarity,
+            habit_title=habit_title,
+            dropped_at=dropped_at,
         )
-        for drop, reward, habit in drops
+        for drop_id, reward_title, reward_rarity, habit_title, dropped_at in rows
     ]
 
 
-@router.get("/wish-history", response_model=list[WishHistoryItem])
-def wish_history(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+@router.get("/capsule-history", response_model=list[CapsuleHistoryItem])
+def capsule_history(
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
-    logs = (
-        db.query(WishLog, Wish)
+    return capsule_history_response(db.execute(capsule_history_query(user.id)))
+
+
+def wish_history_query(user_id):
+    return (
+        select(WishLog.id, Wish.title, WishLog.granted_at)
         .join(Wish, WishLog.wish_id == Wish.id)
-        .filter(WishLog.user_id == user.id)
+        .where(WishLog.user_id == user_id)
         .order_by(WishLog.granted_at.desc())
-        .all()
     )
 
+
+def wish_history_response(rows) -> list[WishHistoryItem]:
     return [
-        WishHistoryItem(
-            id=log.id,
-            wish_title=wish.title,
-            granted_at=log.granted_at,
-        )
-        for log, wish in logs
+        WishHistoryItem(id=log_id, wish_title=wish_title, granted_at=granted_at)
+        for log_id, wish_title, granted_at in rows
     ]
 
 
-@router.get("/off-day-summary", response_model=OffDaySummary)
-def off_day_summary(
-    period: Literal["week", "month", "all"] = Query(default="all"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+@router.get("/wish-history", response_model=list[WishHistoryItem])
+def wish_history(
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
-    """Return off-day analytics: totals, XP impact, streaks preserved, reason breakdown."""
-    today = date.today()
+    return wish_history_response(db.execute(wish_history_query(user.id)))
+
+
+# ── Off days ────────────────────────────────────────────────────────────
+
+# An off day "preserved" a streak if there's a DailyLog on the day before OR the
+# day after. Dates are day numbers, so the neighbours are off_date -/+ 1 and the
+# probe is an index lookup on (user_id, log_date).
+_PRESERVED_COUNT = func.coalesce(
+    func.sum(
+        case(
+            (
+                select(DailyLog.id)
+                .where(
+                    DailyLog.user_id == OffDay.user_id,
+                    DailyLog.log_date.in_([OffDay.off_date - 1, OffDay.off_date + 1]),
+                )
+                .exists(),
+                1,
+            ),
+            else_=0,
+        )
+    ),
+    0,
+)
 
-    # Build off-day query with period filter
-    od_query = db.query(OffDay).filter(OffDay.user_id == user.id)
-    if period == "week":
-        start = (today - timedelta(days=7)).isoformat()
-        od_query = od_query.filter(OffDay.off_date >= start)
-    elif period == "month":
-        start = (today - timedelta(days=30)).isoformat()
-        od_query = od_query.filter(OffDay.off_date >= start)
 
-    off_days = od_query.all()
-    total_off_days = len(off_days)
+def off_day_query(user_id, period: str):
+    """Per-reason off-day counts and streaks preserved; totals are their sums."""
+    query = select(OffDay.reason, func.count(OffDay.id), _PRESERVED_COUNT).where(
+        OffDay.user_id == user_id
+    )
+    start = _period_start(period)
+    if start is not None:
+        query = query.where(OffDay.off_date >= start)
+    return query.group_by(OffDay.reason)
 
-    # XP impact estimate: avg daily XP * off-day count
-    all_logs = db.query(DailyLog).filter(DailyLog.user_id == user.id).all()
-    avg_daily_xp = sum(dl.xp_earned for dl in all_logs) / len(all_logs) if all_logs else 0
-    xp_impact_estimate = int(avg_daily_xp * total_off_days)
-
-    # Streaks preserved: off-days that fell between two active days
-    # An off-day "preserved" a streak if there's a DailyLog on the day before OR the day after
-    streaks_preserved = 0
-    for od in off_days:
-        od_date = date.fromisoformat(od.off_date)
-        day_before = (od_date - timedelta(days=1)).isoformat()
-        day_after = (od_date + timedelta(days=1)).isoformat()
-        has_before = (
-            db.query(DailyLog)
-            .filter(DailyLog.user_id == user.id, DailyLog.log_date == day_before)
-            .first()
-            is not None
-        )
-        has_after = (
-            db.query(DailyLog)
-            .filter(DailyLog.user_id == user.id, DailyLog.log_date == day_after)
-            .first()
-            is not None
-        )
-        if has_before or has_after:
-            streaks_preserved += 1
 
-    # Reason breakdown: dynamic GROUP BY
-    reason_counts = (
-        db.query(OffDay.reason, func.count(OffDay.id))
-        .filter(OffDay.user_id == user.id)
-    )
-    if period == "week":
-        start = (today - timedelta(days=7)).isoformat()
-        reason_counts = reason_counts.filter(OffDay.off_date >= start)
-    elif period == "month":
-        start = (today - timedelta(days=30)).isoformat()
-        reason_counts = reason_counts.filter(OffDay.off_date >= start)
-    reason_counts = reason_counts.group_by(OffDay.reason).all()
-    reason_breakdown = {reason: count for reason, count in reason_counts}
+def off_day_response(rows, totals: RollupTotals | None) -> OffDaySummary:
+    """Shape off_day_query() rows; totals (all-time) are only needed if there are off days."""
+    reason_breakdown = {reason: count for reason, count, _ in rows}
+    total_off_days = sum(reason_breakdown.values())
+
+    # XP impact estimate: avg daily XP * off-day count
+    xp_impact_estimate = 0
+    if totals is not None and totals.days_tracked:
+        xp_impact_estimate = int(totals.xp_earned / totals.days_tracked * total_off_days)
 
     return OffDaySummary(
         total_off_days=total_off_days,
         xp_impact_estimate=xp_impact_estimate,
-        streaks_preserved=streaks_preserved,
+        streaks_preserved=sum(preserved for _, _, preserved in rows),
         reason_breakdown=reason_breakdown,
     )
 
 
-@router.get("/completion-trend", response_model=CompletionTrend)
-def completion_trend(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+@router.get("/off-day-summary", response_model=OffDaySummary)
+def off_day_summary(
+    period: Literal["week", "month", "all"] = Query(default="all"),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
-    """Return weekly and monthly completion rates with period-over-period deltas."""
-    today = date.today()
+    """Return off-day analytics: totals, XP impact, streaks preserved, reason breakdown."""
+    rows = db.execute(off_day_query(user.id, period)).all()
+    totals = period_totals(db, user.id) if rows else None
+    return off_day_response(rows, totals)
 
-    def _aggregate_period(start_str: str, end_str: str) -> tuple[int, int, float]:
-        """Sum habits_due and habits_completed for a date range, return (due, completed, rate)."""
-        logs = (
-            db.query(DailyLog)
-            .filter(
-                DailyLog.user_id == user.id,
-                DailyLog.log_date >= start_str,
-                DailyLog.log_date < end_str,
-            )
-            .all()
-        )
-        due = sum(dl.habits_due for dl in logs)
-        completed = sum(dl.habits_completed for dl in logs)
-        rate = completed / due if due > 0 else 0.0
-        return due, completed, rate
 
-    # Weekly: last 7 days
-    week_start = (today - timedelta(days=7)).isoformat()
-    today_str = today.isoformat()
-    # Use today + 1 day as end to include today
-    tomorrow_str = (today + timedelta(days=1)).isoformat()
+# ── Completion trend ────────────────────────────────────────────────────
 
-    w_due, w_completed, w_rate = _aggregate_period(week_start, tomorrow_str)
 
-    # Previous week: 14-7 days ago
-    prev_week_start = (today - timedelta(days=14)).isoformat()
-    pw_due, pw_completed, pw_rate = _aggregate_period(prev_week_start, week_start)
+def completion_trend_query(user_id):
+    """One pass over the last 61 days summing habits_due/habits_completed per window."""
+    today = date.today()
+
+    def _days_ago(days: int) -> str:
+        return (today - timedelta(days=days)).isoformat()
+
+    # (first, last) day of each window; the current week and month include today
+    windows = {
+        "week": (_days_ago(7), _days_ago(0)),
+        "prev_week": (_days_ago(14), _days_ago(8)),
+        "month": (_days_ago(30), _days_ago(0)),
+        "prev_month": (_days_ago(60), _days_ago(31)),
+    }
+    buckets = []
+    for first, last in windows.values():
+        in_window = DailyLog.log_date.between(first, last)
+        buckets += [
+            func.coalesce(func.sum(case((in_window, DailyLog.habits_due), else_=0)), 0),
+            func.coalesce(func.sum(case((in_window, DailyLog.habits_completed), else_=0)), 0),
+        ]
+    return select(*buckets).where(
+        DailyLog.user_id == user_id,
+        DailyLog.log_date.between(_days_ago(60), _days_ago(0)),
+    )
 
-    weekly_delta = round(w_rate - pw_rate, 4)
 
-    # Monthly: last 30 days
-    month_start = (today - timedelta(days=30)).isoformat()
-    m_due, m_completed, m_rate = _aggregate_period(month_start, tomorrow_str)
+def completion_trend_response(row) -> CompletionTrend:
+    """Shape the single completion_trend_query() row."""
+    windows = ("week", "prev_week", "month", "prev_month")
+    counts = dict(zip(windows, zip(row[::2], row[1::2])))
 
-    # Previous month: 60-30 days ago
-    prev_month_start = (today - timedelta(days=60)).isoformat()
-    pm_due, pm_completed, pm_rate = _aggregate_period(prev_month_start, month_start)
+    def _rate(window: str) -> float:
+        due, completed = counts[window]
+        return completed / due if due > 0 else 0.0
 
-    monthly_delta = round(m_rate - pm_rate, 4)
+    w_due, w_completed = counts["week"]
+    m_due, m_completed = counts["month"]
 
     return CompletionTrend(
-        weekly_rate=round(w_rate, 4),
-        weekly_delta=weekly_delta,
+        weekly_rate=round(_rate("week"), 4),
+        weekly_delta=round(_rate("week") - _rate("prev_week"), 4),
         weekly_habits_due=w_due,
         weekly_habits_completed=w_completed,
-        monthly_rate=round(m_rate, 4),
-        monthly_delta=monthly_delta,
+        monthly_rate=round(_rate("month"), 4),
+        monthly_delta=round(_rate("month") - _rate("prev_month"), 4),
         monthly_habits_due=m_due,
         monthly_habits_completed=m_completed,
     )
+
+
+@router.get("/completion-trend", response_model=CompletionTrend)
+def completion_trend(
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
+):
+    """Return weekly and monthly completion rates with period-over-period deltas."""
+    return completion_trend_response(db.execute(completion_trend_query(user.id)).one())
+
+
+# ── Engine-backed reports ───────────────────────────────────────────────
+
+
+@router.get("/rolling-completion", response_model=list[RollingCompletionDay])
+def rolling_completion(
+    days: int = Query(default=90, ge=1, le=3650),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
+):
+    """Return rolling 7- and 30-day completion rates for each of the last `days` days."""
+    today = date.today()
+    start = (today - timedelta(days=days - 1)).isoformat()
+
+    # 29 extra days so the first day's 30-day window is complete
+    series = load_daily_series(
+        db, user.id, (today - timedelta(days=days + 28)).isoformat(), today.isoformat()
+    )
+    rate_7d = rolling_completion_rate(series, 7)[-days:]
+    rate_30d = rolling_completion_rate(series, 30)[-days:]
+
+    return [
+        RollingCompletionDay(date=day, rate_7d=round(r7, 4), rate_30d=round(r30, 4))
+        for day, r7, r30 in zip(series.since(start).dates(), rate_7d.tolist(), rate_30d.tolist())
+    ]
+
+
+@router.get("/weekday-heatmap", response_model=list[WeekdayStat])
+def weekday_heatmap(
+    days: int = Query(default=365, ge=7, le=3650),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
+):
+    """Return completion and XP totals per weekday (Mon=0 .. Sun=6) over the last `days` days."""
+    today = date.today()
+    series = load_daily_series(
+        db, user.id, (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+    )
+    totals = {name: values.tolist() for name, values in weekday_totals(series).items()}
+
+    stats = []
+    for weekday in range(7):
+        tracked = totals["days_tracked"][weekday]
+        due = totals["habits_due"][weekday]
+        completed = totals["habits_completed"][weekday]
+        stats.append(
+            WeekdayStat(
+                weekday=weekday,
+                days_tracked=tracked,
+                habits_due=due,
+                habits_completed=completed,
+                completion_rate=round(completed / due, 4) if due > 0 else 0.0,
+                avg_xp=round(totals["xp_earned"][weekday] / tracked, 2) if tracked else 0.0,
+                perfect_days=totals["perfect_days"][weekday],
+            )
+        )
+    return stats
+
+
+@router.get("/habit-matrix", response_model=HabitCompletionMatrix)
+def habit_matrix(
+    days: int = Query(default=30, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
+):
+    """Return a completed/not grid of every active habit over the last `days` days."""
+    today = date.today()
+    start = (today - timedelta(days=days - 1)).isoformat()
+    matrix = load_habit_matrix(db, user.id, start, today.isoformat())
+
+    return HabitCompletionMatrix(
+        start_date=start,
+        end_date=today.isoformat(),
+        habits=[
+            HabitCompletionRow(
+                habit_id=habit_id,
+                title=title,
+                completed=completed,
+                due_days=due_days,
+                completions=completions,
+                completion_rate=round(rate, 4),
+            )
+            for habit_id, title, completed, due_days, completions, rate in zip(
+                matrix.habit_ids,
+                matrix.titles,
+                matrix.completed.tolist(),
+                matrix.due_days().tolist(),
+                matrix.completions().tolist(),
+                matrix.completion_rates().tolist(),
+            )
+        ],
+    )
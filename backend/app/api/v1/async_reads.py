@@ -0,0 +1,179 @@
+"""Async variants of the read-heavy dashboard endpoints (ASYNC_DB=true).
+
+Each route awaits the same statements the sync handlers build (the
+*_query/*_response pairs in api/v1/analytics.py, habits.py and status.py,
+and the roast_service and quote_catalog pieces behind status) on an
+AsyncSession bound to the read-only engine, so the event loop is free while
+the database works and responses are identical to the sync routes. Mounted
+ahead of the sync routers, which it shadows.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1 import analytics, habits, power, status
+from app.core.dates import MONTH_PATTERN
+from app.database.async_session import get_async_db
+from app.models.user import User
+from app.schemas.analytics import (
+    AnalyticsSummary,
+    CalendarDay,
+    CapsuleHistoryItem,
+    CompletionTrend,
+    OffDaySummary,
+    WishHistoryItem,
+)
+from app.schemas.habit import HabitTodayResponse
+from app.schemas.power import AttributeDetail, PowerResponse
+from app.schemas.status import StatusResponse
+from app.services import roast_service
+from app.services.quote_catalog import (
+    QUOTE_CATALOG_QUERY,
+    QuoteCatalog,
+    install_quote_catalog,
+    installed_quote_catalog,
+)
+from app.services.rollup_service import RollupTotals, period_totals_query
+
+# Same paths and schemas as the sync routes, which stay the documented ones
+router = APIRouter(include_in_schema=False)
+
+
+async def get_async_current_user(db: AsyncSession = Depends(get_async_db)) -> User:
+    """Async counterpart of deps.get_current_user."""
+    user = await db.scalar(select(User).limit(1))
+    if user is None:
+        raise HTTPException(status_code=500, detail="No default user found. Run seed.")
+    return user
+
+
+async def _period_totals(db: AsyncSession, query) -> RollupTotals:
+    return RollupTotals.from_rows(await db.execute(query) if query is not None else [])
+
+
+# ── Analytics ───────────────────────────────────────────────────────────
+
+
+@router.get("/analytics/summary", response_model=AnalyticsSummary)
+async def analytics_summary(
+    period: Literal["week", "month", "all"] = Query(default="all"),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    totals_query, streak_query = analytics.summary_queries(user.id, period)
+    totals = await _period_totals(db, totals_query)
+    return analytics.summary_response(totals, await db.scalar(streak_query))
+
+
+@router.get("/analytics/capsule-history", response_model=list[CapsuleHistoryItem])
+async def capsule_history(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    rows = await db.execute(analytics.capsule_history_query(user.id))
+    return analytics.capsule_history_response(rows)
+
+
+@router.get("/analytics/wish-history", response_model=list[WishHistoryItem])
+async def wish_history(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    rows = await db.execute(analytics.wish_history_query(user.id))
+    return analytics.wish_history_response(rows)
+
+
+@router.get("/analytics/off-day-summary", response_model=OffDaySummary)
+async def off_day_summary(
+    period: Literal["week", "month", "all"] = Query(default="all"),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    rows = (await db.execute(analytics.off_day_query(user.id, period))).all()
+    totals = await _period_totals(db, period_totals_query(user.id)) if rows else None
+    return analytics.off_day_response(rows, totals)
+
+
+@router.get("/analytics/completion-trend", response_model=CompletionTrend)
+async def completion_trend(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    row = (await db.execute(analytics.completion_trend_query(user.id))).one()
+    return analytics.completion_trend_response(row)
+
+
+# ── Habits ──────────────────────────────────────────────────────────────
+
+
+@router.get("/habits/today/list", response_model=list[HabitTodayResponse])
+async def today_list(
+    local_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    rows = await db.execute(habits.today_list_query(user.id, local_date))
+    return habits.today_list_response(rows)
+
+
+@router.get("/habits/calendar/all", response_model=list[CalendarDay])
+async def calendar_all(
+    month: str = Query(..., pattern=MONTH_PATTERN),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    logs_query, off_days_query = habits.calendar_queries(user.id, month)
+    daily_logs = await db.execute(logs_query)
+    return habits.calendar_response(daily_logs, await db.scalars(off_days_query))
+
+
+# ── Status ──────────────────────────────────────────────────────────────
+
+
+async def _quote_catalog(db: AsyncSession) -> QuoteCatalog:
+    """The installed quote catalog, loaded through db on a miss."""
+    catalog = installed_quote_catalog()
+    if catalog is None:
+        catalog = install_quote_catalog(await db.execute(QUOTE_CATALOG_QUERY))
+    return catalog
+
+
+@router.get("/status/", response_model=StatusResponse)
+async def get_status(
+    local_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_async_current_user),
+):
+    last_active = await db.scalar(roast_service.last_active_query(user.id))
+    gap_days = roast_service.absence_gap_days(last_active, local_date)
+    off_day_count = 0
+    if gap_days > 1:
+        off_day_count = await db.scalar(
+            roast_service.gap_off_days_query(user.id, last_active, local_date)
+        )
+    gap_info = roast_service.absence_gap(gap_days, off_day_count)
+    catalog = await _quote_catalog(db) if gap_info["severity"] is not None else None
+    welcome = roast_service.welcome_status(catalog, gap_info)
+
+    streaks = (await db.execute(status.active_streaks_query(user.id))).all()
+    off_dates = []
+    if streaks:
+        off_dates = await db.scalars(status.gap_off_days_query(user.id, streaks, local_date))
+    return status.status_response(welcome, status.streak_breaks(streaks, off_dates, local_date))
+
+
+# ── Power ───────────────────────────────────────────────────────────────
+
+
+@router.get("/power/current", response_model=PowerResponse)
+async def power_current(user: User = Depends(get_async_current_user)):
+    # Derived from the user row alone; no further queries
+    return power.power_response(user)
+
+
+@router.get("/attributes/", response_model=list[AttributeDetail])
+async def list_attributes(user: User = Depends(get_async_current_user)):
+    return power.attribute_details(user)
@@ -5,7 +5,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import Writer, get_current_user, get_db, get_writer
 from app.models.category import Category
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
@@ -16,18 +16,21 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 @router.post("/", response_model=CategoryResponse, status_code=201)
 def create_category(
     body: CategoryCreate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    category = Category(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        **body.model_dump(),
-    )
-    db.add(category)
-    db.commit()
-    db.refresh(category)
-    return category
+    def job(db: Session) -> CategoryResponse:
+        category = Category(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            **body.model_dump(),
+        )
+        db.add(category)
+        db.flush()
+        db.refresh(category)
+        return CategoryResponse.model_validate(category)
+
+    return writer.run(job)
 
 
 @router.get("/", response_model=list[CategoryResponse])
@@ -56,32 +59,38 @@ def get_category(
 def update_category(
     category_id: uuid.UUID,
     body: CategoryUpdate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    cat = db.query(Category).filter(
-        Category.id == category_id, Category.user_id == user.id
-    ).first()
-    if cat is None:
-        raise HTTPException(status_code=404, detail="Category not found")
-    for key, value in body.model_dump(exclude_unset=True).items():
-        setattr(cat, key, value)
-    db.commit()
-    db.refresh(cat)
-    return cat
+    def job(db: Session) -> CategoryResponse:
+        cat = db.query(Category).filter(
+            Category.id == category_id, Category.user_id == user.id
+        ).first()
+        if cat is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        for key, value in body.model_dump(exclude_unset=True).items():
+            setattr(cat, key, value)
+        db.flush()
+        db.refresh(cat)
+        return CategoryResponse.model_validate(cat)
+
+    return writer.run(job)
 
 
 @router.delete("/{category_id}", status_code=204)
 def delete_category(
     category_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    cat = db.query(Category).filter(
-        Category.id == category_id, Category.user_id == user.id
-    ).first()
-    if cat is None:
-        raise HTTPException(status_code=404, detail="Category not found")
-    db.delete(cat)
-    db.commit()
+    def job(db: Session) -> None:
+        cat = db.query(Category).filter(
+            Category.id == category_id, Category.user_id == user.id
+        ).first()
+        if cat is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        db.delete(cat)
+        db.flush()
+
+    writer.run(job)
     return Response(status_code=204)
@@ -1,28 +1,37 @@
-"""Habit endpoints — CRUD, check/uncheck, today/list, calendar, contribution-graph."""
+"""Habit endpoints — CRUD, check/uncheck, batch check, today/list, calendar, contribution-graph."""
 
 import uuid
 from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import (
+    Writer,
+    get_current_user,
+    get_current_user_read,
+    get_db,
+    get_read_db,
+    get_writer,
+)
+from app.core.dates import MONTH_PATTERN, month_bounds
 from app.models.daily_log import DailyLog
 from app.models.habit import Habit
 from app.models.habit_log import HabitLog
 from app.models.habit_streak import HabitStreak
 from app.models.off_day import OffDay
-from app.models.quote import Quote
-from app.models.reward import Reward
 from app.models.user import User
 from app.schemas.analytics import CalendarDay, ContributionDay
 from app.schemas.check_habit import (
     CapsuleDropDetail,
+    CheckHabitBatchRequest,
+    CheckHabitBatchResponse,
     CheckHabitRequest,
     CheckHabitResponse,
     DailyLogSummary,
     DragonBallInfo,
+    HabitCheckResult,
     QuoteDetail,
     StreakInfo,
     TransformChange,
@@ -38,23 +47,53 @@ from app.schemas.habit import (
     HabitUpdate,
     ReorderRequest,
 )
-from app.services.habit_service import check_habit as svc_check_habit
-from app.services.habit_service import get_habits_due_on_date
+from app.services.archive_service import (
+    completed_days,
+    completed_on,
+    completion_totals,
+    is_archived_date,
+)
+from app.services.capsule_service import PooledReward, lookup_rewards
+from app.services.game_state import load_game_state
+from app.services.habit_service import (
+    check_habit as svc_check_habit,
+    check_habits_batch as svc_check_habits_batch,
+    due_habits_query,
+    get_habits_due_on_date,
+    is_habit_due,
+)
 from app.services.off_day_service import is_off_day
+from app.services.quote_catalog import choose_quote
 
 router = APIRouter(prefix="/habits", tags=["habits"])
 
+# Prebuilt hot-path lookups; see habit_service for why these are module-level
+_ACTIVE_HABIT = (
+    select(Habit)
+    .where(
+        Habit.id == bindparam("habit_id"),
+        Habit.user_id == bindparam("user_id"),
+        Habit.is_active == True,  # noqa: E712
+    )
+    .limit(1)
+)
+
+_DAILY_LOG = (
+    select(DailyLog)
+    .where(
+        DailyLog.user_id == bindparam("user_id"),
+        DailyLog.log_date == bindparam("local_date"),
+    )
+    .limit(1)
+)
+
 
 # ── Helpers ─────────────────────────────────────────────────────────────
 
 
 def _get_active_habit(db: Session, habit_id: uuid.UUID, user_id: uuid.UUID) -> Habit:
     """Fetch a habit by id belonging to user. Raises 404 if missing or inactive."""
-    habit = (
-        db.query(Habit)
-        .filter(Habit.id == habit_id, Habit.user_id == user_id, Habit.is_active == True)  # noqa: E712
-        .first()
-    )
+    habit = db.scalars(_ACTIVE_HABIT, {"habit_id": habit_id, "user_id": user_id}).first()
     if habit is None:
         raise HTTPException(status_code=404, detail="Habit not found")
     return habit
@@ -75,41 +114,104 @@ def select_quote_for_context(db: Session, result: dict) -> QuoteDetail | None:
     else:
         trigger = "habit_complete"
 
-    quote = (
-        db.query(Quote)
-        .filter(Quote.trigger_event == trigger)
-        .order_by(func.random())
-        .first()
-    )
+    quote = choose_quote(db, no_repeat=True, trigger_event=trigger)
     if quote is None:
         return None
 
-    return QuoteDetail(
-        character=quote.character,
-        quote_text=quote.quote_text,
-        source_saga=quote.source_saga,
-        avatar_path=f"/assets/avatars/{quote.character}.webp",
+    return QuoteDetail(**quote.as_detail())
+
+
+def _capsule_detail(
+    capsule: dict | None, rewards: dict[uuid.UUID, PooledReward]
+) -> CapsuleDropDetail | None:
+    """Resolve a check_habit capsule dict into its reward details."""
+    if capsule is None:
+        return None
+    reward = rewards.get(uuid.UUID(capsule["reward_id"]))
+    if reward is None:
+        return None
+    return CapsuleDropDetail(
+        id=uuid.UUID(capsule["id"]),
+        reward_id=reward.id,
+        reward_title=reward.title,
+        reward_rarity=reward.rarity,
     )
 
 
+def _attach_milestone_quotes(db: Session, events: list[dict]) -> None:
+    """Enrich streak milestone events with a random milestone quote, in place."""
+    for event in events:
+        if event["type"] == "streak_milestone":
+            milestone_quote = choose_quote(db, no_repeat=True, trigger_event="streak_milestone")
+            if milestone_quote:
+                event["quote"] = milestone_quote.as_detail()
+
+
+def _enrich_check_result(
+    db: Session, user_id: uuid.UUID, result: dict, capsules: list[dict | None]
+) -> tuple[list[CapsuleDropDetail | None], QuoteDetail | None]:
+    """Post-commit enrichment for check responses.
+
+    Resolves every capsule reward in one lookup (reward pool cache, one IN
+    query for misses), picks the context quote and attaches milestone quotes
+    from the quote catalog. Milestone events are enriched in place.
+    """
+    reward_ids = {uuid.UUID(c["reward_id"]) for c in capsules if c is not None}
+    rewards = lookup_rewards(db, user_id, reward_ids)
+    capsule_details = [_capsule_detail(c, rewards) for c in capsules]
+
+    quote_detail = select_quote_for_context(db, result)
+    _attach_milestone_quotes(db, result.get("events", []))
+    return capsule_details, quote_detail
+
+
+def _shape_day_fields(result: dict) -> dict:
+    """Shape the day-level fields shared by single and batch check responses."""
+    transform_change = None
+    if result.get("transform_change") is not None:
+        transform_change = TransformChange(**result["transform_change"])
+
+    dragon_ball = None
+    if result.get("dragon_ball") is not None:
+        dragon_ball = DragonBallInfo(**result["dragon_ball"])
+
+    return {
+        "log_date": result["log_date"],
+        "is_perfect_day": result["is_perfect_day"],
+        "zenkai_activated": result["zenkai_activated"],
+        "daily_log": DailyLogSummary(**result["daily_log"]),
+        "streak": StreakInfo(
+            current_streak=result["streak"]["current_streak"],
+            best_streak=result["streak"]["best_streak"],
+        ),
+        "power_level": result["power_level"],
+        "transformation": result["transformation"],
+        "transform_change": transform_change,
+        "dragon_ball": dragon_ball,
+    }
+
+
 # ── CRUD ────────────────────────────────────────────────────────────────
 
 
 @router.post("/", response_model=HabitResponse, status_code=201)
 def create_habit(
     body: HabitCreate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    habit = Habit(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        **body.model_dump(),
-    )
-    db.add(habit)
-    db.commit()
-    db.refresh(habit)
-    return habit
+    def job(db: Session) -> HabitResponse:
+        habit = Habit(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            **body.model_dump(),
+        )
+        db.add(habit)
+        db.flush()
+        db.refresh(habit)
+        return HabitResponse.model_validate(habit)
+
+    return writer.run(job)
 
 
 @router.get("/", response_model=list[HabitResponse])
@@ -138,93 +240,105 @@ def list_archived_habits(
     )
 
 
-@router.get("/today/list", response_model=list[HabitTodayResponse])
-def today_list(
-    local_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
-    """Return habits due today with completion status and streak info."""
-    due_habits = get_habits_due_on_date(db, user.id, local_date)
-    result = []
-    for habit in due_habits:
-        # Check completion
-        log = (
-            db.query(HabitLog)
-            .filter(
-                HabitLog.habit_id == habit.id,
-                HabitLog.log_date == local_date,
-                HabitLog.completed == True,  # noqa: E712
-            )
-            .first()
+# Today list and calendar are split into statements and shaping like
+# api/v1/analytics.py, so the async routes (api/v1/async_reads.py) await
+# the same queries.
+
+
+def today_list_query(user_id: uuid.UUID, local_date: str):
+    """Due habits with (completed, streak_current, streak_best) in one round trip."""
+    completed = (
+        select(HabitLog.id)
+        .where(
+            HabitLog.habit_id == Habit.id,
+            HabitLog.log_date == local_date,
+            HabitLog.completed == True,  # noqa: E712
         )
-        completed = log is not None
+        .exists()
+    )
 
-        # Get streak info
-        h_streak = (
-            db.query(HabitStreak)
-            .filter(HabitStreak.habit_id == habit.id)
-            .first()
+    def _streak(column):
+        return (
+            select(column).where(HabitStreak.habit_id == Habit.id).limit(1).scalar_subquery()
         )
-        streak_current = h_streak.current_streak if h_streak else 0
-        streak_best = h_streak.best_streak if h_streak else 0
-
-        result.append(
-            HabitTodayResponse(
-                id=habit.id,
-                title=habit.title,
-                description=habit.description,
-                icon_emoji=habit.icon_emoji,
-                importance=habit.importance,
-                attribute=habit.attribute,
-                frequency=habit.frequency,
-                custom_days=habit.custom_days,
-                target_time=habit.target_time,
-                is_temporary=habit.is_temporary,
-                start_date=habit.start_date,
-                end_date=habit.end_date,
-                sort_order=habit.sort_order,
-                is_active=habit.is_active,
-                category_id=habit.category_id,
-                created_at=habit.created_at,
-                completed=completed,
-                streak_current=streak_current,
-                streak_best=streak_best,
-            )
+
+    return due_habits_query(user_id, local_date).add_columns(
+        completed,
+        _streak(HabitStreak.current_streak),
+        _streak(HabitStreak.best_streak),
+    )
+
+
+def today_list_response(rows) -> list[HabitTodayResponse]:
+    """Shape today_list_query() rows."""
+    return [
+        HabitTodayResponse(
+            id=habit.id,
+            title=habit.title,
+            description=habit.description,
+            icon_emoji=habit.icon_emoji,
+            importance=habit.importance,
+            attribute=habit.attribute,
+            frequency=habit.frequency,
+            custom_days=habit.custom_days,
+            target_time=habit.target_time,
+            is_temporary=habit.is_temporary,
+            start_date=habit.start_date,
+            end_date=habit.end_date,
+            sort_order=habit.sort_order,
+            is_active=habit.is_active,
+            category_id=habit.category_id,
+            created_at=habit.created_at,
+            completed=bool(completed),
+            streak_current=streak_current or 0,
+            streak_best=streak_best or 0,
         )
-    return result
+        for habit, completed, streak_current, streak_best in rows
+    ]
 
 
-@router.get("/calendar/all", response_model=list[CalendarDay])
-def calendar_all(
-    month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+@router.get("/today/list", response_model=list[HabitTodayResponse])
+def today_list(
+    local_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    """Return daily heatmap data for the given month."""
-    prefix = f"{month}%"
+    """Return habits due today with completion status and streak info."""
+    return today_list_response(db.execute(today_list_query(user.id, local_date)))
 
-    daily_logs = (
-        db.query(DailyLog)
-        .filter(DailyLog.user_id == user.id, DailyLog.log_date.like(prefix))
-        .all()
-    )
 
-    off_days = (
-        db.query(OffDay)
-        .filter(OffDay.user_id == user.id, OffDay.off_date.like(prefix))
-        .all()
+def calendar_queries(user_id: uuid.UUID, month: str):
+    """(DailyLog columns, off-day dates) statements for a YYYY-MM month."""
+    first_day, last_day = month_bounds(month)
+    return (
+        select(
+            DailyLog.log_date,
+            DailyLog.is_perfect_day,
+            DailyLog.completion_tier,
+            DailyLog.xp_earned,
+        ).where(
+            DailyLog.user_id == user_id,
+            DailyLog.log_date.between(first_day, last_day),
+        ),
+        select(OffDay.off_date).where(
+            OffDay.user_id == user_id,
+            OffDay.off_date.between(first_day, last_day),
+        ),
     )
-    off_day_dates = {od.off_date for od in off_days}
+
+
+def calendar_response(daily_logs, off_dates) -> list[CalendarDay]:
+    """Shape calendar_queries() rows into sorted heatmap days."""
+    off_day_dates = set(off_dates)
 
     result_map: dict[str, CalendarDay] = {}
-    for dl in daily_logs:
-        result_map[dl.log_date] = CalendarDay(
-            date=dl.log_date,
-            is_perfect_day=dl.is_perfect_day,
-            completion_tier=dl.completion_tier,
-            xp_earned=dl.xp_earned,
-            is_off_day=dl.log_date in off_day_dates,
+    for log_date, is_perfect_day, completion_tier, xp_earned in daily_logs:
+        result_map[log_date] = CalendarDay(
+            date=log_date,
+            is_perfect_day=is_perfect_day,
+            completion_tier=completion_tier,
+            xp_earned=xp_earned,
+            is_off_day=log_date in off_day_dates,
         )
 
     # Add pure off days (no DailyLog entry)
@@ -241,14 +355,25 @@ def calendar_all(
     return sorted(result_map.values(), key=lambda d: d.date)
 
 
+@router.get("/calendar/all", response_model=list[CalendarDay])
+def calendar_all(
+    month: str = Query(..., pattern=MONTH_PATTERN),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
+):
+    """Return daily heatmap data for the given month."""
+    logs_query, off_days_query = calendar_queries(user.id, month)
+    return calendar_response(db.execute(logs_query), db.scalars(off_days_query))
+
+
 # ── Day Detail (per-habit breakdown) ──────────────────────────────────
 
 
 @router.get("/calendar/day-detail", response_model=DayDetailResponse)
 def calendar_day_detail(
     date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
     """Return per-habit completion breakdown for a specific date."""
     # Get all habits that were due on this date
@@ -257,24 +382,11 @@ def calendar_day_detail(
     # Check if it's an off day
     off_day = is_off_day(db, user.id, date)
 
-    # Get completion logs for this date
-    habit_ids = [h.id for h in due_habits]
-    logs = (
-        db.query(HabitLog)
-        .filter(
-            HabitLog.habit_id.in_(habit_ids),
-            HabitLog.log_date == date,
-        )
-        .all()
-    )
-    log_map = {log.habit_id: log for log in logs}
+    # Completed habits and their XP, from the live or archived tier
+    xp_by_habit = completed_on(db, [h.id for h in due_habits], date)
 
     # Get daily log for aggregate data
-    daily_log = (
-        db.query(DailyLog)
-        .filter(DailyLog.user_id == user.id, DailyLog.log_date == date)
-        .first()
-    )
+    daily_log = db.scalars(_DAILY_LOG, {"user_id": user.id, "local_date": date}).first()
 
     total_xp = daily_log.xp_earned if daily_log else 0
     completion_tier = daily_log.completion_tier if daily_log else "base"
@@ -283,15 +395,12 @@ def calendar_day_detail(
     # Build per-habit detail
     habit_details = []
     for habit in due_habits:
-        log = log_map.get(habit.id)
-        completed = log is not None and log.completed
-        xp = log.attribute_xp_awarded if log and log.completed else 0
         habit_details.append(DayDetailHabit(
             id=habit.id,
             title=habit.title,
             icon_emoji=habit.icon_emoji,
-            completed=completed,
-            attribute_xp_awarded=xp,
+            completed=habit.id in xp_by_habit,
+            attribute_xp_awarded=xp_by_habit.get(habit.id, 0),
             is_excused=off_day,
         ))
 
@@ -311,54 +420,59 @@ def calendar_day_detail(
 @router.put("/reorder", response_model=list[HabitResponse])
 def reorder_habits(
     body: ReorderRequest,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
     """Batch update sort_order for habits. Position in array = sort_order value."""
-    habits = (
-        db.query(Habit)
-        .filter(
-            Habit.id.in_(body.habit_ids),
-            Habit.user_id == user.id,
-            Habit.is_active == True,  # noqa: E712
+    def job(db: Session) -> list[HabitResponse]:
+        habits = (
+            db.query(Habit)
+            .filter(
+                Habit.id.in_(body.habit_ids),
+                Habit.user_id == user.id,
+                Habit.is_active == True,  # noqa: E712
+            )
+            .all()
         )
-        .all()
-    )
-    habit_map = {h.id: h for h in habits}
+        habit_map = {h.id: h for h in habits}
 
-    for hid in body.habit_ids:
-        if hid not in habit_map:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Habit {hid} not found or does not belong to user",
-            )
+        for hid in body.habit_ids:
+            if hid not in habit_map:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Habit {hid} not found or does not belong to user",
+                )
 
-    for idx, hid in enumerate(body.habit_ids):
-        habit_map[hid].sort_order = idx
+        for idx, hid in enumerate(body.habit_ids):
+            habit_map[hid].sort_order = idx
 
-    db.commit()
+        db.flush()
+        return [HabitResponse.model_validate(habit_map[hid]) for hid in body.habit_ids]
 
-    return [habit_map[hid] for hid in body.habit_ids]
+    return writer.run(job)
 
 
 @router.put("/{habit_id}/restore", response_model=HabitResponse)
 def restore_habit(
     habit_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
     """Restore an archived habit to active status."""
-    habit = (
-        db.query(Habit)
-        .filter(Habit.id == habit_id, Habit.user_id == user.id, Habit.is_active == False)  # noqa: E712
-        .first()
-    )
-    if habit is None:
-        raise HTTPException(status_code=404, detail="Archived habit not found")
-    habit.is_active = True
-    db.commit()
-    db.refresh(habit)
-    return habit
+    def job(db: Session) -> HabitResponse:
+        habit = (
+            db.query(Habit)
+            .filter(Habit.id == habit_id, Habit.user_id == user.id, Habit.is_active == False)  # noqa: E712
+            .first()
+        )
+        if habit is None:
+            raise HTTPException(status_code=404, detail="Archived habit not found")
+        habit.is_active = True
+        db.flush()
+        db.refresh(habit)
+        return HabitResponse.model_validate(habit)
+
+    return writer.run(job)
 
 
 @router.get("/{habit_id}", response_model=HabitResponse)
@@ -374,127 +488,142 @@ def get_habit(
 def update_habit(
     habit_id: uuid.UUID,
     body: HabitUpdate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    habit = _get_active_habit(db, habit_id, user.id)
-    updates = body.model_dump(exclude_unset=True)
-    for field, value in updates.items():
-        setattr(habit, field, value)
-    db.commit()
-    db.refresh(habit)
-    return habit
+    def job(db: Session) -> HabitResponse:
+        habit = _get_active_habit(db, habit_id, user.id)
+        updates = body.model_dump(exclude_unset=True)
+        for field, value in updates.items():
+            setattr(habit, field, value)
+        db.flush()
+        db.refresh(habit)
+        return HabitResponse.model_validate(habit)
+
+    return writer.run(job)
 
 
 @router.delete("/{habit_id}", status_code=204)
 def delete_habit(
     habit_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    habit = _get_active_habit(db, habit_id, user.id)
-    habit.is_active = False
-    db.commit()
+    def job(db: Session) -> None:
+        habit = _get_active_habit(db, habit_id, user.id)
+        habit.is_active = False
+        db.flush()
+
+    writer.run(job)
 
 
 # ── Check / Uncheck ────────────────────────────────────────────────────
 
 
-@router.post("/{habit_id}/check", response_model=CheckHabitResponse)
-def check_habit_endpoint(
-    habit_id: uuid.UUID,
-    body: CheckHabitRequest,
+@router.post("/check-batch", response_model=CheckHabitBatchResponse)
+def check_habits_batch_endpoint(
+    body: CheckHabitBatchRequest,
     db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
+    """Toggle several habits for one day in a single transaction."""
     local_date = body.local_date
 
-    # Validate off day
-    if is_off_day(db, user.id, local_date):
-        raise HTTPException(status_code=409, detail="Cannot check habits on an off day")
+    if len(set(body.habit_ids)) != len(body.habit_ids):
+        raise HTTPException(status_code=422, detail="Duplicate habit ids in batch")
+    if is_archived_date(local_date):
+        raise HTTPException(status_code=409, detail="Date is archived")
 
-    # Validate habit exists
-    habit = _get_active_habit(db, habit_id, user.id)
+    def job(db: Session) -> dict:
+        # Load everything the check reads in one pass, then validate from it
+        state = load_game_state(db, user.id, local_date, body.habit_ids)
+        if state.is_off_day:
+            raise HTTPException(status_code=409, detail="Cannot check habits on an off day")
 
-    # Validate habit is due
-    due_habits = get_habits_due_on_date(db, user.id, local_date)
-    if habit_id not in [h.id for h in due_habits]:
-        raise HTTPException(status_code=422, detail="Habit is not due on this date")
-
-    # Call service
-    result = svc_check_habit(db, user.id, habit_id, local_date)
-    db.commit()
-
-    # Enrich capsule
-    capsule_detail = None
-    if result.get("capsule") is not None:
-        reward = db.query(Reward).filter(Reward.id == uuid.UUID(result["capsule"]["reward_id"])).first()
-        if reward:
-            capsule_detail = CapsuleDropDetail(
-                id=uuid.UUID(result["capsule"]["id"]),
-                reward_id=reward.id,
-                reward_title=reward.title,
-                reward_rarity=reward.rarity,
-            )
+        habits = [state.habits.get(habit_id) for habit_id in body.habit_ids]
+        if any(h is None or not h.is_active for h in habits):
+            raise HTTPException(status_code=404, detail="Habit not found")
 
-    # Select quote
-    quote_detail = select_quote_for_context(db, result)
+        if not all(is_habit_due(h, local_date) for h in habits):
+            raise HTTPException(status_code=422, detail="Habit is not due on this date")
 
-    # Enrich streak milestone events with quotes
-    for event in result.get("events", []):
-        if event["type"] == "streak_milestone":
-            milestone_quote = (
-                db.query(Quote)
-                .filter(Quote.trigger_event == "streak_milestone")
-                .order_by(func.random())
-                .first()
-            )
-            if milestone_quote:
-                event["quote"] = {
-                    "character": milestone_quote.character,
-                    "quote_text": milestone_quote.quote_text,
-                    "source_saga": milestone_quote.source_saga,
-                    "avatar_path": f"/assets/avatars/{milestone_quote.character}.webp",
-                }
-
-    # Shape streak
-    streak_info = StreakInfo(
-        current_streak=result["streak"]["current_streak"],
-        best_streak=result["streak"]["best_streak"],
+        return svc_check_habits_batch(db, user.id, body.habit_ids, local_date, state=state)
+
+    result = writer.run(job)
+
+    # Enrich capsules and quotes; select quote as if any checked habit triggered it
+    any_checking = any(r["is_checking"] for r in result["results"])
+    capsule_details, quote_detail = _enrich_check_result(
+        db,
+        user.id,
+        {**result, "is_checking": any_checking},
+        [r["capsule"] for r in result["results"]],
     )
-    habit_streak_info = StreakInfo(
-        current_streak=result["habit_streak"]["current_streak"],
-        best_streak=result["habit_streak"]["best_streak"],
+
+    results = [
+        HabitCheckResult(
+            habit_id=uuid.UUID(r["habit_id"]),
+            is_checking=r["is_checking"],
+            attribute_xp_awarded=r["attribute_xp_awarded"],
+            habit_streak=StreakInfo(**r["habit_streak"]),
+            capsule=capsule_detail,
+        )
+        for r, capsule_detail in zip(result["results"], capsule_details)
+    ]
+
+    return CheckHabitBatchResponse(
+        **_shape_day_fields(result),
+        results=results,
+        quote=quote_detail,
+        events=result["events"],
     )
 
-    # Shape transform change
-    transform_change = None
-    if result.get("transform_change") is not None:
-        transform_change = TransformChange(**result["transform_change"])
 
-    # Shape dragon ball
-    dragon_ball = None
-    if result.get("dragon_ball") is not None:
-        dragon_ball = DragonBallInfo(**result["dragon_ball"])
+@router.post("/{habit_id}/check", response_model=CheckHabitResponse)
+def check_habit_endpoint(
+    habit_id: uuid.UUID,
+    body: CheckHabitRequest,
+    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
+    user: User = Depends(get_current_user),
+):
+    local_date = body.local_date
+    if is_archived_date(local_date):
+        raise HTTPException(status_code=409, detail="Date is archived")
+
+    def job(db: Session) -> dict:
+        # Load everything the check reads in one pass, then validate from it
+        state = load_game_state(db, user.id, local_date, [habit_id])
+        if state.is_off_day:
+            raise HTTPException(status_code=409, detail="Cannot check habits on an off day")
+
+        habit = state.habits.get(habit_id)
+        if habit is None or not habit.is_active:
+            raise HTTPException(status_code=404, detail="Habit not found")
 
-    # Shape daily log
-    daily_log = DailyLogSummary(**result["daily_log"])
+        if not is_habit_due(habit, local_date):
+            raise HTTPException(status_code=422, detail="Habit is not due on this date")
+
+        return svc_check_habit(db, user.id, habit_id, local_date, state=state)
+
+    result = writer.run(job)
+
+    # Enrich capsule, select quote, enrich streak milestone events with quotes
+    capsule_details, quote_detail = _enrich_check_result(
+        db, user.id, result, [result.get("capsule")]
+    )
 
     return CheckHabitResponse(
+        **_shape_day_fields(result),
         is_checking=result["is_checking"],
         habit_id=uuid.UUID(result["habit_id"]),
-        log_date=result["log_date"],
         attribute_xp_awarded=result["attribute_xp_awarded"],
-        is_perfect_day=result["is_perfect_day"],
-        zenkai_activated=result["zenkai_activated"],
-        daily_log=daily_log,
-        streak=streak_info,
-        habit_streak=habit_streak_info,
-        power_level=result["power_level"],
-        transformation=result["transformation"],
-        transform_change=transform_change,
-        dragon_ball=dragon_ball,
-        capsule=capsule_detail,
+        habit_streak=StreakInfo(
+            current_streak=result["habit_streak"]["current_streak"],
+            best_streak=result["habit_streak"]["best_streak"],
+        ),
+        capsule=capsule_details[0],
         quote=quote_detail,
         events=result.get("events", []),
     )
@@ -507,8 +636,8 @@ def check_habit_endpoint(
 def contribution_graph(
     habit_id: uuid.UUID,
     days: int = Query(default=90, ge=1, le=365),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
     """Return daily completion booleans for the last N days."""
     _get_active_habit(db, habit_id, user.id)
@@ -517,16 +646,7 @@ def contribution_graph(
     start_date = today - timedelta(days=days - 1)
     start_str = start_date.isoformat()
 
-    completed_logs = (
-        db.query(HabitLog.log_date)
-        .filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.log_date >= start_str,
-            HabitLog.completed == True,  # noqa: E712
-        )
-        .all()
-    )
-    completed_dates = {row.log_date for row in completed_logs}
+    completed_dates = completed_days(db, habit_id, start=start_str)
 
     result = []
     for i in range(days):
@@ -545,8 +665,8 @@ def habit_calendar(
     habit_id: uuid.UUID,
     start_date: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     end_date: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
     """Return per-habit completion history with XP data."""
     _get_active_habit(db, habit_id, user.id)
@@ -564,26 +684,16 @@ def habit_calendar(
     start_str = start_d.isoformat()
     end_str = end_d.isoformat()
 
-    logs = (
-        db.query(HabitLog)
-        .filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.log_date >= start_str,
-            HabitLog.log_date <= end_str,
-        )
-        .all()
-    )
-    log_map = {log.log_date: log for log in logs}
+    xp_by_date = completed_days(db, habit_id, start=start_str, end=end_str)
 
     result = []
     current = start_d
     while current <= end_d:
         d_str = current.isoformat()
-        log = log_map.get(d_str)
         result.append(HabitCalendarDay(
             date=d_str,
-            completed=log.completed if log else False,
-            attribute_xp_awarded=log.attribute_xp_awarded if log and log.completed else 0,
+            completed=d_str in xp_by_date,
+            attribute_xp_awarded=xp_by_date.get(d_str, 0),
         ))
         current += timedelta(days=1)
 
@@ -593,18 +703,14 @@ def habit_calendar(
 @router.get("/{habit_id}/stats", response_model=HabitStatsResponse)
 def habit_stats(
     habit_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_read),
 ):
     """Return per-habit statistics with completion rates, attribute XP, and streaks."""
     habit = _get_active_habit(db, habit_id, user.id)
 
-    # Total completions
-    total_completions = (
-        db.query(HabitLog)
-        .filter(HabitLog.habit_id == habit_id, HabitLog.completed == True)  # noqa: E712
-        .count()
-    )
+    # Total completions and XP, live and archived
+    total_completions, total_xp = completion_totals(db, habit_id)
 
     # Streak info
     h_streak = db.query(HabitStreak).filter(HabitStreak.habit_id == habit_id).first()
@@ -613,37 +719,14 @@ def habit_stats(
 
     # 7-day completion rate
     seven_days_ago = (date.today() - timedelta(days=7)).isoformat()
-    completions_7d = (
-        db.query(HabitLog)
-        .filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.log_date >= seven_days_ago,
-            HabitLog.completed == True,  # noqa: E712
-        )
-        .count()
-    )
+    completions_7d = len(completed_days(db, habit_id, start=seven_days_ago))
     completion_rate_7d = completions_7d / 7.0
 
     # 30-day completion rate
     thirty_days_ago = (date.today() - timedelta(days=30)).isoformat()
-    completions_30d = (
-        db.query(HabitLog)
-        .filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.log_date >= thirty_days_ago,
-            HabitLog.completed == True,  # noqa: E712
-        )
-        .count()
-    )
+    completions_30d = len(completed_days(db, habit_id, start=thirty_days_ago))
     completion_rate_30d = completions_30d / 30.0
 
-    # Total XP earned
-    total_xp = (
-        db.query(func.coalesce(func.sum(HabitLog.attribute_xp_awarded), 0))
-        .filter(HabitLog.habit_id == habit_id, HabitLog.completed == True)  # noqa: E712
-        .scalar()
-    )
-
     # Attribute XP map — habit has a single attribute, map to uppercase key
     attribute_xp = {habit.attribute.upper(): total_xp}
 
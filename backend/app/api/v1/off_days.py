@@ -1,12 +1,14 @@
 """Off-day management endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import Writer, get_current_user, get_db, get_writer
+from app.core.dates import MONTH_PATTERN, month_bounds
 from app.models.off_day import OffDay
 from app.models.user import User
 from app.schemas.off_day import OffDayCreate, OffDayResponse, OffDayMarkResponse
+from app.services.archive_service import is_archived_date
 from app.services.off_day_service import cancel_off_day, is_off_day, mark_off_day
 
 router = APIRouter(prefix="/off-days", tags=["off-days"])
@@ -15,35 +17,41 @@ router = APIRouter(prefix="/off-days", tags=["off-days"])
 @router.post("/", response_model=OffDayMarkResponse)
 def mark_off_day_endpoint(
     body: OffDayCreate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    if is_off_day(db, user.id, body.local_date):
-        raise HTTPException(status_code=409, detail="Already an off day")
-    result = mark_off_day(db, user.id, body.local_date, body.reason, body.notes)
-    db.commit()
-    return result
+    if is_archived_date(body.local_date):
+        raise HTTPException(status_code=409, detail="Date is archived")
+
+    def job(db: Session) -> dict:
+        if is_off_day(db, user.id, body.local_date):
+            raise HTTPException(status_code=409, detail="Already an off day")
+        return mark_off_day(db, user.id, body.local_date, body.reason, body.notes)
+
+    return writer.run(job)
 
 
 @router.get("/", response_model=list[OffDayResponse])
 def list_off_days(
-    month: str | None = Query(None, description="Filter by month (YYYY-MM)"),
+    month: str | None = Query(None, description="Filter by month (YYYY-MM)", pattern=MONTH_PATTERN),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     query = db.query(OffDay).filter(OffDay.user_id == user.id)
     if month:
-        query = query.filter(OffDay.off_date.startswith(month))
+        query = query.filter(OffDay.off_date.between(*month_bounds(month)))
     return query.all()
 
 
 @router.delete("/{off_date}", status_code=204)
 def cancel_off_day_endpoint(
-    off_date: str,
-    db: Session = Depends(get_db),
+    off_date: str = Path(pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    if not cancel_off_day(db, user.id, off_date):
-        raise HTTPException(status_code=404, detail="Off day not found")
-    db.commit()
+    def job(db: Session) -> None:
+        if not cancel_off_day(db, user.id, off_date):
+            raise HTTPException(status_code=404, detail="Off day not found")
+
+    writer.run(job)
     return Response(status_code=204)
@@ -3,9 +3,8 @@
 import math
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user_read
 from app.core.constants import (
     ATTRIBUTE_LEVEL_BASE_XP,
     ATTRIBUTE_LEVEL_FORMULA_EXPONENT,
@@ -24,7 +23,7 @@ from app.services.power_service import get_transformation_for_power
 router = APIRouter(tags=["power"])
 
 
-def _build_attribute_details(user: User) -> list[AttributeDetail]:
+def attribute_details(user: User) -> list[AttributeDetail]:
     """Build AttributeDetail list for all 4 attributes."""
     details = []
     for attr in VALID_ATTRIBUTES:
@@ -57,11 +56,8 @@ def _build_attribute_details(user: User) -> list[AttributeDetail]:
     return details
 
 
-@router.get("/power/current", response_model=PowerResponse)
-def power_current(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
+def power_response(user: User) -> PowerResponse:
+    """Power level, transformation and attributes, all derived from the user row."""
     current_form = get_transformation_for_power(user.power_level)
 
     # Find next transformation
@@ -76,7 +72,7 @@ def power_current(
         if form["key"] == current_form["key"]:
             found_current = True
 
-    attributes = _build_attribute_details(user)
+    attributes = attribute_details(user)
 
     return PowerResponse(
         power_level=user.power_level,
@@ -90,9 +86,15 @@ def power_current(
     )
 
 
+@router.get("/power/current", response_model=PowerResponse)
+def power_current(
+    user: User = Depends(get_current_user_read),
+):
+    return power_response(user)
+
+
 @router.get("/attributes/", response_model=list[AttributeDetail])
 def list_attributes(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_read),
 ):
-    return _build_attribute_details(user)
+    return attribute_details(user)
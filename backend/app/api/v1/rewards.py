@@ -5,10 +5,11 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import Writer, get_current_user, get_db, get_writer
 from app.models.reward import Reward
 from app.models.user import User
 from app.schemas.reward import RewardCreate, RewardUpdate, RewardResponse
+from app.services.capsule_service import invalidate_reward_pool
 
 router = APIRouter(prefix="/rewards", tags=["rewards"])
 
@@ -16,18 +17,23 @@ router = APIRouter(prefix="/rewards", tags=["rewards"])
 @router.post("/", response_model=RewardResponse, status_code=201)
 def create_reward(
     body: RewardCreate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    reward = Reward(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        **body.model_dump(),
-    )
-    db.add(reward)
-    db.commit()
-    db.refresh(reward)
-    return reward
+    def job(db: Session) -> RewardResponse:
+        reward = Reward(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            **body.model_dump(),
+        )
+        db.add(reward)
+        db.flush()
+        db.refresh(reward)
+        return RewardResponse.model_validate(reward)
+
+    result = writer.run(job)
+    invalidate_reward_pool(user.id)
+    return result
 
 
 @router.get("/", response_model=list[RewardResponse])
@@ -56,32 +62,41 @@ def get_reward(
 def update_reward(
     reward_id: uuid.UUID,
     body: RewardUpdate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    reward = db.query(Reward).filter(
-        Reward.id == reward_id, Reward.user_id == user.id
-    ).first()
-    if reward is None:
-        raise HTTPException(status_code=404, detail="Reward not found")
-    for key, value in body.model_dump(exclude_unset=True).items():
-        setattr(reward, key, value)
-    db.commit()
-    db.refresh(reward)
-    return reward
+    def job(db: Session) -> RewardResponse:
+        reward = db.query(Reward).filter(
+            Reward.id == reward_id, Reward.user_id == user.id
+        ).first()
+        if reward is None:
+            raise HTTPException(status_code=404, detail="Reward not found")
+        for key, value in body.model_dump(exclude_unset=True).items():
+            setattr(reward, key, value)
+        db.flush()
+        db.refresh(reward)
+        return RewardResponse.model_validate(reward)
+
+    result = writer.run(job)
+    invalidate_reward_pool(user.id)
+    return result
 
 
 @router.delete("/{reward_id}", status_code=204)
 def delete_reward(
     reward_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    reward = db.query(Reward).filter(
-        Reward.id == reward_id, Reward.user_id == user.id
-    ).first()
-    if reward is None:
-        raise HTTPException(status_code=404, detail="Reward not found")
-    db.delete(reward)
-    db.commit()
+    def job(db: Session) -> None:
+        reward = db.query(Reward).filter(
+            Reward.id == reward_id, Reward.user_id == user.id
+        ).first()
+        if reward is None:
+            raise HTTPException(status_code=404, detail="Reward not found")
+        db.delete(reward)
+        db.flush()
+
+    writer.run(job)
+    invalidate_reward_pool(user.id)
     return Response(status_code=204)
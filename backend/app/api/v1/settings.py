@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import Writer, get_current_user, get_writer
 from app.models.user import User
 from app.schemas.settings import SettingsResponse, SettingsUpdate
 
@@ -22,15 +22,18 @@ def get_settings(user: User = Depends(get_current_user)):
 @router.put("/", response_model=SettingsResponse)
 def update_settings(
     body: SettingsUpdate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    for key, value in body.model_dump(exclude_unset=True).items():
-        setattr(user, key, value)
-    db.commit()
-    db.refresh(user)
-    return SettingsResponse(
-        display_name=user.display_name,
-        sound_enabled=user.sound_enabled,
-        theme=user.theme,
-    )
+    def job(db: Session) -> SettingsResponse:
+        db_user = db.get(User, user.id)
+        for key, value in body.model_dump(exclude_unset=True).items():
+            setattr(db_user, key, value)
+        db.flush()
+        return SettingsResponse(
+            display_name=db_user.display_name,
+            sound_enabled=db_user.sound_enabled,
+            theme=db_user.theme,
+        )
+
+    return writer.run(job)
@@ -1,11 +1,13 @@
 """Status endpoint — welcome-back, roast detection, and streak-break detection on app load."""
 
-from datetime import date
+from bisect import bisect_left, bisect_right
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.core.dates import to_day_number
 from app.models.habit import Habit
 from app.models.habit_streak import HabitStreak
 from app.models.off_day import OffDay
@@ -16,65 +18,95 @@ from app.services.roast_service import get_welcome_status
 router = APIRouter(prefix="/status", tags=["status"])
 
 
-def detect_streak_breaks(
-    db: Session, user_id, local_date: str
-) -> list[StreakBreak]:
-    """Detect per-habit streak breaks by comparing last_completed_date to today.
+# Split into statements and shaping like api/v1/analytics.py, so the async
+# route (api/v1/async_reads.py) awaits the same queries.
 
-    Stateless — does NOT mutate HabitStreak records. Detection only.
-    Accounts for off-days in the gap (off-days don't break streaks).
-    """
-    today_date = date.fromisoformat(local_date)
-    breaks = []
 
-    # Batch-load all habit streaks with active streaks
-    streaks_with_habits = (
-        db.query(HabitStreak, Habit)
+def active_streaks_query(user_id):
+    """Habit streaks that are running: (current_streak, last_completed_date, habit id, title)."""
+    return (
+        select(
+            HabitStreak.current_streak,
+            HabitStreak.last_completed_date,
+            Habit.id,
+            Habit.title,
+        )
         .join(Habit, HabitStreak.habit_id == Habit.id)
-        .filter(
+        .where(
             HabitStreak.user_id == user_id,
             HabitStreak.current_streak > 0,
             HabitStreak.last_completed_date.isnot(None),
         )
-        .all()
     )
 
-    for hs, habit in streaks_with_habits:
-        last_completed = date.fromisoformat(hs.last_completed_date)
-        gap_days = (today_date - last_completed).days
+
+def gap_off_days_query(user_id, streaks, local_date: str):
+    """Off-day dates that can fall in any active streak's gap."""
+    earliest = min(last_completed for _, last_completed, _, _ in streaks)
+    return select(OffDay.off_date).where(
+        OffDay.user_id == user_id,
+        OffDay.off_date > earliest,
+        OffDay.off_date < local_date,
+    )
+
+
+def streak_breaks(streaks, off_dates, local_date: str) -> list[StreakBreak]:
+    """Shape active_streaks_query() rows and gap_off_days_query() dates into breaks."""
+    today = to_day_number(local_date)
+    off_days = sorted(to_day_number(off_date) for off_date in off_dates)
+    breaks = []
+
+    for current_streak, last_completed_date, habit_id, habit_title in streaks:
+        last_completed = to_day_number(last_completed_date)
+        gap_days = today - last_completed
 
         if gap_days <= 1:
             # Consecutive days or same day — no break
             continue
 
         # Count off-days in the gap (exclusive of both endpoints)
-        off_day_count = (
-            db.query(OffDay)
-            .filter(
-                OffDay.user_id == user_id,
-                OffDay.off_date > hs.last_completed_date,
-                OffDay.off_date < local_date,
-            )
-            .count()
-        )
+        off_day_count = bisect_left(off_days, today) - bisect_right(off_days, last_completed)
 
         if off_day_count >= gap_days - 1:
             # All gap days are off-days — streak continues unbroken
             continue
 
         # Streak break detected
-        old_streak = hs.current_streak
-        halved_value = max(old_streak // 2, 0)
         breaks.append(StreakBreak(
-            habit_id=str(habit.id),
-            habit_title=habit.title,
-            old_streak=old_streak,
-            halved_value=halved_value,
+            habit_id=str(habit_id),
+            habit_title=habit_title,
+            old_streak=current_streak,
+            halved_value=max(current_streak // 2, 0),
         ))
 
     return breaks
 
 
+def detect_streak_breaks(
+    db: Session, user_id, local_date: str
+) -> list[StreakBreak]:
+    """Detect per-habit streak breaks by comparing last_completed_date to today.
+
+    Stateless — does NOT mutate HabitStreak records. Detection only.
+    Accounts for off-days in the gap (off-days don't break streaks).
+    """
+    streaks = db.execute(active_streaks_query(user_id)).all()
+    if not streaks:
+        return []
+    # Every off-day that can fall in any gap, loaded once
+    off_dates = db.scalars(gap_off_days_query(user_id, streaks, local_date)).all()
+    return streak_breaks(streaks, off_dates, local_date)
+
+
+def status_response(welcome: dict, breaks: list[StreakBreak]) -> StatusResponse:
+    """Shape get_welcome_status()/welcome_status() output and the streak breaks."""
+    return StatusResponse(
+        welcome_back=welcome.get("welcome_back") or None,
+        roast=welcome.get("roast") or None,
+        streak_breaks=breaks,
+    )
+
+
 @router.get("/", response_model=StatusResponse)
 def get_status(
     local_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
@@ -85,23 +117,5 @@ def get_status(
 
     Called by frontend on app load. Returns nulls/empty when no absence gap or breaks.
     """
-    result = get_welcome_status(db, user.id, local_date)
-
-    # Build response - handle the nested dict structure
-    welcome_back = None
-    roast = None
-
-    if result.get("welcome_back"):
-        welcome_back = result["welcome_back"]
-
-    if result.get("roast"):
-        roast = result["roast"]
-
-    # Detect per-habit streak breaks
-    streak_breaks = detect_streak_breaks(db, user.id, local_date)
-
-    return StatusResponse(
-        welcome_back=welcome_back,
-        roast=roast,
-        streak_breaks=streak_breaks,
-    )
+    welcome = get_welcome_status(db, user.id, local_date)
+    return status_response(welcome, detect_streak_breaks(db, user.id, local_date))
@@ -5,7 +5,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import Writer, get_current_user, get_db, get_writer
 from app.models.user import User
 from app.models.wish import Wish
 from app.schemas.wish import (
@@ -20,18 +20,21 @@ router = APIRouter(prefix="/wishes", tags=["wishes"])
 @router.post("/", response_model=WishResponse, status_code=201)
 def create_wish(
     body: WishCreate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    wish = Wish(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        **body.model_dump(),
-    )
-    db.add(wish)
-    db.commit()
-    db.refresh(wish)
-    return wish
+    def job(db: Session) -> WishResponse:
+        wish = Wish(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            **body.model_dump(),
+        )
+        db.add(wish)
+        db.flush()
+        db.refresh(wish)
+        return WishResponse.model_validate(wish)
+
+    return writer.run(job)
 
 
 @router.get("/", response_model=list[WishResponse])
@@ -60,46 +63,53 @@ def get_wish(
 def update_wish(
     wish_id: uuid.UUID,
     body: WishUpdate,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    wish = db.query(Wish).filter(
-        Wish.id == wish_id, Wish.user_id == user.id
-    ).first()
-    if wish is None:
-        raise HTTPException(status_code=404, detail="Wish not found")
-    for key, value in body.model_dump(exclude_unset=True).items():
-        setattr(wish, key, value)
-    db.commit()
-    db.refresh(wish)
-    return wish
+    def job(db: Session) -> WishResponse:
+        wish = db.query(Wish).filter(
+            Wish.id == wish_id, Wish.user_id == user.id
+        ).first()
+        if wish is None:
+            raise HTTPException(status_code=404, detail="Wish not found")
+        for key, value in body.model_dump(exclude_unset=True).items():
+            setattr(wish, key, value)
+        db.flush()
+        db.refresh(wish)
+        return WishResponse.model_validate(wish)
+
+    return writer.run(job)
 
 
 @router.delete("/{wish_id}", status_code=204)
 def delete_wish(
     wish_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    wish = db.query(Wish).filter(
-        Wish.id == wish_id, Wish.user_id == user.id
-    ).first()
-    if wish is None:
-        raise HTTPException(status_code=404, detail="Wish not found")
-    db.delete(wish)
-    db.commit()
+    def job(db: Session) -> None:
+        wish = db.query(Wish).filter(
+            Wish.id == wish_id, Wish.user_id == user.id
+        ).first()
+        if wish is None:
+            raise HTTPException(status_code=404, detail="Wish not found")
+        db.delete(wish)
+        db.flush()
+
+    writer.run(job)
     return Response(status_code=204)
 
 
 @router.post("/grant", response_model=WishGrantResponse)
 def grant_wish_endpoint(
     body: WishGrantRequest,
-    db: Session = Depends(get_db),
+    writer: Writer = Depends(get_writer),
     user: User = Depends(get_current_user),
 ):
-    try:
-        result = grant_wish(db, user, body.wish_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    db.commit()
-    return result
+    def job(db: Session) -> dict:
+        try:
+            return grant_wish(db, db.get(User, user.id), body.wish_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return writer.run(job)
@@ -1,6 +1,44 @@
 """Application configuration."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
+
+# SQLite PRAGMA presets, selected with SQLITE_PROFILE.
+# - durable:  synchronous=FULL, an fsync on every commit (SQLite's default)
+# - balanced: synchronous=NORMAL, WAL only syncs at checkpoints; a power loss
+#             can drop the last commits but never corrupts the database
+# - fast:     synchronous=OFF, leaves durability to the OS; dev/bulk loads only
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "durable": {
+        "synchronous": "FULL",
+        "cache_size": -2000,  # negative = KiB, i.e. 2 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # ms
+        "wal_autocheckpoint": 1000,  # pages
+        "journal_size_limit": -1,  # bytes, -1 = no limit
+    },
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    "fast": {
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 4000,
+        "journal_size_limit": 128 * 1024 * 1024,
+    },
+}
 
 
 class Settings(BaseSettings):
@@ -13,6 +51,68 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///saiyan_tracker.db"
     CORS_ORIGINS: str = ""
 
+    # SQLite performance profile; individual SQLITE_* values override the preset
+    SQLITE_PROFILE: Literal["durable", "balanced", "fast"] = "balanced"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = None
+    SQLITE_CACHE_SIZE: int | None = None
+    SQLITE_MMAP_SIZE: int | None = None
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] | None = None
+    SQLITE_BUSY_TIMEOUT: int | None = None
+    SQLITE_WAL_AUTOCHECKPOINT: int | None = None
+    SQLITE_JOURNAL_SIZE_LIMIT: int | None = None
+    # Store UUID keys as 16-byte BLOBs instead of 32-char hex text (SQLite only).
+    # Changing it rebuilds every table on the next startup.
+    SQLITE_BINARY_UUIDS: bool = False
+    # Serve dashboard reads (analytics, today list, calendar, status, power) from a
+    # read-only AsyncSession (needs aiosqlite)
+    ASYNC_DB: bool = False
+
+    # Seconds a worker serves its in-memory quote catalog before reloading it,
+    # so quote edits made through other workers show up; 0 never expires
+    QUOTE_CATALOG_TTL: float = 300.0
+
+    # Funnel all writes through one connection with group commit (SQLite only)
+    WRITE_QUEUE: bool = False
+    WRITE_QUEUE_MAX_DEPTH: int = 256
+    WRITE_QUEUE_MAX_BATCH: int = 32
+    WRITE_QUEUE_BATCH_WINDOW_MS: float = 0.0
+    WRITE_QUEUE_TIMEOUT: float = 5.0
+
+    # Background SQLite maintenance; intervals in seconds, jitter as a fraction
+    MAINTENANCE: bool = True
+    MAINTENANCE_CHECKPOINT_INTERVAL: float = 300.0
+    MAINTENANCE_OPTIMIZE_INTERVAL: float = 6 * 3600.0
+    MAINTENANCE_VACUUM_INTERVAL: float = 24 * 3600.0
+    MAINTENANCE_ARCHIVE_INTERVAL: float = 24 * 3600.0
+    MAINTENANCE_POWER_CHECK_INTERVAL: float = 24 * 3600.0
+    MAINTENANCE_IDLE_SECONDS: float = 2.0
+    MAINTENANCE_JITTER: float = 0.1
+
+    # Opt-in: habit logs older than this many days (rounded down to the start
+    # of a month) are compacted into monthly archive rows by the maintenance
+    # thread and deleted from habit_logs. Archived days become read-only:
+    # checks, unchecks and off days there are rejected with 409. 0 disables.
+    HABIT_LOG_ARCHIVE_DAYS: int = 0
+
+    # Admin endpoints (maintenance runs, backups) are not mounted unless enabled;
+    # set ADMIN_TOKEN to also require it in an X-Admin-Token header
+    ADMIN_ENABLED: bool = False
+    ADMIN_TOKEN: str = ""
+
+    # Online SQLite backups (CLI and admin endpoint); BACKUP_KEEP=0 keeps all
+    BACKUP_DIR: str = "backups"
+    BACKUP_KEEP: int = 7
+    BACKUP_COMPRESS: bool = True
+
+    # Connection pooling for server databases (PostgreSQL); SQLite ignores these
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_READ_POOL_SIZE: int = 5
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+
     @property
     def cors_origin_list(self) -> list[str]:
         """Parse comma-separated CORS_ORIGINS into a list."""
@@ -20,5 +120,30 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def database_backend(self) -> str:
+        """Backend name of DATABASE_URL, e.g. "sqlite" or "postgresql"."""
+        return make_url(self.DATABASE_URL).get_backend_name()
+
+    def pool_options(self, pool_size: int | None = None) -> dict:
+        """create_engine() keyword arguments for a pooled server database."""
+        return {
+            "pool_size": self.DB_POOL_SIZE if pool_size is None else pool_size,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        """Effective SQLite PRAGMA values: the profile preset plus overrides."""
+        pragmas = dict(SQLITE_PROFILES[self.SQLITE_PROFILE])
+        for name in pragmas:
+            override = getattr(self, f"SQLITE_{name.upper()}")
+            if override is not None:
+                pragmas[name] = override
+        return pragmas
+
 
 settings = Settings()
@@ -0,0 +1,47 @@
+"""Date helpers — ISO date strings <-> integer day numbers.
+
+Day numbers count days since 1970-01-01, the same scale as SQLite's
+julianday(x) - 2440587.5. They are how date columns are stored, and they
+turn gap arithmetic into plain integer subtraction.
+"""
+
+from datetime import date, timedelta
+
+# Request validation pattern for YYYY-MM month filters
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def to_day_number(value: str | date) -> int:
+    """Convert an ISO date string (YYYY-MM-DD) or date to a day number."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def from_day_number(day_number: int) -> str:
+    """Convert a day number back to an ISO date string."""
+    return (EPOCH + timedelta(days=day_number)).isoformat()
+
+
+def month_bounds(month: str) -> tuple[str, str]:
+    """Return the first and last ISO dates of a YYYY-MM month."""
+    first = date.fromisoformat(f"{month}-01")
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first.isoformat(), (next_month - timedelta(days=1)).isoformat()
+
+
+def week_start(value: str | date) -> str:
+    """Monday of the ISO week containing an ISO date (YYYY-MM-DD) or date."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return (value - timedelta(days=value.weekday())).isoformat()
+
+
+def month_start(value: str | date) -> str:
+    """First day of the month containing an ISO date (YYYY-MM-DD) or date."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.replace(day=1).isoformat()
@@ -0,0 +1,107 @@
+"""Optional async database stack — AsyncEngine, AsyncSession factory, and dependency.
+
+Enabled with ASYNC_DB=true and requires aiosqlite (or asyncpg for Postgres).
+The engine is created on first use so the sync-only deployment never imports
+an async driver. Like the sync read engine it is read-only, and connections
+get the same PRAGMA setup.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.config import settings
+from app.database.session import apply_sqlite_pragmas, read_only_url
+from app.database.types import use_binary_uuids
+
+# Async driver for each sync backend name
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def to_async_url(url: str | URL) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} URLs")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """Create a read-only AsyncEngine for url with the app's per-connection setup.
+
+    Mirrors session.create_read_engine(): the async routes only serve
+    reports, so they stay off the writer. SQLite files are opened with
+    mode=ro and PRAGMA query_only; PostgreSQL runs READ ONLY transactions.
+    In-memory SQLite can't be reopened read-only and keeps the plain URL.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS is not None:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+            }
+        return create_async_engine(
+            to_async_url(url),
+            echo=False,
+            connect_args=connect_args,
+            execution_options={"postgresql_readonly": True},
+            **settings.pool_options(settings.DB_READ_POOL_SIZE),
+        )
+
+    ro_url = read_only_url(url)
+    eng = create_async_engine(to_async_url(ro_url or url), echo=False)
+    if settings.SQLITE_BINARY_UUIDS:
+        use_binary_uuids(eng.sync_engine)
+
+    @event.listens_for(eng.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        if ro_url is None:
+            apply_sqlite_pragmas(dbapi_connection, settings.sqlite_pragmas)
+            return
+        # WAL and auto_vacuum are the writer's to set; a mode=ro file can't
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        for name, value in settings.sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return eng
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide AsyncEngine, creating it on first use."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(settings.DATABASE_URL)
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the AsyncEngine's pooled connections, if it was ever created."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+async def get_async_db():
+    """FastAPI dependency that yields an AsyncSession."""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
@@ -0,0 +1,156 @@
+"""Online SQLite backups through the sqlite3 backup API.
+
+The copy is taken in steps of a few hundred pages with a short pause in
+between, so a backup holds a read lock only briefly and never stalls
+writers. If another connection writes mid-copy, SQLite restarts the copy
+from the first page, so the result is always a consistent snapshot of a
+single commit. The snapshot is switched out of WAL mode so it is a
+standalone file, checked with PRAGMA quick_check, optionally gzipped, and
+older backups beyond the retention count are deleted.
+
+Usage (from backend/):
+    python -m app.database.backup [--database PATH] [--dest DIR] [--keep N] [--no-gzip]
+"""
+
+import argparse
+import gzip
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+# Pages copied per backup step, and the pause that lets writers in between
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.005
+
+_backup_lock = threading.Lock()
+
+
+@dataclass
+class BackupResult:
+    path: Path
+    size_bytes: int
+    pages: int
+    duration_ms: float
+    removed: list[Path] = field(default_factory=list)
+
+
+def sqlite_path(url: str) -> Path:
+    """Database file of a SQLite URL; ValueError for anything else."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        raise ValueError("Online backups need a file-based SQLite DATABASE_URL")
+    return Path(parsed.database)
+
+
+def _backup_files(dest_dir: Path, stem: str) -> list[Path]:
+    """Existing backups of stem, oldest first (the timestamps sort by name)."""
+    patterns = (f"{stem}-*.db", f"{stem}-*.db.gz")
+    return sorted(path for pattern in patterns for path in dest_dir.glob(pattern))
+
+
+def list_backups(dest_dir: Path, stem: str) -> list[Path]:
+    """Existing backups of stem, newest first."""
+    return _backup_files(dest_dir, stem)[::-1]
+
+
+def prune_backups(dest_dir: Path, stem: str, keep: int) -> list[Path]:
+    """Delete all but the newest `keep` backups; return the removed paths."""
+    files = _backup_files(dest_dir, stem)
+    removed = files[: max(len(files) - keep, 0)]
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+def backup_database(
+    source: Path,
+    dest_dir: Path,
+    compress: bool = True,
+    keep: int | None = None,
+    pages: int = PAGES_PER_STEP,
+) -> BackupResult:
+    """Snapshot source into dest_dir and apply retention; one backup at a time."""
+    source, dest_dir = Path(source), Path(dest_dir)
+    if not source.exists():
+        raise FileNotFoundError(source)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    target = dest_dir / f"{source.stem}-{stamp}.db"
+    partial = target.with_suffix(".db.partial")
+
+    with _backup_lock:
+        started = time.perf_counter()
+        src = sqlite3.connect(f"{source.resolve().as_uri()}?mode=ro", uri=True)
+        dst = sqlite3.connect(partial)
+        try:
+            src.backup(dst, pages=pages, sleep=STEP_SLEEP)
+            dst.execute("PRAGMA journal_mode=DELETE")
+            check = dst.execute("PRAGMA quick_check").fetchone()[0]
+            page_count = dst.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            dst.close()
+            src.close()
+
+        try:
+            if check != "ok":
+                raise RuntimeError(f"Backup failed quick_check: {check}")
+            if compress:
+                target = target.with_suffix(".db.gz")
+                with open(partial, "rb") as raw, gzip.open(target, "wb") as packed:
+                    shutil.copyfileobj(raw, packed)
+            else:
+                partial.replace(target)
+        finally:
+            partial.unlink(missing_ok=True)
+
+        removed = prune_backups(dest_dir, source.stem, keep) if keep else []
+        return BackupResult(
+            path=target,
+            size_bytes=target.stat().st_size,
+            pages=page_count,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            removed=removed,
+        )
+
+
+def backup_from_settings() -> BackupResult:
+    """Back up DATABASE_URL into BACKUP_DIR with the configured options."""
+    return backup_database(
+        sqlite_path(settings.DATABASE_URL),
+        Path(settings.BACKUP_DIR),
+        compress=settings.BACKUP_COMPRESS,
+        keep=settings.BACKUP_KEEP,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", type=Path, help="defaults to DATABASE_URL's file")
+    parser.add_argument("--dest", type=Path, default=Path(settings.BACKUP_DIR))
+    parser.add_argument("--keep", type=int, default=settings.BACKUP_KEEP, help="0 keeps all")
+    parser.add_argument(
+        "--gzip", action=argparse.BooleanOptionalAction, default=settings.BACKUP_COMPRESS
+    )
+    parser.add_argument("--pages", type=int, default=PAGES_PER_STEP, help="pages per step")
+    args = parser.parse_args()
+
+    source = args.database or sqlite_path(settings.DATABASE_URL)
+    result = backup_database(source, args.dest, args.gzip, args.keep, args.pages)
+    print(
+        f"Backed up {source} to {result.path} "
+        f"({result.pages} pages, {result.size_bytes} bytes, {result.duration_ms:.0f} ms)"
+    )
+    for path in result.removed:
+        print(f"Removed old backup {path}")
+
+
+if __name__ == "__main__":
+    main()
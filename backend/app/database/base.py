@@ -3,16 +3,18 @@
 import uuid
 from typing import Annotated
 
-from sqlalchemy import Uuid, String
+from sqlalchemy import String
 from sqlalchemy.orm import DeclarativeBase, mapped_column
 
+from app.database.types import CompactUuid
 
 # Reusable annotated types
-uuid_pk = Annotated[uuid.UUID, mapped_column(Uuid, primary_key=True, default=uuid.uuid4)]
+uuid_pk = Annotated[uuid.UUID, mapped_column(CompactUuid, primary_key=True, default=uuid.uuid4)]
 str_10 = Annotated[str, mapped_column(String(10))]
 str_20 = Annotated[str, mapped_column(String(20))]
 str_100 = Annotated[str, mapped_column(String(100))]
 
 
 class Base(DeclarativeBase):
-    pass
+    # Every Mapped[uuid.UUID] column, keys and foreign keys alike
+    type_annotation_map = {uuid.UUID: CompactUuid}
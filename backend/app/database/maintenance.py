@@ -0,0 +1,320 @@
+"""Background SQLite maintenance — WAL checkpoints, planner statistics, free pages,
+power-level verification.
+
+A daemon thread runs each task on its own interval, stretched or shrunk by
+random jitter so processes started together do not run in lockstep. A task
+that falls due waits for an idle window (no connection checked out from the
+app's engines for MAINTENANCE_IDLE_SECONDS), but never for longer than one
+more interval, so a server that is never idle is still maintained. Tasks
+run on a dedicated autocommit connection (or in a transaction, for tasks
+that write rows, such as the power-level check and the habit-log archive) and keep their last timings
+for the admin endpoint.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.database.session import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+# Rows sampled per index by ANALYZE / PRAGMA optimize; keeps each run cheap
+ANALYSIS_LIMIT = 1000
+# Free pages returned to the filesystem per incremental_vacuum run
+VACUUM_PAGES = 1000
+# PRAGMA auto_vacuum value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+# ── Tasks ───────────────────────────────────────────────────────────────
+
+
+def wal_checkpoint(conn: Connection) -> dict:
+    """Copy the WAL into the database file and truncate the WAL to zero bytes."""
+    busy, wal_pages, checkpointed = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+    return {"busy": bool(busy), "wal_pages": wal_pages, "checkpointed_pages": checkpointed}
+
+
+def optimize(conn: Connection) -> dict:
+    """Refresh the query planner's statistics.
+
+    Before SQLite 3.46, PRAGMA optimize only considers tables the same
+    connection has queried, which a maintenance connection never has, so
+    older libraries get a sampled ANALYZE instead.
+    """
+    conn.exec_driver_sql(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    if conn.dialect.server_version_info >= (3, 46):
+        # 0x10000: check every table, not only those this connection used
+        conn.exec_driver_sql("PRAGMA optimize=0x10002")
+        return {"mode": "optimize"}
+    conn.exec_driver_sql("ANALYZE")
+    return {"mode": "analyze"}
+
+
+def incremental_vacuum(conn: Connection) -> dict:
+    """Return up to VACUUM_PAGES free pages to the filesystem."""
+    if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != AUTO_VACUUM_INCREMENTAL:
+        return {"skipped": "auto_vacuum is not INCREMENTAL"}
+    before = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    if before:
+        # pysqlite's execute() steps a row-less statement once, which frees a
+        # single page; executescript() runs it to completion
+        driver = conn.connection.driver_connection
+        driver.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES})")
+    after = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    return {"freed_pages": before - after, "free_pages": after}
+
+
+def archive_habit_logs(conn: Connection) -> dict:
+    """Compact habit logs older than HABIT_LOG_ARCHIVE_DAYS into monthly rows."""
+    from app.services.archive_service import compact_habit_logs
+
+    with Session(bind=conn) as db:
+        return compact_habit_logs(db)
+
+
+def verify_power_levels(conn: Connection) -> dict:
+    """Repair User.power_level values that drifted from their DailyLog XP totals."""
+    from app.services.power_service import repair_power_levels
+
+    with Session(bind=conn) as db:
+        return repair_power_levels(db)
+
+
+# ── Idle detection ──────────────────────────────────────────────────────
+
+
+class ActivityMonitor:
+    """Count connections checked out of the watched engines."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._last_active = time.monotonic()
+        self._engines: list[Engine] = []
+
+    def watch(self, eng: Engine) -> None:
+        if eng not in self._engines:
+            event.listen(eng, "checkout", self._checkout)
+            event.listen(eng, "checkin", self._checkin)
+            self._engines.append(eng)
+
+    def unwatch_all(self) -> None:
+        for eng in self._engines:
+            event.remove(eng, "checkout", self._checkout)
+            event.remove(eng, "checkin", self._checkin)
+        self._engines = []
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self._in_use += 1
+            self._last_active = time.monotonic()
+
+    def _checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            # Connections checked out before watch() began are never counted
+            self._in_use = max(self._in_use - 1, 0)
+            self._last_active = time.monotonic()
+
+    def idle_for(self, seconds: float) -> bool:
+        """True if nothing is checked out and nothing was for `seconds`."""
+        with self._lock:
+            return self._in_use == 0 and time.monotonic() - self._last_active >= seconds
+
+
+# ── Scheduler ───────────────────────────────────────────────────────────
+
+
+@dataclass
+class MaintenanceTask:
+    name: str
+    action: Callable[[Connection], dict]
+    interval: float
+    # Run inside a transaction instead of on an autocommit connection
+    transactional: bool = False
+    next_run: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    last_run_at: datetime | None = None
+    last_duration_ms: float | None = None
+    last_result: dict | None = None
+    last_error: str | None = None
+
+
+class MaintenanceScheduler:
+    """Run maintenance tasks on jittered intervals during idle windows."""
+
+    def __init__(
+        self,
+        eng: Engine,
+        tasks: list[MaintenanceTask],
+        monitor: ActivityMonitor | None = None,
+        idle_seconds: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        self.engine = eng
+        self.tasks = {task.name: task for task in tasks}
+        self.monitor = monitor or ActivityMonitor()
+        self.idle_seconds = idle_seconds
+        self.jitter = jitter
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        now = time.monotonic()
+        for task in tasks:
+            task.next_run = now + self._jittered(task.interval)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread; a task already running is allowed to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.monitor.unwatch_all()
+
+    # ── Running ─────────────────────────────────────────────────────────
+
+    def run_task(self, name: str) -> MaintenanceTask:
+        """Run one task now and schedule its next run; raises KeyError if unknown."""
+        task = self.tasks[name]
+        with self._run_lock:
+            task.last_run_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            try:
+                with self.engine.connect() as conn:
+                    if task.transactional:
+                        with conn.begin():
+                            task.last_result = task.action(conn)
+                    else:
+                        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                        task.last_result = task.action(conn)
+                task.last_error = None
+            except Exception as exc:
+                logger.exception("Maintenance task %r failed", name)
+                task.failures += 1
+                task.last_result = None
+                task.last_error = str(exc)
+            task.last_duration_ms = (time.perf_counter() - started) * 1000
+            task.runs += 1
+            task.next_run = time.monotonic() + self._jittered(task.interval)
+        return task
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [task for task in self.tasks.values() if task.next_run <= now]
+            if not due:
+                self._stop.wait(min(task.next_run for task in self.tasks.values()) - now)
+                continue
+            overdue = any(now - task.next_run >= task.interval for task in due)
+            if overdue or self.monitor.idle_for(self.idle_seconds):
+                for task in due:
+                    self.run_task(task.name)
+            else:
+                self._stop.wait(min(self.idle_seconds, 1.0))
+
+    # ── Status ──────────────────────────────────────────────────────────
+
+    def status(self) -> list[dict]:
+        """Schedule and last-run timings of every task."""
+        now = time.monotonic()
+        return [
+            {
+                "name": task.name,
+                "interval_s": task.interval,
+                "next_run_in_s": max(task.next_run - now, 0.0),
+                "runs": task.runs,
+                "failures": task.failures,
+                "last_run_at": task.last_run_at,
+                "last_duration_ms": task.last_duration_ms,
+                "last_result": task.last_result,
+                "last_error": task.last_error,
+            }
+            for task in self.tasks.values()
+        ]
+
+
+def default_tasks() -> list[MaintenanceTask]:
+    tasks = [
+        MaintenanceTask(
+            "wal_checkpoint", wal_checkpoint, settings.MAINTENANCE_CHECKPOINT_INTERVAL
+        ),
+        MaintenanceTask("optimize", optimize, settings.MAINTENANCE_OPTIMIZE_INTERVAL),
+        MaintenanceTask(
+            "incremental_vacuum", incremental_vacuum, settings.MAINTENANCE_VACUUM_INTERVAL
+        ),
+        MaintenanceTask(
+            "verify_power_levels",
+            verify_power_levels,
+            settings.MAINTENANCE_POWER_CHECK_INTERVAL,
+            transactional=True,
+        ),
+    ]
+    if settings.HABIT_LOG_ARCHIVE_DAYS > 0:
+        tasks.append(
+            MaintenanceTask(
+                "archive_habit_logs",
+                archive_habit_logs,
+                settings.MAINTENANCE_ARCHIVE_INTERVAL,
+                transactional=True,
+            )
+        )
+    return tasks
+
+
+# ── Process-wide scheduler ────────────────────────────────────────────────
+
+_scheduler: MaintenanceScheduler | None = None
+
+
+def start_maintenance(url: str, watch: list[Engine]) -> MaintenanceScheduler:
+    """Start the process-wide scheduler on a SQLite URL, idling on `watch` engines."""
+    global _scheduler
+    if _scheduler is None:
+        monitor = ActivityMonitor()
+        for eng in watch:
+            monitor.watch(eng)
+        _scheduler = MaintenanceScheduler(
+            create_db_engine(url, poolclass=NullPool),
+            default_tasks(),
+            monitor,
+            idle_seconds=settings.MAINTENANCE_IDLE_SECONDS,
+            jitter=settings.MAINTENANCE_JITTER,
+        )
+        _scheduler.start()
+    return _scheduler
+
+
+def stop_maintenance() -> None:
+    """Stop the process-wide scheduler, if running."""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler.engine.dispose()
+        _scheduler = None
+
+
+def get_maintenance_scheduler() -> MaintenanceScheduler | None:
+    return _scheduler
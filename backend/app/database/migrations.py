@@ -0,0 +1,297 @@
+"""Startup schema migrations — idempotent changes for existing databases.
+
+Base.metadata.create_all() only creates missing tables. Columns and indexes added
+to (or columns removed from or widened in) a model after a database was first created are
+applied here, on every startup.
+"""
+
+import json
+import uuid
+
+from sqlalchemy import Integer, LargeBinary, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from app.database.base import Base
+from app.database.types import CompactUuid, DayNumber, binary_uuids_enabled
+from app.models.habit import compute_schedule_mask
+
+# (table, column, column DDL) — append-only, in the order they were introduced
+ADDED_COLUMNS = [
+    ("users", "schedule_version", "INTEGER NOT NULL DEFAULT 0"),
+    ("daily_logs", "schedule_version", "INTEGER"),
+    ("habits", "schedule_mask", "INTEGER NOT NULL DEFAULT 0"),
+    ("analytics_rollups", "completion_rate_ppm_sum", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+def add_missing_columns(conn: Connection) -> list[str]:
+    """ALTER TABLE ADD COLUMN for every registered column not yet present.
+
+    Returns the list of "table.column" names that were added.
+    """
+    inspector = inspect(conn)
+    added = []
+    for table, column, ddl in ADDED_COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column in existing:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        added.append(f"{table}.{column}")
+    return added
+
+
+# (table, column) — columns a model no longer declares; the model's inserts
+# would otherwise fail on NOT NULL columns they don't set
+DROPPED_COLUMNS = [
+    ("analytics_rollups", "completion_rate_sum"),
+]
+
+
+def drop_removed_columns(conn: Connection) -> list[str]:
+    """ALTER TABLE DROP COLUMN for every registered column still present.
+
+    Returns the list of "table.column" names that were dropped. Needs
+    SQLite 3.35+ (or PostgreSQL).
+    """
+    inspector = inspect(conn)
+    dropped = []
+    for table, column in DROPPED_COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column not in existing:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+        dropped.append(f"{table}.{column}")
+    return dropped
+
+
+# (table, column) — String columns whose model length grew after release
+WIDENED_COLUMNS = [
+    ("achievements", "achievement_key"),
+]
+
+
+def widen_columns(conn: Connection) -> list[str]:
+    """Raise every registered column's VARCHAR length to the model's.
+
+    Returns the list of "table.column" names that were altered. SQLite does
+    not enforce VARCHAR lengths, so it has nothing to do.
+    """
+    if conn.dialect.name == "sqlite":
+        return []
+    inspector = inspect(conn)
+    widened = []
+    for table, column in WIDENED_COLUMNS:
+        length = Base.metadata.tables[table].c[column].type.length
+        stored = {c["name"]: c["type"] for c in inspector.get_columns(table)}[column]
+        if stored.length is None or stored.length >= length:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR({length})"))
+        widened.append(f"{table}.{column}")
+    return widened
+
+
+def backfill_schedule_masks(conn: Connection) -> int:
+    """Derive habits.schedule_mask from frequency/custom_days for every row.
+
+    Returns the number of habits updated.
+    """
+    rows = conn.execute(text("SELECT id, frequency, custom_days FROM habits")).all()
+    for habit_id, frequency, custom_days in rows:
+        if isinstance(custom_days, str):
+            custom_days = json.loads(custom_days)
+        conn.execute(
+            text("UPDATE habits SET schedule_mask = :mask WHERE id = :id"),
+            {"mask": compute_schedule_mask(frequency, custom_days), "id": habit_id},
+        )
+    return len(rows)
+
+
+def dedupe_achievements(conn: Connection) -> int:
+    """Delete duplicate achievements so the unique index can be created.
+
+    Keeps the earliest unlock per (user_id, achievement_type, achievement_key).
+    Returns the number of rows removed.
+    """
+    if conn.dialect.name == "sqlite":
+        result = conn.execute(text(
+            "DELETE FROM achievements WHERE rowid NOT IN ("
+            " SELECT MIN(rowid) FROM achievements"
+            " GROUP BY user_id, achievement_type, achievement_key"
+            ")"
+        ))
+    else:
+        result = conn.execute(text(
+            "DELETE FROM achievements a USING achievements b"
+            " WHERE a.user_id = b.user_id"
+            " AND a.achievement_type = b.achievement_type"
+            " AND a.achievement_key = b.achievement_key"
+            " AND (a.unlocked_at, a.id) > (b.unlocked_at, b.id)"
+        ))
+    return result.rowcount
+
+
+def _uuid_blob(value):
+    return None if value is None else uuid.UUID(str(value)).bytes
+
+
+def _uuid_hex(value):
+    if value is None:
+        return None
+    return (uuid.UUID(bytes=value) if isinstance(value, bytes) else uuid.UUID(value)).hex
+
+
+def _register_uuid_functions(conn: Connection) -> None:
+    """Make uuid_blob()/uuid_hex() available to SQL on this SQLite connection."""
+    driver = conn.connection.driver_connection
+    driver.create_function("uuid_blob", 1, _uuid_blob, deterministic=True)
+    driver.create_function("uuid_hex", 1, _uuid_hex, deterministic=True)
+
+
+def stale_column_conversions(conn: Connection, table_name: str) -> dict[str, str]:
+    """Return {column: SQL expression} for columns stored in an outdated format.
+
+    DayNumber columns still declared as text are converted from ISO strings
+    with julianday(). CompactUuid columns are converted between hex text and
+    16-byte BLOBs to match the dialect's binary_uuids setting.
+    """
+    table = Base.metadata.tables[table_name]
+    declared = {c["name"]: c["type"] for c in inspect(conn).get_columns(table_name)}
+    binary = binary_uuids_enabled(conn.dialect)
+    quote = conn.dialect.identifier_preparer.quote
+    conversions = {}
+    for column in table.columns:
+        if column.name not in declared:
+            continue
+        name = quote(column.name)
+        stored = declared[column.name]
+        if isinstance(column.type, DayNumber) and not isinstance(stored, Integer):
+            conversions[column.name] = f"CAST(julianday({name}) - 2440587.5 AS INTEGER)"
+        elif isinstance(column.type, CompactUuid):
+            is_blob = isinstance(stored, LargeBinary)
+            if binary and not is_blob:
+                conversions[column.name] = f"uuid_blob({name})"
+            elif is_blob and not binary:
+                conversions[column.name] = f"uuid_hex({name})"
+    return conversions
+
+
+def tables_needing_rebuild(conn: Connection) -> list[str]:
+    """Return tables with at least one column in an outdated storage format."""
+    existing = set(inspect(conn).get_table_names())
+    return [
+        table.name
+        for table in Base.metadata.sorted_tables
+        if table.name in existing and stale_column_conversions(conn, table.name)
+    ]
+
+
+def rebuild_table(conn: Connection, table_name: str, conversions: dict[str, str]) -> None:
+    """Rebuild a table to the model's column types, converting data on copy.
+
+    SQLite cannot change a column type in place, so this follows the
+    create-copy-drop-rename procedure. Columns in conversions are copied
+    through their SQL expression, the rest as-is. Indexes are dropped with
+    the old table and recreated by create_missing_indexes().
+    Foreign key enforcement must be off on conn.
+    """
+    table = Base.metadata.tables[table_name]
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    quote = conn.dialect.identifier_preparer.quote
+    new_name = f"_new_{table_name}"
+
+    conn.execute(text(f"DROP TABLE IF EXISTS {new_name}"))
+    ddl = str(CreateTable(table).compile(conn)).replace(
+        f"CREATE TABLE {table_name} ", f"CREATE TABLE {new_name} ", 1
+    )
+    conn.execute(text(ddl))
+
+    columns = [c for c in table.columns if c.name in existing]
+    targets = ", ".join(quote(c.name) for c in columns)
+    sources = ", ".join(conversions.get(c.name, quote(c.name)) for c in columns)
+    conn.execute(text(
+        f"INSERT INTO {new_name} ({targets}) SELECT {sources} FROM {table_name}"
+    ))
+    conn.execute(text(f"DROP TABLE {table_name}"))
+    conn.execute(text(f"ALTER TABLE {new_name} RENAME TO {table_name}"))
+
+
+def migrate_column_storage(engine: Engine) -> list[str]:
+    """Rebuild SQLite tables whose columns use an outdated storage format.
+
+    Covers String(10) ISO dates becoming integer day numbers and UUIDs
+    switching between hex text and BLOB (SQLITE_BINARY_UUIDS). Returns the
+    rebuilt table names. Runs on its own connection because PRAGMA
+    foreign_keys cannot change inside a transaction.
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+    with engine.connect() as conn:
+        stale = tables_needing_rebuild(conn)
+        conn.commit()
+        if not stale:
+            return []
+        _register_uuid_functions(conn)
+        conn.execute(text("PRAGMA foreign_keys=OFF"))
+        conn.commit()
+        try:
+            with conn.begin():
+                for table_name in stale:
+                    rebuild_table(conn, table_name, stale_column_conversions(conn, table_name))
+                violations = conn.execute(text("PRAGMA foreign_key_check")).all()
+                if violations:
+                    raise RuntimeError(f"Foreign key violations after rebuild: {violations}")
+        finally:
+            conn.execute(text("PRAGMA foreign_keys=ON"))
+            conn.commit()
+    return stale
+
+
+def rebuild_analytics_rollups(conn: Connection) -> int:
+    """Recompute every rollup from daily_logs, e.g. after a rollup column was added.
+
+    Returns the number of rollup rows written.
+    """
+    from app.services.rollup_service import rebuild_rollups
+
+    return rebuild_rollups(conn)
+
+
+def backfill_analytics_rollups(conn: Connection) -> int:
+    """Build analytics_rollups from daily_logs for databases that predate it.
+
+    Returns the number of rollup rows written; 0 when rollups already exist.
+    """
+    if conn.execute(text("SELECT 1 FROM analytics_rollups LIMIT 1")).first() is not None:
+        return 0
+    return rebuild_analytics_rollups(conn)
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """Create every model-declared index that does not exist yet."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def run_migrations(engine: Engine) -> None:
+    """Apply all pending migration steps.
+
+    Column and data steps run in one transaction, table rebuilds in their
+    own, and indexes are created last so rebuilt tables get theirs back.
+    """
+    with engine.begin() as conn:
+        added = add_missing_columns(conn)
+        drop_removed_columns(conn)
+        widen_columns(conn)
+        if "habits.schedule_mask" in added:
+            backfill_schedule_masks(conn)
+        if "analytics_rollups.completion_rate_ppm_sum" in added:
+            rebuild_analytics_rollups(conn)
+        achievement_indexes = {ix["name"] for ix in inspect(conn).get_indexes("achievements")}
+        if "uq_achievements_user_type_key" not in achievement_indexes:
+            dedupe_achievements(conn)
+    migrate_column_storage(engine)
+    with engine.begin() as conn:
+        create_missing_indexes(conn)
+        backfill_analytics_rollups(conn)
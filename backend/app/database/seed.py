@@ -9,6 +9,7 @@ from app.models.category import Category
 from app.models.reward import Reward
 from app.models.wish import Wish
 from app.models.quote import Quote
+from app.services.capsule_service import invalidate_reward_pool
 
 
 # ---------------------------------------------------------------------------
@@ -84,6 +85,7 @@ def seed_default_rewards(db: Session, user_id: uuid.UUID) -> None:
     for rw in _DEFAULT_REWARDS:
         db.add(Reward(user_id=user_id, **rw))
     db.commit()
+    invalidate_reward_pool(user_id)
 
 
 # ---------------------------------------------------------------------------
@@ -1,23 +1,148 @@
 """Database engine, session factory, and dependency."""
 
-from sqlalchemy import create_engine, event
+import logging
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.database.types import use_binary_uuids
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+logger = logging.getLogger(__name__)
 
+# PRAGMA read-back values that SQLite reports as integers
+_PRAGMA_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
 
-# CRITICAL: Enable SQLite foreign key enforcement on every connection
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str | int]) -> None:
+    """Enable FK enforcement and WAL, then apply the performance pragmas."""
     cursor = dbapi_connection.cursor()
+    # CRITICAL: Enable SQLite foreign key enforcement on every connection
     cursor.execute("PRAGMA foreign_keys=ON")
+    # Must precede WAL, which writes the header of a new database; existing
+    # databases keep their mode until a VACUUM on this same connection
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
     cursor.execute("PRAGMA journal_mode=WAL")
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
     cursor.close()
 
 
+def read_sqlite_pragmas(eng: Engine) -> dict[str, str | int]:
+    """Read back the effective values of the configured pragmas."""
+    effective = {}
+    with eng.connect() as conn:
+        for name in ["journal_mode", *settings.sqlite_pragmas]:
+            value = conn.execute(text(f"PRAGMA {name}")).scalar()
+            effective[name] = _PRAGMA_NAMES.get(name, {}).get(value, value)
+    return effective
+
+
+def log_database_settings(eng: Engine) -> None:
+    """Log the effective SQLite pragmas, or the pool settings for other databases."""
+    if eng.dialect.name == "sqlite":
+        effective = read_sqlite_pragmas(eng)
+        logger.info(
+            "SQLite profile %r: %s",
+            settings.SQLITE_PROFILE,
+            ", ".join(f"{name}={value}" for name, value in effective.items()),
+        )
+    else:
+        logger.info(
+            "%s pool: size=%d, max_overflow=%d, pre_ping=%s, recycle=%ds",
+            eng.dialect.name,
+            settings.DB_POOL_SIZE,
+            settings.DB_MAX_OVERFLOW,
+            settings.DB_POOL_PRE_PING,
+            settings.DB_POOL_RECYCLE,
+        )
+
+
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, settings.sqlite_pragmas)
+
+
+def _server_connect_args(url: URL) -> dict:
+    """Per-connection settings for PostgreSQL drivers."""
+    if url.get_backend_name() != "postgresql" or settings.DB_STATEMENT_TIMEOUT_MS is None:
+        return {}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+
+def create_db_engine(url: str | URL, pool_size: int | None = None, **kwargs) -> Engine:
+    """Create an engine with the connection setup its dialect needs.
+
+    SQLite gets the PRAGMA listener (and opt-in binary UUIDs); server
+    databases get a sized, pre-pinged connection pool.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        eng = create_engine(url, echo=False, **kwargs)
+        if settings.SQLITE_BINARY_UUIDS:
+            use_binary_uuids(eng)
+        event.listen(eng, "connect", set_sqlite_pragma)
+        return eng
+    return create_engine(
+        url,
+        echo=False,
+        connect_args=_server_connect_args(url),
+        **settings.pool_options(pool_size),
+        **kwargs,
+    )
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+
+
+def read_only_url(url: str) -> URL | None:
+    """Return a read-only (mode=ro) URI for a file-based SQLite URL, else None."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    if parsed.database.startswith("file:"):
+        return None
+    return parsed.set(database=f"file:{parsed.database}", query={"mode": "ro", "uri": "true"})
+
+
+def create_read_engine(url: str, writer: Engine) -> Engine:
+    """Create a read-only engine for report queries, sharing nothing with writer.
+
+    SQLite files are opened with mode=ro and PRAGMA query_only, so WAL
+    readers never take the write lock. PostgreSQL gets its own pool of
+    READ ONLY transactions. In-memory SQLite falls back to writer.
+    """
+    if writer.dialect.name == "postgresql":
+        return create_db_engine(
+            url,
+            pool_size=settings.DB_READ_POOL_SIZE,
+            execution_options={"postgresql_readonly": True},
+        )
+    ro_url = read_only_url(url)
+    if ro_url is None:
+        return writer
+    eng = create_engine(ro_url, echo=False)
+    if getattr(writer.dialect, "binary_uuids", False):
+        use_binary_uuids(eng)
+
+    @event.listens_for(eng, "connect")
+    def set_read_only_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        for name, value in settings.sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return eng
+
+
+read_engine = create_read_engine(settings.DATABASE_URL, engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db():
@@ -27,3 +152,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """FastAPI dependency that yields a session on the read-only engine."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
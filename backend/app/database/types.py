@@ -0,0 +1,79 @@
+"""Custom column types."""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import Integer, LargeBinary, Uuid
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.types import TypeDecorator
+
+from app.core.dates import from_day_number, to_day_number
+
+
+class DayNumber(TypeDecorator):
+    """Calendar date stored as an integer day number, exposed as an ISO string.
+
+    Python code and the API keep working with "YYYY-MM-DD" strings; the
+    database stores days since 1970-01-01, so comparisons are integer range
+    scans and rows/indexes stay compact. Binds accept ISO strings, date
+    objects or raw day numbers.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, (str, date)):
+            return to_day_number(value)
+        raise TypeError(f"Cannot store {type(value).__name__} as a day number")
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            # str: a not-yet-migrated ISO text column
+            return value
+        return from_day_number(value)
+
+
+def use_binary_uuids(engine: Engine) -> None:
+    """Store CompactUuid columns as 16-byte BLOBs on this (SQLite) engine.
+
+    Must be called before the engine is first used: dialect-level type
+    implementations are cached on first compile.
+    """
+    engine.dialect.binary_uuids = True
+
+
+def binary_uuids_enabled(dialect: Dialect) -> bool:
+    return getattr(dialect, "binary_uuids", False)
+
+
+class CompactUuid(TypeDecorator):
+    """UUID column that can be stored as a 16-byte BLOB instead of hex text.
+
+    Behaves exactly like sqlalchemy.Uuid (32-char hex on SQLite) unless the
+    engine opted in with use_binary_uuids(). Python always sees uuid.UUID.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if binary_uuids_enabled(dialect):
+            return dialect.type_descriptor(LargeBinary(16))
+        return dialect.type_descriptor(Uuid())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not binary_uuids_enabled(dialect):
+            return value
+        if isinstance(value, str):
+            value = uuid.UUID(value)
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or not binary_uuids_enabled(dialect):
+            return value
+        if isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        return uuid.UUID(value)
@@ -0,0 +1,303 @@
+"""Write execution — every committing endpoint runs its work as a job through a Writer.
+
+A job is a callable taking a Session; it performs its reads and writes,
+flushes, and returns the response data. The Writer commits.
+
+- InlineWriter (default) runs the job on the request's own session.
+- WriteExecutor (WRITE_QUEUE=true) funnels jobs from every request through
+  one thread and one dedicated SQLite connection. Jobs wait in a bounded
+  queue; the thread takes whatever has queued up (plus an optional short
+  window) and runs the batch in a single BEGIN IMMEDIATE transaction, each
+  job inside its own SAVEPOINT, then commits once. A failing job only rolls
+  back its savepoint; one that rolls back the whole session has the jobs
+  before it re-run in a fresh transaction. Callers are released after the group commit.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.database.session import apply_sqlite_pragmas, get_db
+from app.database.types import use_binary_uuids
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Job = Callable[[Session], T]
+
+
+class WriterBusy(RuntimeError):
+    """The write queue is full, or a job waited too long to start."""
+
+
+class InlineWriter:
+    """Run jobs directly on the request session and commit."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run(self, job: Job[T]) -> T:
+        try:
+            result = job(self.db)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result
+
+
+@dataclass
+class _Task:
+    job: Job
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+class WriteExecutor:
+    """Single writer thread with a bounded queue and group commit."""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_queue: int = 256,
+        max_batch: int = 32,
+        batch_window: float = 0.0,
+        timeout: float = 5.0,
+    ):
+        self._session_factory = session_factory
+        self._queue: queue.Queue[_Task | None] = queue.Queue(maxsize=max_queue)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self._thread: threading.Thread | None = None
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Finish every queued job, then stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ── Submission ──────────────────────────────────────────────────────
+
+    def submit(self, job: Job[T]) -> "Future[T]":
+        """Queue a job; raises WriterBusy if the queue is full."""
+        task = _Task(job)
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["rejected"] += 1
+            raise WriterBusy("Write queue is full") from None
+        with self._stats_lock:
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+        return task.future
+
+    def run(self, job: Job[T]) -> T:
+        """Submit a job and wait for its group commit.
+
+        A job that has not started within the timeout is cancelled and
+        WriterBusy raised; one that has started is always waited for.
+        """
+        future = self.submit(job)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            if future.cancel():
+                with self._stats_lock:
+                    self._stats["timed_out"] += 1
+                raise WriterBusy("Timed out waiting for the writer") from None
+            return future.result()
+
+    # ── Writer thread ───────────────────────────────────────────────────
+
+    def _next_batch(self) -> list[_Task | None]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while batch[-1] is not None and len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is None
+            tasks = [t for t in batch if t is not None and t.future.set_running_or_notify_cancel()]
+            if tasks:
+                self._run_batch(tasks)
+            if stopping:
+                return
+
+    def _run_batch(self, tasks: list[_Task]) -> None:
+        results: list[tuple[_Task, object, BaseException | None]] = []
+        waits: dict[int, float] = {}  # queue wait per task, from its first start
+        runs = []
+        pending = list(tasks)
+        with self._session_factory() as db:
+            try:
+                while pending:
+                    task = pending.pop(0)
+                    started = time.perf_counter()
+                    waits.setdefault(id(task), started - task.queued_at)
+                    savepoint = db.begin_nested()
+                    try:
+                        result = task.job(db)
+                        savepoint.commit()
+                        results.append((task, result, None))
+                    except Exception as exc:  # noqa: BLE001 — handed to the caller
+                        if savepoint.is_active:
+                            savepoint.rollback()
+                        else:
+                            # The job ended the batch transaction itself (a
+                            # session-level rollback), taking the earlier jobs'
+                            # work with it: run those again in a fresh one.
+                            logger.warning("Write job ended the batch transaction; retrying")
+                            db.rollback()
+                            pending[:0] = [t for t, _, e in results if e is None]
+                            results = [r for r in results if r[2] is not None]
+                        results.append((task, None, exc))
+                    runs.append(time.perf_counter() - started)
+                db.commit()
+            except Exception as exc:
+                logger.exception("Group commit of %d write jobs failed", len(tasks))
+                db.rollback()
+                done = {id(task) for task, _, _ in results}
+                results = [(task, None, exc) for task, _, _ in results] + [
+                    (task, None, exc) for task in tasks if id(task) not in done
+                ]
+
+        for task, result, exc in results:
+            if exc is None:
+                task.future.set_result(result)
+            else:
+                task.future.set_exception(exc)
+        self._record(list(waits.values()), runs)
+
+    # ── Stats ───────────────────────────────────────────────────────────
+
+    def _record(self, waits: list[float], runs: list[float]) -> None:
+        with self._stats_lock:
+            s = self._stats
+            s["jobs"] += len(waits)
+            s["commits"] += 1
+            s["max_batch"] = max(s["max_batch"], len(waits))
+            s["wait_ms_total"] += sum(waits) * 1000
+            s["wait_ms_max"] = max(s["wait_ms_max"], max(waits, default=0) * 1000)
+            s["run_ms_total"] += sum(runs) * 1000
+            s["run_ms_max"] = max(s["run_ms_max"], max(runs, default=0) * 1000)
+
+    def stats(self) -> dict[str, float]:
+        """Job counts, batch sizes and per-job queue-wait/run timings (ms)."""
+        with self._stats_lock:
+            s = dict(self._stats)
+        jobs = s["jobs"] or 1
+        s["depth"] = self._queue.qsize()
+        s["wait_ms_avg"] = s["wait_ms_total"] / jobs
+        s["run_ms_avg"] = s["run_ms_total"] / jobs
+        return s
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats = {
+                "jobs": 0, "commits": 0, "rejected": 0, "timed_out": 0,
+                "max_batch": 0, "max_depth": 0,
+                "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+                "run_ms_total": 0.0, "run_ms_max": 0.0,
+            }
+
+
+def create_writer_engine(url: str) -> Engine:
+    """Engine holding the single writer connection.
+
+    pysqlite's implicit transaction handling is switched off so SQLAlchemy's
+    BEGIN IMMEDIATE and SAVEPOINTs map directly onto SQLite: the write lock
+    is taken up front and per-job savepoints nest inside the batch.
+    """
+    eng = create_engine(url, echo=False, pool_size=1, max_overflow=0)
+    if settings.SQLITE_BINARY_UUIDS:
+        use_binary_uuids(eng)
+
+    @event.listens_for(eng, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        apply_sqlite_pragmas(dbapi_connection, settings.sqlite_pragmas)
+
+    @event.listens_for(eng, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return eng
+
+
+# ── Process-wide executor ─────────────────────────────────────────────────
+
+_executor: WriteExecutor | None = None
+_writer_engine: Engine | None = None
+
+
+def start_write_executor(url: str | None = None) -> WriteExecutor:
+    """Create and start the process-wide executor on a SQLite database URL."""
+    global _executor, _writer_engine
+    if _executor is None:
+        _writer_engine = create_writer_engine(url or settings.DATABASE_URL)
+        _executor = WriteExecutor(
+            sessionmaker(bind=_writer_engine, autoflush=False, expire_on_commit=False),
+            max_queue=settings.WRITE_QUEUE_MAX_DEPTH,
+            max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+            batch_window=settings.WRITE_QUEUE_BATCH_WINDOW_MS / 1000,
+            timeout=settings.WRITE_QUEUE_TIMEOUT,
+        )
+        _executor.start()
+    return _executor
+
+
+def stop_write_executor() -> None:
+    """Drain and stop the process-wide executor, if running."""
+    global _executor, _writer_engine
+    if _executor is not None:
+        _executor.stop()
+        _writer_engine.dispose()
+        _executor = _writer_engine = None
+
+
+def get_write_executor() -> WriteExecutor | None:
+    return _executor
+
+
+def get_writer_engine() -> Engine | None:
+    return _writer_engine
+
+
+Writer = InlineWriter | WriteExecutor
+
+
+def get_writer(db: Session = Depends(get_db)) -> Writer:
+    """FastAPI dependency: the running executor, else an InlineWriter on db."""
+    return _executor if _executor is not None else InlineWriter(db)
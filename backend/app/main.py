@@ -2,31 +2,59 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.database.base import Base
-from app.database.session import engine
+from app.database.migrations import run_migrations
+from app.database.maintenance import start_maintenance, stop_maintenance
+from app.database.session import engine, log_database_settings, read_engine
+from app.database.writer import (
+    WriterBusy,
+    get_writer_engine,
+    start_write_executor,
+    stop_write_executor,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create tables on startup."""
+    """Create tables and apply pending migrations on startup."""
     import app.models  # noqa: F401 — register all models with Base.metadata
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    log_database_settings(engine)
 
-    # Seed default data on startup (idempotent)
+    # Seed default data on startup (idempotent), then warm the quote catalog
     from app.database.seed import seed_all
     from app.database.session import SessionLocal
+    from app.services.quote_catalog import load_quote_catalog
     db = SessionLocal()
     try:
         seed_all(db)
+        load_quote_catalog(db)
     finally:
         db.close()
 
+    if settings.WRITE_QUEUE and engine.dialect.name == "sqlite":
+        start_write_executor()
+
+    if settings.MAINTENANCE and engine.dialect.name == "sqlite":
+        writer_engine = get_writer_engine()
+        watch = [engine, read_engine] + ([writer_engine] if writer_engine else [])
+        start_maintenance(settings.DATABASE_URL, watch)
+
     yield
 
+    stop_maintenance()
+    stop_write_executor()
+
+    if settings.ASYNC_DB:
+        from app.database.async_session import dispose_async_engine
+        await dispose_async_engine()
+
 
 app = FastAPI(title=settings.APP_TITLE, lifespan=lifespan)
 
@@ -40,6 +68,12 @@ if settings.cors_origin_list:
         allow_headers=["*"],
     )
 
+
+@app.exception_handler(WriterBusy)
+async def writer_busy_handler(request: Request, exc: WriterBusy):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 # Wire API routes
 from app.api.router import api_router  # noqa: E402
 
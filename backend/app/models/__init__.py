@@ -4,8 +4,10 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.habit import Habit
 from app.models.habit_log import HabitLog
+from app.models.habit_log_archive import HabitLogArchive
 from app.models.habit_streak import HabitStreak
 from app.models.daily_log import DailyLog
+from app.models.analytics_rollup import AnalyticsRollup
 from app.models.streak import Streak
 from app.models.power_level import PowerLevel
 from app.models.reward import Reward
@@ -21,8 +23,10 @@ __all__ = [
     "Category",
     "Habit",
     "HabitLog",
+    "HabitLogArchive",
     "HabitStreak",
     "DailyLog",
+    "AnalyticsRollup",
     "Streak",
     "PowerLevel",
     "Reward",
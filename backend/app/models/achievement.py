@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, JSON, ForeignKey, Uuid
+from sqlalchemy import Index, String, JSON, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -12,11 +12,20 @@ from app.database.base import Base
 
 class Achievement(Base):
     __tablename__ = "achievements"
+    __table_args__ = (
+        Index(
+            "uq_achievements_user_type_key",
+            "user_id", "achievement_type", "achievement_key",
+            unique=True,
+        ),
+        Index("ix_achievements_user_unlocked", "user_id", "unlocked_at"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     achievement_type: Mapped[str] = mapped_column(String(50))
-    achievement_key: Mapped[str] = mapped_column(String(50))
+    # Per-habit keys ("habit_<uuid>_streak_<n>") run past 50 characters
+    achievement_key: Mapped[str] = mapped_column(String(100))
     milestone_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     unlocked_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     metadata_json: Mapped[Optional[dict]] = mapped_column(
@@ -0,0 +1,36 @@
+"""AnalyticsRollup model — DailyLog totals per user per ISO week and per month."""
+
+import uuid
+
+from sqlalchemy import String, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.types import DayNumber
+
+
+class AnalyticsRollup(Base):
+    """Sums of a user's DailyLog rows over one week or one month.
+
+    period is "week" (period_start is the ISO week's Monday) or "month"
+    (period_start is the 1st). Kept in step with daily_logs by the flush
+    hooks in rollup_service, so every column is a plain running total;
+    all are integers, so the deltas never accumulate rounding error.
+    """
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "period_start", name="uq_analytics_rollup_period"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
+    period: Mapped[str] = mapped_column(String(8))  # week | month
+    period_start: Mapped[str] = mapped_column(DayNumber)  # YYYY-MM-DD
+    days_tracked: Mapped[int] = mapped_column(default=0)
+    habits_due: Mapped[int] = mapped_column(default=0)
+    habits_completed: Mapped[int] = mapped_column(default=0)
+    # Sum of the days' habit_completion_rate in parts per million
+    completion_rate_ppm_sum: Mapped[int] = mapped_column(default=0)
+    xp_earned: Mapped[int] = mapped_column(default=0)
+    perfect_days: Mapped[int] = mapped_column(default=0)
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Uuid
+from sqlalchemy import Index, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -11,8 +11,11 @@ from app.database.base import Base
 
 class CapsuleDrop(Base):
     __tablename__ = "capsule_drops"
+    __table_args__ = (
+        Index("ix_capsule_drops_user_dropped", "user_id", "dropped_at"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     reward_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("rewards.id"))
     habit_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("habits.id"))
@@ -1,11 +1,13 @@
 """DailyLog model — one entry per user per day with UniqueConstraint."""
 
 import uuid
+from typing import Optional
 
-from sqlalchemy import String, Float, ForeignKey, UniqueConstraint, Uuid
+from sqlalchemy import String, Float, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
+from app.database.types import DayNumber
 
 
 class DailyLog(Base):
@@ -14,9 +16,9 @@ class DailyLog(Base):
         UniqueConstraint("user_id", "log_date", name="uq_user_log_date"),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
-    log_date: Mapped[str] = mapped_column(String(10))  # YYYY-MM-DD
+    log_date: Mapped[str] = mapped_column(DayNumber)  # YYYY-MM-DD
     habits_due: Mapped[int] = mapped_column(default=0)
     habits_completed: Mapped[int] = mapped_column(default=0)
     habit_completion_rate: Mapped[float] = mapped_column(Float, default=0.0)
@@ -26,6 +28,9 @@ class DailyLog(Base):
     streak_multiplier: Mapped[float] = mapped_column(Float, default=1.0)
     zenkai_bonus_applied: Mapped[bool] = mapped_column(default=False)
     dragon_ball_earned: Mapped[bool] = mapped_column(default=False)
+    # User.schedule_version the habits_due/habits_completed counters were last
+    # recounted against; NULL forces a full recount on the next check.
+    schedule_version: Mapped[Optional[int]] = mapped_column(nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="daily_logs")
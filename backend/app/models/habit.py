@@ -4,16 +4,42 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, JSON, Uuid
+from sqlalchemy import String, Text, ForeignKey, Index, JSON, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
+from app.database.types import DayNumber
+
+# Weekday bitmask: bit n set = due on date.weekday() == n (Mon=0 .. Sun=6)
+ALL_DAYS_MASK = 0b1111111
+WEEKDAYS_MASK = 0b0011111
+
+
+def compute_schedule_mask(frequency: str, custom_days: list | None) -> int:
+    """Return the weekday bitmask for a frequency/custom_days pair.
+
+    custom_days uses ISO weekdays (Mon=1 .. Sun=7). Pure function.
+    """
+    if frequency == "daily":
+        return ALL_DAYS_MASK
+    if frequency == "weekdays":
+        return WEEKDAYS_MASK
+    if frequency == "custom" and custom_days:
+        mask = 0
+        for day in custom_days:
+            if 1 <= day <= 7:
+                mask |= 1 << (day - 1)
+        return mask
+    return 0
 
 
 class Habit(Base):
     __tablename__ = "habits"
+    __table_args__ = (
+        Index("ix_habits_user_active_mask", "user_id", "is_active", "schedule_mask"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         ForeignKey("categories.id", ondelete="SET NULL"),
@@ -26,10 +52,11 @@ class Habit(Base):
     attribute: Mapped[str] = mapped_column(String(3))
     frequency: Mapped[str] = mapped_column(String(20), default="daily")
     custom_days: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    schedule_mask: Mapped[int] = mapped_column(default=0)  # derived from frequency/custom_days
     target_time: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
     is_temporary: Mapped[bool] = mapped_column(default=False)
-    start_date: Mapped[str] = mapped_column(String(10))
-    end_date: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    start_date: Mapped[str] = mapped_column(DayNumber)
+    end_date: Mapped[Optional[str]] = mapped_column(DayNumber, nullable=True)
     sort_order: Mapped[int] = mapped_column(default=0)
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -39,3 +66,12 @@ class Habit(Base):
     category: Mapped[Optional["Category"]] = relationship(back_populates="habits")
     logs: Mapped[list["HabitLog"]] = relationship(back_populates="habit")
     habit_streak: Mapped[Optional["HabitStreak"]] = relationship(back_populates="habit", uselist=False)
+
+
+@event.listens_for(Habit, "before_insert")
+@event.listens_for(Habit, "before_update")
+def _sync_schedule_mask(mapper, connection, target: Habit) -> None:
+    """Keep schedule_mask in step with frequency/custom_days on every write."""
+    target.schedule_mask = compute_schedule_mask(
+        target.frequency or "daily", target.custom_days
+    )
@@ -0,0 +1,32 @@
+"""HabitLogArchive model — one row per habit per month for compacted HabitLogs."""
+
+import uuid
+
+from sqlalchemy import ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.types import DayNumber
+
+
+class HabitLogArchive(Base):
+    """Completed days of one habit in one month, folded out of habit_logs.
+
+    Bit i of completed_mask is day i + 1 of the month. day_xp holds the
+    attribute XP of each day as little-endian uint32s, one per day of the
+    month; completions and xp_total are the mask's popcount and XP sum.
+    """
+
+    __tablename__ = "habit_log_archives"
+    __table_args__ = (
+        UniqueConstraint("habit_id", "month_start", name="uq_habit_log_archive_month"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
+    habit_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("habits.id"))
+    month_start: Mapped[str] = mapped_column(DayNumber)  # YYYY-MM-01
+    completed_mask: Mapped[int] = mapped_column(default=0)
+    completions: Mapped[int] = mapped_column(default=0)
+    xp_total: Mapped[int] = mapped_column(default=0)
+    day_xp: Mapped[bytes] = mapped_column(LargeBinary)
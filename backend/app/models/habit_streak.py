@@ -3,21 +3,25 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey, Uuid
+from sqlalchemy import Index, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
+from app.database.types import DayNumber
 
 
 class HabitStreak(Base):
     __tablename__ = "habit_streaks"
+    __table_args__ = (
+        Index("ix_habit_streaks_habit", "habit_id"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     habit_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("habits.id"))
     current_streak: Mapped[int] = mapped_column(default=0)
     best_streak: Mapped[int] = mapped_column(default=0)
-    last_completed_date: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    last_completed_date: Mapped[Optional[str]] = mapped_column(DayNumber, nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship()
@@ -4,18 +4,22 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, Uuid
+from sqlalchemy import Index, String, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
+from app.database.types import DayNumber
 
 
 class OffDay(Base):
     __tablename__ = "off_days"
+    __table_args__ = (
+        Index("ix_off_days_user_date", "user_id", "off_date"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
-    off_date: Mapped[str] = mapped_column(String(10))  # YYYY-MM-DD
+    off_date: Mapped[str] = mapped_column(DayNumber)  # YYYY-MM-DD
     reason: Mapped[str] = mapped_column(String(20), default="rest")
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -3,7 +3,7 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import String, Text, Uuid
+from sqlalchemy import Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base
@@ -11,8 +11,11 @@ from app.database.base import Base
 
 class Quote(Base):
     __tablename__ = "quotes"
+    __table_args__ = (
+        Index("ix_quotes_trigger_character_severity", "trigger_event", "character", "severity"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     character: Mapped[str] = mapped_column(String(20))
     quote_text: Mapped[str] = mapped_column(Text)
     source_saga: Mapped[str] = mapped_column(String(100))
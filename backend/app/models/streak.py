@@ -3,20 +3,21 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey, Uuid
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
+from app.database.types import DayNumber
 
 
 class Streak(Base):
     __tablename__ = "streaks"
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     current_streak: Mapped[int] = mapped_column(default=0)
     best_streak: Mapped[int] = mapped_column(default=0)
-    last_active_date: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    last_active_date: Mapped[Optional[str]] = mapped_column(DayNumber, nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="streaks")
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Uuid
+from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -12,7 +12,7 @@ from app.database.base import Base
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     username: Mapped[str] = mapped_column(String(100), default="default-user")
     display_name: Mapped[str] = mapped_column(String(100), default="Saiyan")
     dragon_balls_collected: Mapped[int] = mapped_column(default=0)
@@ -23,6 +23,7 @@ class User(Base):
     ki_xp: Mapped[int] = mapped_column(default=0)
     power_level: Mapped[int] = mapped_column(default=0)
     current_transformation: Mapped[str] = mapped_column(String(20), default="base")
+    schedule_version: Mapped[int] = mapped_column(default=0)  # bumped on habit schedule changes
     sound_enabled: Mapped[bool] = mapped_column(default=True)
     theme: Mapped[str] = mapped_column(String(10), default="dark")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -0,0 +1,37 @@
+"""Pydantic schemas for admin endpoints."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class MaintenanceTaskStatus(BaseModel):
+    name: str
+    interval_s: float
+    next_run_in_s: float
+    runs: int
+    failures: int
+    last_run_at: datetime | None
+    last_duration_ms: float | None
+    last_result: dict | None
+    last_error: str | None
+
+
+class MaintenanceStatus(BaseModel):
+    enabled: bool
+    idle_seconds: float | None = None
+    tasks: list[MaintenanceTaskStatus] = []
+
+
+class BackupResponse(BaseModel):
+    path: str
+    size_bytes: int
+    pages: int
+    duration_ms: float
+    removed: list[str]
+
+
+class BackupFile(BaseModel):
+    name: str
+    size_bytes: int
+    created_at: datetime
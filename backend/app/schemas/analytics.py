@@ -57,3 +57,34 @@ class CompletionTrend(BaseModel):
     monthly_delta: float  # current - previous month (percentage points)
     monthly_habits_due: int  # raw count for last 30 days
     monthly_habits_completed: int
+
+
+class RollingCompletionDay(BaseModel):
+    date: str
+    rate_7d: float  # habits_completed / habits_due over the 7 days ending on date
+    rate_30d: float  # same over 30 days
+
+
+class WeekdayStat(BaseModel):
+    weekday: int  # Mon=0 .. Sun=6
+    days_tracked: int
+    habits_due: int
+    habits_completed: int
+    completion_rate: float
+    avg_xp: float  # xp_earned per tracked day
+    perfect_days: int
+
+
+class HabitCompletionRow(BaseModel):
+    habit_id: uuid.UUID
+    title: str
+    completed: list[bool]  # one per day, start_date .. end_date
+    due_days: int
+    completions: int
+    completion_rate: float  # completed due days / due days
+
+
+class HabitCompletionMatrix(BaseModel):
+    start_date: str
+    end_date: str
+    habits: list[HabitCompletionRow]
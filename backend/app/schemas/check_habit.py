@@ -1,4 +1,4 @@
-"""Pydantic schemas for check/uncheck habit endpoint (used by Plan 03-02)."""
+"""Pydantic schemas for check/uncheck habit endpoints (used by Plan 03-02)."""
 
 import uuid
 
@@ -67,3 +67,31 @@ class CheckHabitResponse(BaseModel):
     capsule: CapsuleDropDetail | None = None
     quote: QuoteDetail | None = None
     events: list[dict] = []
+
+
+class CheckHabitBatchRequest(BaseModel):
+    local_date: str = Field(pattern=r"^\d{4}-\d{2}-\d{2}$")
+    habit_ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class HabitCheckResult(BaseModel):
+    habit_id: uuid.UUID
+    is_checking: bool
+    attribute_xp_awarded: int
+    habit_streak: StreakInfo
+    capsule: CapsuleDropDetail | None = None
+
+
+class CheckHabitBatchResponse(BaseModel):
+    log_date: str
+    results: list[HabitCheckResult]
+    is_perfect_day: bool
+    zenkai_activated: bool
+    daily_log: DailyLogSummary
+    streak: StreakInfo
+    power_level: int
+    transformation: str
+    transform_change: TransformChange | None = None
+    dragon_ball: DragonBallInfo | None = None
+    quote: QuoteDetail | None = None
+    events: list[dict] = []
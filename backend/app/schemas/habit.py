@@ -19,7 +19,7 @@ class HabitCreate(BaseModel):
     target_time: str | None = None
     is_temporary: bool = False
     start_date: str = Field(pattern=r"^\d{4}-\d{2}-\d{2}$")
-    end_date: str | None = None
+    end_date: str | None = Field(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$")
     sort_order: int = 0
 
 
@@ -34,8 +34,8 @@ class HabitUpdate(BaseModel):
     category_id: uuid.UUID | None = None
     target_time: str | None = None
     is_temporary: bool | None = None
-    start_date: str | None = None
-    end_date: str | None = None
+    start_date: str | None = Field(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$")
+    end_date: str | None = Field(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$")
     sort_order: int | None = None
     is_active: bool | None = None
 
@@ -11,16 +11,24 @@ from app.services.attribute_service import (
     get_attribute_title,
     get_xp_for_next_level,
 )
-from app.services.capsule_service import roll_capsule_drop
+from app.services.capsule_service import (
+    get_reward_pool,
+    invalidate_reward_pool,
+    lookup_rewards,
+    reward_pool_stats,
+    roll_capsule_drop,
+)
 from app.services.dragon_ball_service import (
     award_dragon_ball,
     grant_wish,
     revoke_dragon_ball,
 )
 from app.services.power_service import (
+    apply_power_delta,
     check_transformation_change,
     get_transformation_for_power,
     recalculate_power_level,
+    repair_power_levels,
 )
 from app.services.streak_service import (
     check_zenkai_recovery,
@@ -34,9 +42,30 @@ from app.services.off_day_service import (
     is_off_day,
     mark_off_day,
 )
+from app.services.archive_service import (
+    archive_cutoff,
+    compact_habit_logs,
+    completed_days,
+    completed_on,
+    completion_totals,
+    is_archived_date,
+)
+from app.services.rollup_service import RollupTotals, period_totals, rebuild_rollups
+from app.services.analytics_engine import (
+    DailySeries,
+    HabitMatrix,
+    load_daily_series,
+    load_habit_matrix,
+    rolling_completion_rate,
+    weekday_totals,
+)
+from app.services.game_state import GameState, load_game_state
 from app.services.habit_service import (
     check_habit,
+    check_habits_batch,
     get_habits_due_on_date,
+    is_habit_due,
+    recount_daily_log,
 )
 
 __all__ = [
@@ -50,15 +79,21 @@ __all__ = [
     "get_attribute_title",
     "get_xp_for_next_level",
     # Capsule
+    "get_reward_pool",
+    "invalidate_reward_pool",
+    "lookup_rewards",
+    "reward_pool_stats",
     "roll_capsule_drop",
     # Dragon Ball
     "award_dragon_ball",
     "grant_wish",
     "revoke_dragon_ball",
     # Power / Transformation
+    "apply_power_delta",
     "check_transformation_change",
     "get_transformation_for_power",
     "recalculate_power_level",
+    "repair_power_levels",
     # Streak
     "check_zenkai_recovery",
     "get_or_create_habit_streak",
@@ -71,5 +106,29 @@ __all__ = [
     "mark_off_day",
     # Habit
     "check_habit",
+    "check_habits_batch",
     "get_habits_due_on_date",
+    "is_habit_due",
+    "recount_daily_log",
+    # Archive
+    "archive_cutoff",
+    "compact_habit_logs",
+    "completed_days",
+    "completed_on",
+    "completion_totals",
+    "is_archived_date",
+    # Analytics rollups
+    "RollupTotals",
+    "period_totals",
+    "rebuild_rollups",
+    # Analytics engine
+    "DailySeries",
+    "HabitMatrix",
+    "load_daily_series",
+    "load_habit_matrix",
+    "rolling_completion_rate",
+    "weekday_totals",
+    # Game state
+    "GameState",
+    "load_game_state",
 ]
@@ -1,6 +1,7 @@
 """Achievement service — milestone detection, level-up detection, achievement recording."""
 
 import uuid
+from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -10,6 +11,33 @@ from app.models.achievement import Achievement
 from app.services.attribute_service import calc_attribute_level, get_attribute_title
 
 
+def _insert_ignore(db: Session):
+    """Dialect-specific INSERT for achievements that skips duplicate keys."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Achievement)
+
+
+def _achievement_row(
+    user_id: UUID,
+    achievement_type: str,
+    achievement_key: str,
+    milestone_type: str | None = None,
+    metadata: dict | None = None,
+) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "achievement_type": achievement_type,
+        "achievement_key": achievement_key,
+        "milestone_type": milestone_type,
+        "unlocked_at": datetime.utcnow(),
+        "metadata_json": metadata,
+    }
+
+
 def record_achievement(
     db: Session,
     user_id: UUID,
@@ -18,34 +46,49 @@ def record_achievement(
     milestone_type: str | None = None,
     metadata: dict | None = None,
 ) -> Achievement | None:
-    """Record an achievement with check-before-insert deduplication.
+    """Record an achievement, ignoring it if already unlocked.
+
+    Deduplication is enforced by the unique index on
+    (user_id, achievement_type, achievement_key) with INSERT ... ON CONFLICT
+    DO NOTHING, so concurrent checks cannot record the same milestone twice.
 
     Returns the new Achievement if created, None if already exists.
     Follows service convention: flush but don't commit.
     """
-    existing = (
-        db.query(Achievement)
-        .filter(
-            Achievement.user_id == user_id,
-            Achievement.achievement_type == achievement_type,
-            Achievement.achievement_key == achievement_key,
-        )
-        .first()
+    db.flush()
+    row = _achievement_row(
+        user_id, achievement_type, achievement_key, milestone_type, metadata
     )
-    if existing is not None:
-        return None
-
-    achievement = Achievement(
-        id=uuid.uuid4(),
-        user_id=user_id,
-        achievement_type=achievement_type,
-        achievement_key=achievement_key,
-        milestone_type=milestone_type,
-        metadata_json=metadata,
+    stmt = (
+        _insert_ignore(db)
+        .values(row)
+        .on_conflict_do_nothing()
+        .returning(Achievement)
     )
-    db.add(achievement)
+    return db.scalars(stmt).first()
+
+
+def record_achievements(
+    db: Session, user_id: UUID, pending: list[dict]
+) -> set[tuple[str, str]]:
+    """Record many achievements in one INSERT ... ON CONFLICT DO NOTHING.
+
+    Each entry in pending holds achievement_type, achievement_key and
+    optionally milestone_type and metadata (the record_achievement kwargs).
+    Returns the (achievement_type, achievement_key) pairs that were newly
+    inserted; already-unlocked ones are skipped.
+    """
+    if not pending:
+        return set()
     db.flush()
-    return achievement
+    rows = [_achievement_row(user_id, **p) for p in pending]
+    stmt = (
+        _insert_ignore(db)
+        .values(rows)
+        .on_conflict_do_nothing()
+        .returning(Achievement.achievement_type, Achievement.achievement_key)
+    )
+    return {(r.achievement_type, r.achievement_key) for r in db.execute(stmt)}
 
 
 def detect_streak_milestones(
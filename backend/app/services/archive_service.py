@@ -0,0 +1,233 @@
+"""HabitLog archive — compact old logs into monthly rows and read across both tiers.
+
+Logs dated before the archive cutoff (the first of the month that contains
+today minus HABIT_LOG_ARCHIVE_DAYS) are folded into one HabitLogArchive row
+per habit per month and deleted from habit_logs, so the live table holds at
+most a bounded window. Archived days are read-only: checking, unchecking or
+marking an off day there would need the per-day log that no longer exists.
+
+The readers below return the same shapes whichever tier a day lives in.
+"""
+
+import struct
+import uuid
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.habit_log import HabitLog
+from app.models.habit_log_archive import HabitLogArchive
+
+_COMPLETED = HabitLog.completed == True  # noqa: E712
+
+# Habits compacted per pass; bounds memory and the size of the IN (...) lists
+_COMPACT_HABITS = 200
+
+_LIVE_TOTALS = select(
+    func.count(HabitLog.id), func.coalesce(func.sum(HabitLog.attribute_xp_awarded), 0)
+).where(HabitLog.habit_id == bindparam("habit_id"), _COMPLETED)
+
+_ARCHIVE_TOTALS = select(
+    func.coalesce(func.sum(HabitLogArchive.completions), 0),
+    func.coalesce(func.sum(HabitLogArchive.xp_total), 0),
+).where(HabitLogArchive.habit_id == bindparam("habit_id"))
+
+_LIVE_COMPLETED_ON = select(HabitLog.habit_id, HabitLog.attribute_xp_awarded).where(
+    HabitLog.habit_id.in_(bindparam("habit_ids", expanding=True)),
+    HabitLog.log_date == bindparam("local_date"),
+    _COMPLETED,
+)
+
+_ARCHIVES_FOR_MONTH = select(HabitLogArchive).where(
+    HabitLogArchive.habit_id.in_(bindparam("habit_ids", expanding=True)),
+    HabitLogArchive.month_start == bindparam("month_start"),
+)
+
+
+# ── Packing ─────────────────────────────────────────────────────────────
+
+
+def _days_in_month(month_start: str) -> int:
+    first = date.fromisoformat(month_start)
+    return monthrange(first.year, first.month)[1]
+
+
+def _unpack_xp(archive: HabitLogArchive) -> tuple[int, ...]:
+    return struct.unpack(f"<{_days_in_month(archive.month_start)}I", archive.day_xp)
+
+
+def _archived_days(archive: HabitLogArchive):
+    """Yield (iso date, xp) for each completed day of an archive row."""
+    first = date.fromisoformat(archive.month_start)
+    for i, xp in enumerate(_unpack_xp(archive)):
+        if archive.completed_mask >> i & 1:
+            yield (first + timedelta(days=i)).isoformat(), xp
+
+
+# ── Cutoff ──────────────────────────────────────────────────────────────
+
+
+def archive_cutoff(today: date | None = None) -> str | None:
+    """First live date, or None when archiving is disabled.
+
+    The cutoff is always the first of a month, so an archive row never
+    covers a month that still has live logs.
+    """
+    if settings.HABIT_LOG_ARCHIVE_DAYS <= 0:
+        return None
+    horizon = (today or date.today()) - timedelta(days=settings.HABIT_LOG_ARCHIVE_DAYS)
+    return horizon.replace(day=1).isoformat()
+
+
+def is_archived_date(local_date: str) -> bool:
+    """True if local_date is before the archive cutoff and therefore read-only."""
+    cutoff = archive_cutoff()
+    return cutoff is not None and local_date < cutoff
+
+
+# ── Compaction ──────────────────────────────────────────────────────────
+
+
+def compact_habit_logs(db: Session, cutoff: str | None = None) -> dict:
+    """Fold every HabitLog dated before cutoff into monthly archive rows.
+
+    Completed logs set their day's bit and XP in the habit's row for that
+    month, created if missing; a day already archived keeps its value, so
+    running the compaction again is a no-op. Uncompleted logs (left behind
+    by unchecks) are dropped. Works through _COMPACT_HABITS habits at a
+    time, so only one chunk's old logs are in memory however large the
+    backlog. Flushes but does not commit.
+    """
+    totals = {"archived_logs": 0, "dropped_logs": 0, "months": 0}
+    cutoff = cutoff or archive_cutoff()
+    if cutoff is None:
+        return totals
+
+    habit_ids = db.scalars(
+        select(HabitLog.habit_id).where(HabitLog.log_date < cutoff).distinct()
+    ).all()
+    for i in range(0, len(habit_ids), _COMPACT_HABITS):
+        chunk = _compact_chunk(db, habit_ids[i : i + _COMPACT_HABITS], cutoff)
+        for key, value in chunk.items():
+            totals[key] += value
+    return totals
+
+
+def _compact_chunk(db: Session, habit_ids: list[UUID], cutoff: str) -> dict:
+    old_logs = (HabitLog.habit_id.in_(habit_ids), HabitLog.log_date < cutoff)
+    rows = db.execute(
+        select(
+            HabitLog.user_id,
+            HabitLog.habit_id,
+            HabitLog.log_date,
+            HabitLog.completed,
+            HabitLog.attribute_xp_awarded,
+        ).where(*old_logs)
+    ).all()
+
+    months: dict[tuple[UUID, str], list] = defaultdict(list)
+    owners: dict[UUID, UUID] = {}
+    dropped = 0
+    for user_id, habit_id, log_date, completed, xp in rows:
+        if not completed:
+            dropped += 1
+            continue
+        day = date.fromisoformat(log_date)
+        months[(habit_id, day.replace(day=1).isoformat())].append((day.day, xp))
+        owners[habit_id] = user_id
+
+    existing = {}
+    if months:
+        archives = db.scalars(
+            select(HabitLogArchive).where(
+                HabitLogArchive.habit_id.in_(owners), HabitLogArchive.month_start < cutoff
+            )
+        )
+        existing = {(a.habit_id, a.month_start): a for a in archives}
+
+    for (habit_id, month_start), days in months.items():
+        archive = existing.get((habit_id, month_start))
+        if archive is None:
+            archive = HabitLogArchive(
+                id=uuid.uuid4(),
+                user_id=owners[habit_id],
+                habit_id=habit_id,
+                month_start=month_start,
+                completed_mask=0,
+            )
+            day_xp = [0] * _days_in_month(month_start)
+            db.add(archive)
+        else:
+            day_xp = list(_unpack_xp(archive))
+        mask = archive.completed_mask
+        for day_of_month, xp in days:
+            bit = day_of_month - 1
+            if not mask >> bit & 1:
+                mask |= 1 << bit
+                day_xp[bit] = xp
+        archive.completed_mask = mask
+        archive.completions = mask.bit_count()
+        archive.xp_total = sum(day_xp)
+        archive.day_xp = struct.pack(f"<{len(day_xp)}I", *day_xp)
+
+    db.execute(delete(HabitLog).where(*old_logs))
+    db.flush()
+    return {"archived_logs": len(rows) - dropped, "dropped_logs": dropped, "months": len(months)}
+
+
+# ── Reads across both tiers ──────────────────────────────────────────────
+
+
+def completed_days(
+    db: Session, habit_id: UUID, start: str | None = None, end: str | None = None
+) -> dict[str, int]:
+    """Completed dates of a habit in [start, end] mapped to their attribute XP."""
+    result: dict[str, int] = {}
+
+    query = select(HabitLogArchive).where(HabitLogArchive.habit_id == habit_id)
+    if start is not None:
+        query = query.where(HabitLogArchive.month_start >= start[:8] + "01")
+    if end is not None:
+        query = query.where(HabitLogArchive.month_start <= end)
+    for archive in db.scalars(query):
+        for day, xp in _archived_days(archive):
+            if (start is None or day >= start) and (end is None or day <= end):
+                result[day] = xp
+
+    query = select(HabitLog.log_date, HabitLog.attribute_xp_awarded).where(
+        HabitLog.habit_id == habit_id, _COMPLETED
+    )
+    if start is not None:
+        query = query.where(HabitLog.log_date >= start)
+    if end is not None:
+        query = query.where(HabitLog.log_date <= end)
+    result.update(db.execute(query).all())
+    return result
+
+
+def completion_totals(db: Session, habit_id: UUID) -> tuple[int, int]:
+    """All-time (completions, attribute XP) of a habit across both tiers."""
+    params = {"habit_id": habit_id}
+    live_count, live_xp = db.execute(_LIVE_TOTALS, params).one()
+    archived_count, archived_xp = db.execute(_ARCHIVE_TOTALS, params).one()
+    return live_count + archived_count, live_xp + archived_xp
+
+
+def completed_on(db: Session, habit_ids: list[UUID], local_date: str) -> dict[UUID, int]:
+    """Habits among habit_ids completed on local_date, mapped to their attribute XP."""
+    if not habit_ids:
+        return {}
+    params = {"habit_ids": habit_ids, "local_date": local_date}
+    result = dict(db.execute(_LIVE_COMPLETED_ON, params).all())
+
+    params = {"habit_ids": habit_ids, "month_start": local_date[:8] + "01"}
+    bit = int(local_date[8:]) - 1
+    for archive in db.scalars(_ARCHIVES_FOR_MONTH, params):
+        if archive.completed_mask >> bit & 1:
+            result.setdefault(archive.habit_id, _unpack_xp(archive)[bit])
+    return result
@@ -1,9 +1,12 @@
 """Capsule drop RNG with rarity fallback — rolls for capsule loot on habit completion."""
 
 import random
+import threading
 import uuid
+from typing import NamedTuple
 from uuid import UUID
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.core.constants import CAPSULE_DROP_CHANCE, CAPSULE_RARITY_WEIGHTS
@@ -14,6 +17,130 @@ from app.models.reward import Reward
 RARITY_FALLBACK_ORDER = ["epic", "rare", "common"]
 
 
+class PooledReward(NamedTuple):
+    """Cached view of an active reward — enough to roll and describe a drop."""
+
+    id: UUID
+    title: str
+    rarity: str
+
+
+# ── Reward pool cache ─────────────────────────────────────────────────────
+# user_id -> {rarity: (PooledReward, ...)}, active rewards only.
+# Invalidated by the reward CRUD endpoints and reward seeding, which only
+# reaches the worker process that handled the change: a pool cached by
+# another worker can still hold a deleted or deactivated reward. So
+# roll_capsule_drop() confirms the reward it drew before dropping it, and
+# reloads this process's pool when it is gone.
+# Every invalidation bumps a generation (per user, or the global one for
+# "everyone"); a pool read from the database is only stored if neither
+# changed while it was loading, so a load racing a reward change can't put
+# the old pool back after the invalidation.
+
+_reward_pools: dict[UUID, dict[str, tuple[PooledReward, ...]]] = {}
+_pool_generations: dict[UUID, int] = {}
+_all_pools_generation = 0
+_pool_lock = threading.Lock()
+_pool_stats = {"hits": 0, "misses": 0}
+
+
+def _pool_generation(user_id: UUID) -> tuple[int, int]:
+    """Current generation of a user's pool; call with _pool_lock held."""
+    return _all_pools_generation, _pool_generations.get(user_id, 0)
+
+
+def get_reward_pool(
+    db: Session, user_id: UUID
+) -> dict[str, tuple[PooledReward, ...]]:
+    """Return the user's active rewards bucketed by rarity, loading on a miss."""
+    with _pool_lock:
+        pool = _reward_pools.get(user_id)
+        if pool is not None:
+            _pool_stats["hits"] += 1
+            return pool
+        _pool_stats["misses"] += 1
+        generation = _pool_generation(user_id)
+
+    rows = (
+        db.query(Reward.id, Reward.title, Reward.rarity)
+        .filter(Reward.user_id == user_id, Reward.is_active == True)  # noqa: E712
+        .all()
+    )
+    buckets: dict[str, list[PooledReward]] = {}
+    for row in rows:
+        buckets.setdefault(row.rarity, []).append(PooledReward(row.id, row.title, row.rarity))
+    pool = {rarity: tuple(rewards) for rarity, rewards in buckets.items()}
+
+    with _pool_lock:
+        if _pool_generation(user_id) == generation:
+            _reward_pools[user_id] = pool
+    return pool
+
+
+def invalidate_reward_pool(user_id: UUID | None = None) -> None:
+    """Drop the cached pool for one user, or for everyone if user_id is None."""
+    global _all_pools_generation
+    with _pool_lock:
+        if user_id is None:
+            _reward_pools.clear()
+            _all_pools_generation += 1
+        else:
+            _reward_pools.pop(user_id, None)
+            _pool_generations[user_id] = _pool_generations.get(user_id, 0) + 1
+
+
+def reward_pool_stats() -> dict:
+    """Return reward pool cache counters: hits, misses and cached users."""
+    with _pool_lock:
+        return {**_pool_stats, "size": len(_reward_pools)}
+
+
+def reset_reward_pool_stats() -> None:
+    """Zero the hit/miss counters."""
+    with _pool_lock:
+        _pool_stats["hits"] = 0
+        _pool_stats["misses"] = 0
+
+
+def lookup_rewards(
+    db: Session, user_id: UUID, reward_ids: set[UUID]
+) -> dict[UUID, PooledReward]:
+    """Resolve reward ids to cached entries, reading only cache misses.
+
+    Ids found in the user's cached pool cost nothing; the rest (e.g. rewards
+    deactivated since the drop) are fetched with a single IN query.
+    """
+    if not reward_ids:
+        return {}
+    with _pool_lock:
+        pool = _reward_pools.get(user_id, {})
+    found = {
+        reward.id: reward
+        for rewards in pool.values()
+        for reward in rewards
+        if reward.id in reward_ids
+    }
+
+    missing = reward_ids - found.keys()
+    if missing:
+        rows = (
+            db.query(Reward.id, Reward.title, Reward.rarity)
+            .filter(Reward.id.in_(missing))
+            .all()
+        )
+        for row in rows:
+            found[row.id] = PooledReward(row.id, row.title, row.rarity)
+    return found
+
+
+# Primary-key check of a drawn reward; see habit_service for why it is prebuilt
+_REWARD_IS_ACTIVE = (
+    select(Reward.id)
+    .where(Reward.id == bindparam("reward_id"), Reward.is_active == True)  # noqa: E712
+    .limit(1)
+)
+
+
 def select_rarity_tier() -> str:
     """Pick a rarity tier using weighted distribution."""
     return random.choices(
@@ -23,6 +150,19 @@ def select_rarity_tier() -> str:
     )[0]
 
 
+def _draw(
+    pool: dict[str, tuple[PooledReward, ...]], rolled_rarity: str
+) -> PooledReward | None:
+    """Pick a reward of the rolled tier, falling back to lower tiers."""
+    start_index = RARITY_FALLBACK_ORDER.index(rolled_rarity)
+    for tier in RARITY_FALLBACK_ORDER[start_index:]:
+        rewards = pool.get(tier)
+        if rewards:
+            return random.choice(rewards)
+    # No rewards at any fallback tier (e.g. only non-standard rarities)
+    return None
+
+
 def roll_capsule_drop(
     db: Session, user_id: UUID, habit_id: UUID
 ) -> CapsuleDrop | None:
@@ -31,15 +171,15 @@ def roll_capsule_drop(
     - Skips RNG entirely if no active rewards exist.
     - 25% chance to trigger a drop.
     - Picks rarity tier with weighted distribution, falls back to lower tiers.
+    - Rolls against the cached reward pool; a drop costs one primary-key
+      check of the drawn reward, and the pool is reloaded and the draw
+      repeated if another worker deleted or deactivated it.
     - Does NOT add to session — caller manages the transaction.
     """
+    pool = get_reward_pool(db, user_id)
+
     # Short-circuit: no active rewards -> no drop possible
-    reward_count = (
-        db.query(Reward)
-        .filter(Reward.user_id == user_id, Reward.is_active == True)  # noqa: E712
-        .count()
-    )
-    if reward_count == 0:
+    if not pool:
         return None
 
     # Roll the dice
@@ -48,27 +188,19 @@ def roll_capsule_drop(
 
     # Pick rarity tier
     rolled_rarity = select_rarity_tier()
+    chosen_reward = _draw(pool, rolled_rarity)
+    if chosen_reward is None:
+        return None
 
-    # Fallback: start from rolled rarity's index, iterate downward
-    start_index = RARITY_FALLBACK_ORDER.index(rolled_rarity)
-    for tier in RARITY_FALLBACK_ORDER[start_index:]:
-        rewards = (
-            db.query(Reward)
-            .filter(
-                Reward.user_id == user_id,
-                Reward.is_active == True,  # noqa: E712
-                Reward.rarity == tier,
-            )
-            .all()
-        )
-        if rewards:
-            chosen_reward = random.choice(rewards)
-            return CapsuleDrop(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                reward_id=chosen_reward.id,
-                habit_id=habit_id,
-            )
-
-    # No rewards at any tier (shouldn't happen given count check, but defensive)
-    return None
+    if db.scalar(_REWARD_IS_ACTIVE, {"reward_id": chosen_reward.id}) is None:
+        invalidate_reward_pool(user_id)
+        chosen_reward = _draw(get_reward_pool(db, user_id), rolled_rarity)
+        if chosen_reward is None:
+            return None
+
+    return CapsuleDrop(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        reward_id=chosen_reward.id,
+        habit_id=habit_id,
+    )
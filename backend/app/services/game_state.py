@@ -0,0 +1,130 @@
+"""Request-scoped game state — one load of everything a habit check reads and mutates."""
+
+import uuid
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.orm import Session
+
+from app.models.daily_log import DailyLog
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.habit_streak import HabitStreak
+from app.models.off_day import OffDay
+from app.models.streak import Streak
+from app.models.user import User
+
+
+@dataclass
+class GameState:
+    """Unit of work for one check request on one local_date.
+
+    Orchestration steps read and mutate these objects instead of issuing
+    their own lookups. Rows that do not exist yet are None (or missing from
+    the per-habit dicts) and are created on demand by the get_or_create_*
+    helpers, which keep the state in sync.
+    """
+
+    user: User
+    local_date: str
+    streak: Streak | None
+    daily_log: DailyLog | None
+    is_off_day: bool
+    habits: dict[UUID, Habit] = field(default_factory=dict)
+    habit_logs: dict[UUID, HabitLog] = field(default_factory=dict)
+    habit_streaks: dict[UUID, HabitStreak] = field(default_factory=dict)
+
+    def get_or_create_streak(self, db: Session) -> Streak:
+        """Return the user's Streak, creating it on first use."""
+        if self.streak is None:
+            self.streak = Streak(
+                id=uuid.uuid4(),
+                user_id=self.user.id,
+                current_streak=0,
+                best_streak=0,
+            )
+            db.add(self.streak)
+        return self.streak
+
+    def get_or_create_habit_streak(self, db: Session, habit_id: UUID) -> HabitStreak:
+        """Return the HabitStreak for a loaded habit, creating it on first use."""
+        hs = self.habit_streaks.get(habit_id)
+        if hs is None:
+            hs = HabitStreak(
+                id=uuid.uuid4(),
+                user_id=self.user.id,
+                habit_id=habit_id,
+                current_streak=0,
+                best_streak=0,
+            )
+            db.add(hs)
+            self.habit_streaks[habit_id] = hs
+        return hs
+
+
+# Prebuilt so repeat checks reuse the compiled-cache entry without rebuilding
+_USER_DAY_STATE = (
+    select(User, Streak, DailyLog, OffDay.id)
+    .outerjoin(Streak, Streak.user_id == User.id)
+    .outerjoin(
+        DailyLog,
+        and_(DailyLog.user_id == User.id, DailyLog.log_date == bindparam("local_date")),
+    )
+    .outerjoin(
+        OffDay,
+        and_(OffDay.user_id == User.id, OffDay.off_date == bindparam("local_date")),
+    )
+    .where(User.id == bindparam("user_id"))
+    .limit(1)
+)
+
+_HABIT_DAY_STATE = (
+    select(Habit, HabitLog, HabitStreak)
+    .outerjoin(
+        HabitLog,
+        and_(HabitLog.habit_id == Habit.id, HabitLog.log_date == bindparam("local_date")),
+    )
+    .outerjoin(HabitStreak, HabitStreak.habit_id == Habit.id)
+    .where(
+        Habit.id.in_(bindparam("habit_ids", expanding=True)),
+        Habit.user_id == bindparam("user_id"),
+    )
+)
+
+
+def load_game_state(
+    db: Session, user_id: UUID, local_date: str, habit_ids: list[UUID]
+) -> GameState:
+    """Load the check-time game state in two queries.
+
+    1. User + overall Streak + the day's DailyLog + off-day flag.
+    2. The target habits + their HabitLog for the day + their HabitStreak.
+
+    Raises sqlalchemy.orm.exc.NoResultFound if the user does not exist.
+    """
+    user, streak, daily_log, off_day_id = db.execute(
+        _USER_DAY_STATE, {"user_id": user_id, "local_date": local_date}
+    ).one()
+
+    state = GameState(
+        user=user,
+        local_date=local_date,
+        streak=streak,
+        daily_log=daily_log,
+        is_off_day=off_day_id is not None,
+    )
+
+    if habit_ids:
+        rows = db.execute(
+            _HABIT_DAY_STATE,
+            {"habit_ids": list(habit_ids), "user_id": user_id, "local_date": local_date},
+        ).all()
+        for habit, habit_log, habit_streak in rows:
+            state.habits[habit.id] = habit
+            if habit_log is not None:
+                state.habit_logs[habit.id] = habit_log
+            if habit_streak is not None:
+                state.habit_streaks.setdefault(habit.id, habit_streak)
+
+    return state
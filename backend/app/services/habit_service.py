@@ -1,24 +1,28 @@
 """Habit service — check_habit() atomic transaction and habit scheduling helpers."""
 
+import logging
 import uuid
 from datetime import date, datetime
+from itertools import chain
 from uuid import UUID
 
+from sqlalchemy import and_, bindparam, event, func, inspect, or_, select
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
 
 from app.models.daily_log import DailyLog
-from app.models.habit import Habit
+from app.models.habit import Habit, compute_schedule_mask
 from app.models.habit_log import HabitLog
 from app.models.user import User
 from app.services.capsule_service import roll_capsule_drop
 from app.services.dragon_ball_service import award_dragon_ball, revoke_dragon_ball
 from app.services.power_service import (
+    apply_power_delta,
     check_transformation_change,
-    recalculate_power_level,
 )
+from app.services.game_state import GameState, load_game_state
 from app.services.streak_service import (
     check_zenkai_recovery,
-    get_or_create_streak,
     update_habit_streak,
     update_overall_streak,
 )
@@ -26,7 +30,7 @@ from app.services.achievement_service import (
     detect_attribute_level_change,
     detect_streak_milestones,
     get_milestone_badge_name,
-    record_achievement,
+    record_achievements,
 )
 from app.services.xp_service import (
     calc_daily_xp,
@@ -35,307 +39,499 @@ from app.services.xp_service import (
     get_completion_tier,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Habit fields that change which habits are due on a given date
+SCHEDULE_FIELDS = ("user_id", "frequency", "custom_days", "start_date", "end_date", "is_active")
+
+
+@event.listens_for(Session, "before_flush")
+def bump_schedule_version(session: Session, flush_context, instances) -> None:
+    """Bump User.schedule_version when a habit is added, removed or rescheduled.
+
+    DailyLog rows recounted against an older version fall back to a full
+    recount on the next check instead of applying incremental deltas.
+    """
+    user_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Habit):
+            continue
+        state = inspect(obj)
+        if obj in session.new or obj in session.deleted or any(
+            state.attrs[field].history.has_changes() for field in SCHEDULE_FIELDS
+        ):
+            user_ids.add(obj.user_id)
+
+    for user_id in user_ids:
+        user = session.get(User, user_id) if user_id is not None else None
+        if user is not None:
+            user.schedule_version = (user.schedule_version or 0) + 1
+
+
+def is_habit_due(habit: Habit, local_date: str) -> bool:
+    """Return True if the habit is scheduled on the given date.
+
+    Python mirror of the get_habits_due_on_date() predicate.
+    Pure function — no DB access.
+    """
+    if not habit.is_active or habit.start_date > local_date:
+        return False
+    # Exclude habits that have ended
+    if habit.end_date is not None and habit.end_date < local_date:
+        return False
+
+    weekday_bit = 1 << date.fromisoformat(local_date).weekday()
+    return bool(compute_schedule_mask(habit.frequency, habit.custom_days) & weekday_bit)
+
+
+# Hot-path statements are built once at import with bindparam() placeholders.
+# A prebuilt select() memoizes its compiled-cache key, so each execution
+# skips both constructing the statement and generating that key.
+_DUE_CRITERIA = (
+    Habit.user_id == bindparam("user_id"),
+    Habit.is_active == True,  # noqa: E712
+    Habit.schedule_mask.bitwise_and(bindparam("weekday_bit")) != 0,
+    Habit.start_date <= bindparam("local_date"),
+    or_(Habit.end_date.is_(None), Habit.end_date >= bindparam("local_date")),
+)
+
+_DUE_HABITS = select(Habit).where(*_DUE_CRITERIA)
+
+_DUE_AND_COMPLETED_COUNTS = (
+    select(func.count(Habit.id), func.count(HabitLog.id))
+    .select_from(Habit)
+    .outerjoin(
+        HabitLog,
+        and_(
+            HabitLog.habit_id == Habit.id,
+            HabitLog.log_date == bindparam("local_date"),
+            HabitLog.completed == True,  # noqa: E712
+        ),
+    )
+    .where(*_DUE_CRITERIA)
+)
+
+
+def _due_params(user_id: UUID, local_date: str) -> dict:
+    """Bound values for _DUE_CRITERIA."""
+    return {
+        "user_id": user_id,
+        "local_date": local_date,
+        "weekday_bit": 1 << date.fromisoformat(local_date).weekday(),
+    }
+
+
+def due_habits_query(user_id: UUID, local_date: str):
+    """The get_habits_due_on_date() select with its values bound.
+
+    For callers that add columns to it or execute it on an AsyncSession.
+    """
+    return _DUE_HABITS.params(**_due_params(user_id, local_date))
+
 
 def get_habits_due_on_date(
     db: Session, user_id: UUID, local_date: str
 ) -> list[Habit]:
     """Return all active habits due on the given date.
 
-    Filters by frequency (daily/weekdays/custom), start_date, end_date, is_active.
+    Resolved entirely in SQL: is_active, start_date/end_date and the
+    Habit.schedule_mask weekday bit, served by ix_habits_user_active_mask.
     """
-    target = date.fromisoformat(local_date)
-
-    habits = (
-        db.query(Habit)
-        .filter(
-            Habit.user_id == user_id,
-            Habit.is_active == True,  # noqa: E712
-            Habit.start_date <= local_date,
-        )
-        .all()
-    )
+    return list(db.scalars(_DUE_HABITS, _due_params(user_id, local_date)))
 
-    due = []
-    for habit in habits:
-        # Exclude habits that have ended
-        if habit.end_date is not None and habit.end_date < local_date:
-            continue
 
-        if habit.frequency == "daily":
-            due.append(habit)
-        elif habit.frequency == "weekdays":
-            if target.weekday() < 5:  # Mon=0 through Fri=4
-                due.append(habit)
-        elif habit.frequency == "custom":
-            if habit.custom_days and target.isoweekday() in habit.custom_days:
-                due.append(habit)
+def recount_daily_log(
+    db: Session, user: User, daily_log: DailyLog, local_date: str
+) -> None:
+    """Rebuild habits_due/habits_completed for a day from scratch.
 
-    return due
+    One aggregate query over the due habits and their completed logs.
+    Stamps the row with the user's current schedule_version so subsequent
+    checks on the same day can apply incremental deltas instead.
+    """
+    db.flush()  # count must see the toggle applied by the caller
+    due_count, completed_count = db.execute(
+        _DUE_AND_COMPLETED_COUNTS, _due_params(user.id, local_date)
+    ).one()
 
+    daily_log.habits_due = due_count
+    daily_log.habits_completed = completed_count
+    daily_log.schedule_version = user.schedule_version
 
-def check_habit(
-    db: Session, user_id: UUID, habit_id: UUID, local_date: str
-) -> dict:
-    """Toggle a habit check and orchestrate all game mechanics atomically.
 
-    This is the architectural centerpiece: it composes XP, streaks, Dragon Balls,
-    capsule drops, power level, and transformation checks into one transaction.
+def _toggle_habit(db: Session, state: GameState, habit: Habit) -> dict:
+    """Apply the per-habit half of a check: log, attribute XP, habit streak, capsule.
 
-    Returns a comprehensive response dict with all state changes.
+    Day-level state (DailyLog, overall streak, power, Dragon Ball) is left to
+    _settle_day() so a batch of toggles can settle the day once.
     """
-    try:
-        user = db.query(User).filter(User.id == user_id).one()
-        habit = db.query(Habit).filter(Habit.id == habit_id).one()
-
-        # ── Step 1: Toggle habit log ──────────────────────────────────
-        habit_log = (
-            db.query(HabitLog)
-            .filter(HabitLog.habit_id == habit_id, HabitLog.log_date == local_date)
-            .first()
+    user = state.user
+    local_date = state.local_date
+
+    # ── Step 1: Toggle habit log ──────────────────────────────────
+    habit_log = state.habit_logs.get(habit.id)
+
+    was_new_log = False
+    if habit_log is None:
+        # First check of this habit today
+        habit_log = HabitLog(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            habit_id=habit.id,
+            log_date=local_date,
+            completed=True,
+            completed_at=datetime.utcnow(),
         )
+        db.add(habit_log)
+        state.habit_logs[habit.id] = habit_log
+        is_checking = True
+        was_new_log = True
+    elif habit_log.completed:
+        # Unchecking
+        habit_log.completed = False
+        habit_log.completed_at = None
+        is_checking = False
+    else:
+        # Re-checking (was unchecked)
+        habit_log.completed = True
+        habit_log.completed_at = datetime.utcnow()
+        is_checking = True
+
+    # ── Step 2: Handle attribute XP ───────────────────────────────
+    attr_field = f"{habit.attribute}_xp"
+    if is_checking:
+        xp = get_attribute_xp(habit.importance)
+        habit_log.attribute_xp_awarded = xp
+        setattr(user, attr_field, getattr(user, attr_field) + xp)
+    else:
+        # Claw back
+        xp = habit_log.attribute_xp_awarded
+        setattr(user, attr_field, max(0, getattr(user, attr_field) - xp))
+        habit_log.attribute_xp_awarded = 0
+
+    # ── Step 3: Update habit streak and its milestones ────────────
+    habit_streak_result = update_habit_streak(
+        db, user.id, habit.id, local_date, is_checking,
+        hs=state.get_or_create_habit_streak(db, habit.id),
+    )
 
-        was_new_log = False
-        if habit_log is None:
-            # First check of this habit today
-            habit_log = HabitLog(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                habit_id=habit_id,
-                log_date=local_date,
-                completed=True,
-                completed_at=datetime.utcnow(),
-            )
-            db.add(habit_log)
-            db.flush()
-            is_checking = True
-            was_new_log = True
-        elif habit_log.completed:
-            # Unchecking
-            habit_log.completed = False
-            habit_log.completed_at = None
-            is_checking = False
-        else:
-            # Re-checking (was unchecked)
-            habit_log.completed = True
-            habit_log.completed_at = datetime.utcnow()
-            is_checking = True
-
-        # ── Step 2: Handle attribute XP ───────────────────────────────
-        # Capture old XP before mutation for level-up detection
-        attr_field = f"{habit.attribute}_xp"
-        old_attr_xp = getattr(user, attr_field)
-
-        if is_checking:
-            xp = get_attribute_xp(habit.importance)
-            habit_log.attribute_xp_awarded = xp
-            setattr(user, attr_field, old_attr_xp + xp)
-        else:
-            # Claw back
-            xp = habit_log.attribute_xp_awarded
-            setattr(user, attr_field, max(0, getattr(user, attr_field) - xp))
-            habit_log.attribute_xp_awarded = 0
-
-        # ── Step 3: Update daily log ──────────────────────────────────
-        habits_due = get_habits_due_on_date(db, user_id, local_date)
-        habits_due_count = len(habits_due)
-        due_habit_ids = [h.id for h in habits_due]
-
-        completed_count = (
-            db.query(HabitLog)
-            .filter(
-                HabitLog.habit_id.in_(due_habit_ids),
-                HabitLog.log_date == local_date,
-                HabitLog.completed == True,  # noqa: E712
-            )
-            .count()
+    events: list[dict] = []
+    achievements: list[dict] = []
+    if is_checking:
+        old_habit = habit_streak_result["current_streak"] - 1 if habit_streak_result["current_streak"] > 0 else 0
+        habit_milestones = detect_streak_milestones(
+            old_habit, habit_streak_result["current_streak"]
         )
+        for m in habit_milestones:
+            achievements.append({
+                "achievement_type": "streak_milestone",
+                "achievement_key": f"habit_{habit.id}_streak_{m}",
+                "milestone_type": "streak",
+                "metadata": {"streak": m, "scope": "habit", "habit_id": str(habit.id)},
+            })
+            events.append({
+                "type": "streak_milestone",
+                "tier": m,
+                "streak": habit_streak_result["current_streak"],
+                "badge_name": get_milestone_badge_name(m),
+                "scope": "habit",
+            })
+
+    # ── Step 4: Capsule RNG ───────────────────────────────────────
+    capsule_result = None
+    if is_checking and not habit_log.capsule_dropped:
+        capsule = roll_capsule_drop(db, user.id, habit.id)
+        if capsule is not None:
+            db.add(capsule)
+            habit_log.capsule_dropped = True
+            capsule_result = {
+                "id": str(capsule.id),
+                "reward_id": str(capsule.reward_id),
+            }
+
+    return {
+        "habit": habit,
+        "habit_log": habit_log,
+        "is_checking": is_checking,
+        "was_new_log": was_new_log,
+        "habit_streak": habit_streak_result,
+        "capsule": capsule_result,
+        "events": events,
+        "achievements": achievements,
+    }
+
+
+def _settle_day(
+    db: Session,
+    state: GameState,
+    toggles: list[dict],
+    old_attr_xp: dict[str, int],
+) -> dict:
+    """Apply the day-level half of a check once for one or more habit toggles.
 
-        completion_rate = (
-            completed_count / habits_due_count if habits_due_count > 0 else 0.0
+    Updates the DailyLog, Zenkai, overall streak, daily XP, power level,
+    transformation and Dragon Ball. old_attr_xp maps each touched attribute
+    to its XP before the toggles, for level-up detection.
+    """
+    user = state.user
+    local_date = state.local_date
+    any_checking = any(t["is_checking"] for t in toggles)
+
+    # ── Step 5: Update daily log ──────────────────────────────────
+    daily_log = state.daily_log
+    if daily_log is None:
+        daily_log = DailyLog(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            log_date=local_date,
         )
-        tier = get_completion_tier(completion_rate)
-        is_perfect_day = completion_rate == 1.0 and habits_due_count > 0
-
-        daily_log = (
-            db.query(DailyLog)
-            .filter(DailyLog.user_id == user_id, DailyLog.log_date == local_date)
-            .first()
+        db.add(daily_log)
+        state.daily_log = daily_log
+        recount_daily_log(db, user, daily_log, local_date)
+    elif daily_log.schedule_version != user.schedule_version:
+        # Habit set changed since the last recount
+        recount_daily_log(db, user, daily_log, local_date)
+    else:
+        # Incremental: each due toggle moves the completed counter by one
+        delta = sum(
+            1 if t["is_checking"] else -1
+            for t in toggles
+            if is_habit_due(t["habit"], local_date)
         )
-        if daily_log is None:
-            daily_log = DailyLog(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                log_date=local_date,
+        completed = daily_log.habits_completed + delta
+        if 0 <= completed <= daily_log.habits_due:
+            daily_log.habits_completed = completed
+        else:
+            # The stored counters drifted from the logs; clamping would hide it
+            logger.warning(
+                "DailyLog %s counter out of range (%d + %d of %d due); recounting",
+                daily_log.id, daily_log.habits_completed, delta, daily_log.habits_due,
             )
-            db.add(daily_log)
-            db.flush()
-
-        was_perfect_day = daily_log.is_perfect_day
-
-        daily_log.habits_due = habits_due_count
-        daily_log.habits_completed = completed_count
-        daily_log.habit_completion_rate = completion_rate
-        daily_log.is_perfect_day = is_perfect_day
-        daily_log.completion_tier = tier["name"]
-
-        # ── Step 4: Check Zenkai recovery (only on first log of the day) ──
-        streak = get_or_create_streak(db, user_id)
-        zenkai_info = {"zenkai_activated": False}
-        if was_new_log:
-            zenkai_info = check_zenkai_recovery(db, user_id, local_date, streak)
-            if zenkai_info.get("zenkai_activated"):
-                daily_log.zenkai_bonus_applied = True
-
-        # ── Step 5: Update streaks ────────────────────────────────────
-        streak_result = update_overall_streak(
-            db, user_id, local_date, completion_rate, zenkai_info
-        )
-        habit_streak_result = update_habit_streak(
-            db, user_id, habit_id, local_date, is_checking
-        )
+            recount_daily_log(db, user, daily_log, local_date)
 
-        # ── Step 5b: Detect events (milestones, level-ups) ─────────────
-        events: list[dict] = []
-        if is_checking:
-            # Overall streak milestones
-            old_overall = streak_result["current_streak"] - 1 if streak_result["current_streak"] > 0 else 0
-            overall_milestones = detect_streak_milestones(
-                old_overall, streak_result["current_streak"]
-            )
-            for m in overall_milestones:
-                record_achievement(
-                    db, user_id, "streak_milestone", f"overall_streak_{m}",
-                    milestone_type="streak",
-                    metadata={"streak": m, "scope": "overall"},
-                )
-                events.append({
-                    "type": "streak_milestone",
-                    "tier": m,
-                    "streak": streak_result["current_streak"],
-                    "badge_name": get_milestone_badge_name(m),
-                    "scope": "overall",
-                })
+    habits_due_count = daily_log.habits_due
+    completed_count = daily_log.habits_completed
 
-            # Per-habit streak milestones
-            old_habit = habit_streak_result["current_streak"] - 1 if habit_streak_result["current_streak"] > 0 else 0
-            habit_milestones = detect_streak_milestones(
-                old_habit, habit_streak_result["current_streak"]
-            )
-            for m in habit_milestones:
-                record_achievement(
-                    db, user_id, "streak_milestone",
-                    f"habit_{habit_id}_streak_{m}",
-                    milestone_type="streak",
-                    metadata={"streak": m, "scope": "habit", "habit_id": str(habit_id)},
-                )
-                events.append({
-                    "type": "streak_milestone",
-                    "tier": m,
-                    "streak": habit_streak_result["current_streak"],
-                    "badge_name": get_milestone_badge_name(m),
-                    "scope": "habit",
-                })
+    completion_rate = (
+        completed_count / habits_due_count if habits_due_count > 0 else 0.0
+    )
+    tier = get_completion_tier(completion_rate)
+    is_perfect_day = completion_rate == 1.0 and habits_due_count > 0
+
+    was_perfect_day = daily_log.is_perfect_day
+
+    daily_log.habit_completion_rate = completion_rate
+    daily_log.is_perfect_day = is_perfect_day
+    daily_log.completion_tier = tier["name"]
+
+    # ── Step 6: Check Zenkai recovery (only on first log of the day) ──
+    streak = state.get_or_create_streak(db)
+    zenkai_info = {"zenkai_activated": False}
+    if any(t["was_new_log"] for t in toggles):
+        zenkai_info = check_zenkai_recovery(db, user.id, local_date, streak)
+        if zenkai_info.get("zenkai_activated"):
+            daily_log.zenkai_bonus_applied = True
+
+    # ── Step 7: Update overall streak ─────────────────────────────
+    streak_result = update_overall_streak(
+        db, user.id, local_date, completion_rate, zenkai_info, streak=streak
+    )
 
-            # Attribute level-up detection
-            new_attr_xp = getattr(user, attr_field)
+    # ── Step 7b: Detect events (milestones, level-ups) ─────────────
+    events: list[dict] = []
+    achievements: list[dict] = []
+    if any_checking:
+        # Overall streak milestones
+        old_overall = streak_result["current_streak"] - 1 if streak_result["current_streak"] > 0 else 0
+        overall_milestones = detect_streak_milestones(
+            old_overall, streak_result["current_streak"]
+        )
+        for m in overall_milestones:
+            achievements.append({
+                "achievement_type": "streak_milestone",
+                "achievement_key": f"overall_streak_{m}",
+                "milestone_type": "streak",
+                "metadata": {"streak": m, "scope": "overall"},
+            })
+            events.append({
+                "type": "streak_milestone",
+                "tier": m,
+                "streak": streak_result["current_streak"],
+                "badge_name": get_milestone_badge_name(m),
+                "scope": "overall",
+            })
+
+    # Per-habit streak milestones, in toggle order
+    for t in toggles:
+        events.extend(t["events"])
+        achievements.extend(t["achievements"])
+
+    if any_checking:
+        # Attribute level-up detection
+        for attribute, old_xp in old_attr_xp.items():
             level_change = detect_attribute_level_change(
-                old_attr_xp, new_attr_xp, habit.attribute
+                old_xp, getattr(user, f"{attribute}_xp"), attribute
             )
             if level_change is not None:
-                record_achievement(
-                    db, user_id, "attribute_level_up",
-                    f"{habit.attribute}_{level_change['new_level']}",
-                    metadata=level_change,
-                )
+                achievements.append({
+                    "achievement_type": "attribute_level_up",
+                    "achievement_key": f"{attribute}_{level_change['new_level']}",
+                    "metadata": level_change,
+                })
                 events.append({
                     "type": "level_up",
-                    "attribute": habit.attribute,
+                    "attribute": attribute,
                     **level_change,
                 })
 
-        # ── Step 6: Recalculate daily XP ──────────────────────────────
-        # Re-fetch streak after update
-        streak = get_or_create_streak(db, user_id)
-        daily_xp = calc_daily_xp(
-            completion_rate,
-            streak.current_streak,
-            daily_log.zenkai_bonus_applied,
-        )
-        daily_log.xp_earned = daily_xp
-        daily_log.streak_multiplier = 1 + calc_streak_bonus(streak.current_streak)
-
-        # ── Step 7: Update power level and transformation ─────────────
-        old_transformation = user.current_transformation
-        db.flush()
-        new_power = recalculate_power_level(db, user)
-        transform_change = check_transformation_change(
-            old_transformation, new_power
-        )
-        if transform_change is not None:
-            user.current_transformation = transform_change["key"]
-            if is_checking:
-                record_achievement(
-                    db, user_id, "transformation", transform_change["key"],
-                    metadata=transform_change,
-                )
-                events.append({
-                    "type": "transformation",
-                    **transform_change,
-                })
+    # ── Step 8: Recalculate daily XP ──────────────────────────────
+    old_daily_xp = daily_log.xp_earned or 0
+    daily_xp = calc_daily_xp(
+        completion_rate,
+        streak.current_streak,
+        daily_log.zenkai_bonus_applied,
+    )
+    daily_log.xp_earned = daily_xp
+    daily_log.streak_multiplier = 1 + calc_streak_bonus(streak.current_streak)
+
+    # ── Step 9: Update power level and transformation ─────────────
+    old_transformation = user.current_transformation
+    new_power = apply_power_delta(user, daily_xp - old_daily_xp)
+    transform_change = check_transformation_change(
+        old_transformation, new_power
+    )
+    if transform_change is not None:
+        user.current_transformation = transform_change["key"]
+        if any_checking:
+            achievements.append({
+                "achievement_type": "transformation",
+                "achievement_key": transform_change["key"],
+                "metadata": transform_change,
+            })
+            events.append({
+                "type": "transformation",
+                **transform_change,
+            })
+
+    # ── Step 10: Handle Dragon Ball ───────────────────────────────
+    dragon_ball_info = None
+    if is_perfect_day and not daily_log.dragon_ball_earned:
+        dragon_ball_info = award_dragon_ball(user)
+        daily_log.dragon_ball_earned = True
+    elif was_perfect_day and not is_perfect_day:
+        # Unchecking broke perfection
+        revoke_dragon_ball(user)
+        daily_log.dragon_ball_earned = False
+
+    # ── Step 11: Record achievements and flush (no commit) ────────
+    # One INSERT ... ON CONFLICT DO NOTHING for everything unlocked above
+    record_achievements(db, user.id, achievements)
+    db.flush()
+
+    return {
+        "log_date": local_date,
+        "is_perfect_day": is_perfect_day,
+        "zenkai_activated": zenkai_info.get("zenkai_activated", False),
+        "daily_log": {
+            "habits_due": daily_log.habits_due,
+            "habits_completed": daily_log.habits_completed,
+            "completion_rate": daily_log.habit_completion_rate,
+            "completion_tier": daily_log.completion_tier,
+            "xp_earned": daily_log.xp_earned,
+            "streak_multiplier": daily_log.streak_multiplier,
+            "zenkai_bonus_applied": daily_log.zenkai_bonus_applied,
+            "dragon_ball_earned": daily_log.dragon_ball_earned,
+        },
+        "streak": streak_result,
+        "power_level": user.power_level,
+        "transformation": user.current_transformation,
+        "transform_change": transform_change,
+        "dragon_ball": dragon_ball_info,
+        "events": events,
+    }
+
+
+def check_habit(
+    db: Session,
+    user_id: UUID,
+    habit_id: UUID,
+    local_date: str,
+    state: GameState | None = None,
+) -> dict:
+    """Toggle a habit check and orchestrate all game mechanics atomically.
 
-        # ── Step 8: Handle Dragon Ball ────────────────────────────────
-        dragon_ball_info = None
-        if is_perfect_day and not daily_log.dragon_ball_earned:
-            dragon_ball_info = award_dragon_ball(user)
-            daily_log.dragon_ball_earned = True
-        elif was_perfect_day and not is_perfect_day:
-            # Unchecking broke perfection
-            revoke_dragon_ball(user)
-            daily_log.dragon_ball_earned = False
-
-        # ── Step 9: Capsule RNG ───────────────────────────────────────
-        capsule_result = None
-        if is_checking and not habit_log.capsule_dropped:
-            capsule = roll_capsule_drop(db, user_id, habit_id)
-            if capsule is not None:
-                db.add(capsule)
-                habit_log.capsule_dropped = True
-                capsule_result = {
-                    "id": str(capsule.id),
-                    "reward_id": str(capsule.reward_id),
-                }
-
-        # ── Step 10: Flush (no commit — caller manages transaction) ───
-        db.flush()
-
-        # Build response
-        return {
-            "is_checking": is_checking,
-            "habit_id": str(habit_id),
-            "log_date": local_date,
-            "attribute_xp_awarded": habit_log.attribute_xp_awarded,
-            "is_perfect_day": is_perfect_day,
-            "zenkai_activated": zenkai_info.get("zenkai_activated", False),
-            "daily_log": {
-                "habits_due": daily_log.habits_due,
-                "habits_completed": daily_log.habits_completed,
-                "completion_rate": daily_log.habit_completion_rate,
-                "completion_tier": daily_log.completion_tier,
-                "xp_earned": daily_log.xp_earned,
-                "streak_multiplier": daily_log.streak_multiplier,
-                "zenkai_bonus_applied": daily_log.zenkai_bonus_applied,
-                "dragon_ball_earned": daily_log.dragon_ball_earned,
-            },
-            "streak": streak_result,
-            "habit_streak": habit_streak_result,
-            "power_level": user.power_level,
-            "transformation": user.current_transformation,
-            "transform_change": transform_change,
-            "dragon_ball": dragon_ball_info,
-            "capsule": capsule_result,
-            "events": events,
-        }
-
-    except Exception:
-        db.rollback()
-        raise
+    This is the architectural centerpiece: it composes XP, streaks, Dragon Balls,
+    capsule drops, power level, and transformation checks into one transaction.
+    Pass the GameState the caller already loaded for validation to reuse it.
+
+    Flushes but never commits or rolls back: the transaction belongs to the
+    caller's Writer, which may be running other jobs in it.
+
+    Returns a comprehensive response dict with all state changes.
+    """
+    if state is None:
+        state = load_game_state(db, user_id, local_date, [habit_id])
+    habit = state.habits.get(habit_id)
+    if habit is None:
+        raise NoResultFound(f"Habit {habit_id} not found")
+
+    user = state.user
+    old_attr_xp = {habit.attribute: getattr(user, f"{habit.attribute}_xp")}
+    toggle = _toggle_habit(db, state, habit)
+    day = _settle_day(db, state, [toggle], old_attr_xp)
+
+    # Build response
+    return {
+        "is_checking": toggle["is_checking"],
+        "habit_id": str(habit_id),
+        "attribute_xp_awarded": toggle["habit_log"].attribute_xp_awarded,
+        "habit_streak": toggle["habit_streak"],
+        "capsule": toggle["capsule"],
+        **day,
+    }
+
+
+def check_habits_batch(
+    db: Session,
+    user_id: UUID,
+    habit_ids: list[UUID],
+    local_date: str,
+    state: GameState | None = None,
+) -> dict:
+    """Toggle several habits for one day in a single atomic pass.
+
+    Each habit gets its own log/XP/habit-streak/capsule toggle; the DailyLog,
+    overall streak, power level, transformation and Dragon Ball steps are then
+    evaluated once for the whole batch. Events from all steps are combined.
+    Like check_habit, leaves commit and rollback to the caller's Writer.
+    """
+    if state is None:
+        state = load_game_state(db, user_id, local_date, habit_ids)
+    missing = [hid for hid in habit_ids if hid not in state.habits]
+    if missing:
+        raise NoResultFound(f"Habit {missing[0]} not found")
+
+    user = state.user
+    old_attr_xp: dict[str, int] = {}
+    toggles = []
+    for habit_id in habit_ids:
+        habit = state.habits[habit_id]
+        old_attr_xp.setdefault(habit.attribute, getattr(user, f"{habit.attribute}_xp"))
+        toggles.append(_toggle_habit(db, state, habit))
+
+    day = _settle_day(db, state, toggles, old_attr_xp)
+
+    return {
+        "results": [
+            {
+                "habit_id": str(t["habit"].id),
+                "is_checking": t["is_checking"],
+                "attribute_xp_awarded": t["habit_log"].attribute_xp_awarded,
+                "habit_streak": t["habit_streak"],
+                "capsule": t["capsule"],
+            }
+            for t in toggles
+        ],
+        **day,
+    }
@@ -3,6 +3,7 @@
 import uuid
 from uuid import UUID
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.models.daily_log import DailyLog
@@ -10,17 +11,33 @@ from app.models.habit_log import HabitLog
 from app.models.off_day import OffDay
 from app.models.user import User
 from app.services.dragon_ball_service import revoke_dragon_ball
-from app.services.power_service import recalculate_power_level, check_transformation_change
+from app.services.power_service import apply_power_delta, check_transformation_change
+
+# Prebuilt lookups; see habit_service for why these are module-level
+_OFF_DAY = (
+    select(OffDay)
+    .where(OffDay.user_id == bindparam("user_id"), OffDay.off_date == bindparam("local_date"))
+    .limit(1)
+)
+
+_HABIT_LOGS_ON_DATE = select(HabitLog).where(
+    HabitLog.user_id == bindparam("user_id"), HabitLog.log_date == bindparam("local_date")
+)
+
+_DAILY_LOG = (
+    select(DailyLog)
+    .where(
+        DailyLog.user_id == bindparam("user_id"),
+        DailyLog.log_date == bindparam("local_date"),
+    )
+    .limit(1)
+)
 
 
 def is_off_day(db: Session, user_id: UUID, local_date: str) -> bool:
     """Return True if an OffDay record exists for user on the given date."""
-    return (
-        db.query(OffDay)
-        .filter(OffDay.user_id == user_id, OffDay.off_date == local_date)
-        .first()
-        is not None
-    )
+    params = {"user_id": user_id, "local_date": local_date}
+    return db.scalars(_OFF_DAY, params).first() is not None
 
 
 def mark_off_day(
@@ -34,9 +51,10 @@ def mark_off_day(
 
     - Deletes all HabitLogs for the date, clawing back attribute XP.
     - Deletes DailyLog, revoking Dragon Ball if earned.
-    - Recalculates power level after reversal.
+    - Subtracts the deleted day's XP from the power level.
     """
-    user = db.query(User).filter(User.id == user_id).one()
+    user = db.get_one(User, user_id)
+    params = {"user_id": user_id, "local_date": local_date}
 
     # Create OffDay record
     off_day = OffDay(
@@ -49,11 +67,7 @@ def mark_off_day(
     db.add(off_day)
 
     # Reverse all habit logs for this date
-    habit_logs = (
-        db.query(HabitLog)
-        .filter(HabitLog.user_id == user_id, HabitLog.log_date == local_date)
-        .all()
-    )
+    habit_logs = db.scalars(_HABIT_LOGS_ON_DATE, params).all()
 
     total_xp_reversed = 0
     habits_reversed = 0
@@ -70,21 +84,16 @@ def mark_off_day(
         db.delete(log)
 
     # Handle DailyLog
-    daily_log = (
-        db.query(DailyLog)
-        .filter(DailyLog.user_id == user_id, DailyLog.log_date == local_date)
-        .first()
-    )
+    daily_log = db.scalars(_DAILY_LOG, params).first()
 
+    # Power level drops by the XP the deleted day contributed
+    new_power = user.power_level
     if daily_log is not None:
         if daily_log.dragon_ball_earned:
             revoke_dragon_ball(user)
+        new_power = apply_power_delta(user, -daily_log.xp_earned)
         db.delete(daily_log)
 
-    # Recalculate power level
-    db.flush()
-    new_power = recalculate_power_level(db, user)
-
     # Check transformation change
     new_form = check_transformation_change(user.current_transformation, new_power)
     if new_form is not None:
@@ -101,11 +110,7 @@ def mark_off_day(
 
 def cancel_off_day(db: Session, user_id: UUID, local_date: str) -> bool:
     """Cancel an off day. Returns True if deleted, False if not found."""
-    off_day = (
-        db.query(OffDay)
-        .filter(OffDay.user_id == user_id, OffDay.off_date == local_date)
-        .first()
-    )
+    off_day = db.scalars(_OFF_DAY, {"user_id": user_id, "local_date": local_date}).first()
     if off_day is None:
         return False
     db.delete(off_day)
@@ -1,6 +1,6 @@
 """Power level calculation, transformation lookup and change detection."""
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.constants import TRANSFORMATIONS
@@ -36,9 +36,21 @@ def check_transformation_change(
     return None
 
 
+def apply_power_delta(user: User, xp_delta: int) -> int:
+    """Shift User.power_level by the change in one day's DailyLog.xp_earned.
+
+    Hot-path alternative to recalculate_power_level(). Floors at 0.
+    Updates the user in place (no queries); returns the new total.
+    """
+    user.power_level = max(0, user.power_level + xp_delta)
+    return user.power_level
+
+
 def recalculate_power_level(db: Session, user: User) -> int:
     """Sum all DailyLog.xp_earned for user and update User.power_level.
 
+    Full-history scan; repair_power_levels() uses it to fix counters that
+    drifted from their incremental updates (see apply_power_delta).
     Returns the new total.
     """
     total = (
@@ -48,3 +60,29 @@ def recalculate_power_level(db: Session, user: User) -> int:
     )
     user.power_level = total
     return total
+
+
+def repair_power_levels(db: Session) -> dict:
+    """Find users whose power_level differs from their DailyLog XP total and fix them.
+
+    One grouped query compares every user; only drifted users are loaded and
+    recalculated. Flushes but does not commit.
+    """
+    totals = (
+        select(DailyLog.user_id, func.sum(DailyLog.xp_earned).label("xp"))
+        .group_by(DailyLog.user_id)
+        .subquery()
+    )
+    expected = func.coalesce(totals.c.xp, 0)
+    drifted = db.scalars(
+        select(User)
+        .outerjoin(totals, totals.c.user_id == User.id)
+        .where(User.power_level != expected)
+    ).all()
+    for user in drifted:
+        recalculate_power_level(db, user)
+    db.flush()
+    return {
+        "users_checked": db.scalar(select(func.count(User.id))),
+        "repaired": len(drifted),
+    }
@@ -0,0 +1,203 @@
+"""Quote catalog — in-memory, indexed quote lookup replacing ORDER BY random().
+
+Quotes are global seed data, so the whole table is loaded once and indexed by
+every subset of (trigger_event, character, severity, transformation_level).
+Any combination of those filters resolves to a prebuilt tuple, making random
+selection O(1). A shuffle-bag mode deals each matching quote once before any
+repeats.
+
+The catalog is loaded at startup, lazily on first use, and dropped whenever a
+transaction that touched Quote rows commits. That hook only runs in the
+worker process that made the change, so every catalog also expires
+QUOTE_CATALOG_TTL seconds after loading; other workers pick up quote edits
+by then.
+"""
+
+import random
+import threading
+import time
+from itertools import combinations
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.quote import Quote
+
+KEY_FIELDS = ("trigger_event", "character", "severity", "transformation_level")
+
+# Placeholder for "not filtered on" in index keys (None is a real severity value)
+_ANY = object()
+
+
+class CatalogQuote(NamedTuple):
+    """Immutable snapshot of a Quote row."""
+
+    id: UUID
+    character: str
+    quote_text: str
+    source_saga: str
+    trigger_event: str
+    transformation_level: str | None
+    severity: str | None
+
+    @property
+    def avatar_path(self) -> str:
+        return f"/assets/avatars/{self.character}.webp"
+
+    def as_detail(self) -> dict:
+        """Return the character/quote_text/source_saga/avatar_path dict used in responses."""
+        return {
+            "character": self.character,
+            "quote_text": self.quote_text,
+            "source_saga": self.source_saga,
+            "avatar_path": self.avatar_path,
+        }
+
+
+class QuoteCatalog:
+    """Quotes indexed by every subset of KEY_FIELDS."""
+
+    def __init__(self, quotes: list[CatalogQuote]):
+        buckets: dict[tuple, list[CatalogQuote]] = {}
+        for quote in quotes:
+            for size in range(len(KEY_FIELDS) + 1):
+                for fields in combinations(KEY_FIELDS, size):
+                    key = tuple(
+                        getattr(quote, f) if f in fields else _ANY for f in KEY_FIELDS
+                    )
+                    buckets.setdefault(key, []).append(quote)
+        self._index = {key: tuple(qs) for key, qs in buckets.items()}
+        self._bags: dict[tuple, list[CatalogQuote]] = {}
+        self._last: dict[tuple, UUID] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index.get((_ANY,) * len(KEY_FIELDS), ()))
+
+    @staticmethod
+    def _key(criteria: dict) -> tuple:
+        unknown = set(criteria) - set(KEY_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown quote filter(s): {', '.join(sorted(unknown))}")
+        return tuple(criteria.get(f, _ANY) for f in KEY_FIELDS)
+
+    def find(self, **criteria) -> tuple[CatalogQuote, ...]:
+        """Return all quotes matching the given field values."""
+        return self._index.get(self._key(criteria), ())
+
+    def choose(self, no_repeat: bool = False, **criteria) -> CatalogQuote | None:
+        """Pick a random matching quote, or None if nothing matches.
+
+        With no_repeat, draws from a per-filter shuffle bag: every matching
+        quote is returned once before the bag is refilled, and a refill never
+        starts with the quote that was drawn last.
+        """
+        key = self._key(criteria)
+        candidates = self._index.get(key)
+        if not candidates:
+            return None
+        if not no_repeat or len(candidates) == 1:
+            return random.choice(candidates)
+
+        with self._lock:
+            bag = self._bags.get(key)
+            if not bag:
+                bag = list(candidates)
+                random.shuffle(bag)
+                # The next draw pops from the end; keep the previous quote away from it
+                if bag[-1].id == self._last.get(key):
+                    bag[0], bag[-1] = bag[-1], bag[0]
+                self._bags[key] = bag
+            quote = bag.pop()
+            self._last[key] = quote.id
+            return quote
+
+
+# ── Process-wide catalog ──────────────────────────────────────────────────
+
+_catalog: QuoteCatalog | None = None
+_catalog_loaded_at = 0.0  # time.monotonic() of the install
+_catalog_lock = threading.Lock()
+
+
+# Every column a CatalogQuote holds, in field order
+QUOTE_CATALOG_QUERY = select(
+    Quote.id,
+    Quote.character,
+    Quote.quote_text,
+    Quote.source_saga,
+    Quote.trigger_event,
+    Quote.transformation_level,
+    Quote.severity,
+)
+
+
+def install_quote_catalog(rows) -> QuoteCatalog:
+    """Build the catalog from QUOTE_CATALOG_QUERY rows and install it.
+
+    Async callers execute the query themselves and pass the result here.
+    """
+    global _catalog, _catalog_loaded_at
+    catalog = QuoteCatalog([CatalogQuote(*row) for row in rows])
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_loaded_at = time.monotonic()
+    return catalog
+
+
+def installed_quote_catalog() -> QuoteCatalog | None:
+    """The installed catalog, or None until the next load (also once it expired)."""
+    ttl = settings.QUOTE_CATALOG_TTL
+    with _catalog_lock:
+        if ttl > 0 and time.monotonic() - _catalog_loaded_at > ttl:
+            return None
+        return _catalog
+
+
+def load_quote_catalog(db: Session) -> QuoteCatalog:
+    """(Re)build the catalog from the quotes table and install it."""
+    return install_quote_catalog(db.execute(QUOTE_CATALOG_QUERY))
+
+
+def get_quote_catalog(db: Session) -> QuoteCatalog:
+    """Return the installed catalog, loading it from db on first use."""
+    catalog = installed_quote_catalog()
+    if catalog is None:
+        catalog = load_quote_catalog(db)
+    return catalog
+
+
+def invalidate_quote_catalog() -> None:
+    """Drop the installed catalog; the next lookup reloads it."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+
+
+def choose_quote(db: Session, no_repeat: bool = False, **criteria) -> CatalogQuote | None:
+    """Pick a random quote matching criteria from the catalog."""
+    return get_quote_catalog(db).choose(no_repeat=no_repeat, **criteria)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_quote_changes(session: Session, flush_context, instances) -> None:
+    """Flag sessions that write Quote rows so their commit drops the catalog."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Quote):
+            session.info["quotes_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_quote_commit(session: Session) -> None:
+    if session.info.pop("quotes_changed", False):
+        invalidate_quote_catalog()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_quote_changes(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("quotes_changed", None)
@@ -1,14 +1,14 @@
 """Roast service — absence gap detection, severity mapping, welcome-back status."""
 
-from datetime import date
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.dates import to_day_number
 from app.models.off_day import OffDay
-from app.models.quote import Quote
-from app.services.streak_service import get_or_create_streak
+from app.models.streak import Streak
+from app.services.quote_catalog import QuoteCatalog, get_quote_catalog
 
 
 def calc_roast_severity(effective_gap: int) -> str | None:
@@ -26,35 +26,35 @@ def calc_roast_severity(effective_gap: int) -> str | None:
     return "savage"
 
 
-def detect_absence_gap(db: Session, user_id: UUID, today_str: str) -> dict:
-    """Detect how long the user has been absent, subtracting off-days.
+def last_active_query(user_id: UUID):
+    """The user's Streak.last_active_date (no row when they never checked in)."""
+    return select(Streak.last_active_date).where(Streak.user_id == user_id).limit(1)
 
-    Returns dict with gap_days, off_days_in_gap, effective_gap, severity.
-    Reuses off-day gap subtraction pattern from check_zenkai_recovery().
-    """
-    streak = get_or_create_streak(db, user_id)
 
-    if streak.last_active_date is None:
-        return {"gap_days": 0, "off_days_in_gap": 0, "effective_gap": 0, "severity": None}
+def absence_gap_days(last_active_date: str | None, today_str: str) -> int:
+    """Days since last_active_date; 0 if the user was never active."""
+    if last_active_date is None:
+        return 0
+    return to_day_number(today_str) - to_day_number(last_active_date)
+
+
+def gap_off_days_query(user_id: UUID, last_active_date: str, today_str: str):
+    """Count of off-days strictly between last_active_date and today."""
+    return select(func.count(OffDay.id)).where(
+        OffDay.user_id == user_id,
+        OffDay.off_date > last_active_date,
+        OffDay.off_date < today_str,
+    )
 
-    last_date = date.fromisoformat(streak.last_active_date)
-    today = date.fromisoformat(today_str)
-    gap_days = (today - last_date).days
 
+def absence_gap(gap_days: int, off_day_count: int) -> dict:
+    """Shape a gap and the off-days inside it into the detect_absence_gap() dict.
+
+    Pure function; off_day_count is only needed when gap_days > 1.
+    """
     if gap_days <= 1:
         return {"gap_days": 0, "off_days_in_gap": 0, "effective_gap": 0, "severity": None}
 
-    # Count off-days in the gap (exclusive of both endpoints)
-    off_day_count = (
-        db.query(OffDay)
-        .filter(
-            OffDay.user_id == user_id,
-            OffDay.off_date > streak.last_active_date,
-            OffDay.off_date < today_str,
-        )
-        .count()
-    )
-
     # effective_gap subtracts 1 (the day after last active is expected gap start)
     # and subtracts off-days
     effective_gap = max(0, gap_days - 1 - off_day_count)
@@ -68,57 +68,61 @@ def detect_absence_gap(db: Session, user_id: UUID, today_str: str) -> dict:
     }
 
 
-def get_welcome_status(db: Session, user_id: UUID, today_str: str) -> dict:
-    """Get welcome-back status for app load.
+def detect_absence_gap(db: Session, user_id: UUID, today_str: str) -> dict:
+    """Detect how long the user has been absent, subtracting off-days.
 
-    Returns dict with welcome_back (Goku quote) and roast (Vegeta quote + severity).
-    Both null when no gap exists.
+    Returns dict with gap_days, off_days_in_gap, effective_gap, severity.
+    Reuses off-day gap subtraction pattern from check_zenkai_recovery().
+    Read-only: a user without a Streak row has no gap.
     """
-    gap_info = detect_absence_gap(db, user_id, today_str)
+    last_active = db.scalar(last_active_query(user_id))
+    gap_days = absence_gap_days(last_active, today_str)
+    off_day_count = 0
+    if gap_days > 1:
+        off_day_count = db.scalar(gap_off_days_query(user_id, last_active, today_str))
+    return absence_gap(gap_days, off_day_count)
+
 
+def welcome_status(catalog: QuoteCatalog | None, gap_info: dict) -> dict:
+    """Pick the welcome-back and roast quotes for an absence_gap() dict.
+
+    Both null when no gap exists; catalog is only consulted otherwise.
+    """
     if gap_info["severity"] is None:
         return {"welcome_back": None, "roast": None}
 
-    # Fetch Goku welcome_back quote
-    welcome_quote = (
-        db.query(Quote)
-        .filter(Quote.trigger_event == "welcome_back", Quote.character == "goku")
-        .order_by(func.random())
-        .first()
+    # Pick Goku welcome_back quote
+    welcome_quote = catalog.choose(
+        no_repeat=True, trigger_event="welcome_back", character="goku"
     )
 
-    # Fetch Vegeta roast quote with matching severity
-    roast_quote = (
-        db.query(Quote)
-        .filter(
-            Quote.trigger_event == "roast",
-            Quote.character == "vegeta",
-            Quote.severity == gap_info["severity"],
-        )
-        .order_by(func.random())
-        .first()
+    # Pick Vegeta roast quote with matching severity
+    roast_quote = catalog.choose(
+        no_repeat=True,
+        trigger_event="roast",
+        character="vegeta",
+        severity=gap_info["severity"],
     )
 
-    welcome_data = None
-    if welcome_quote:
-        welcome_data = {
-            "character": welcome_quote.character,
-            "quote_text": welcome_quote.quote_text,
-            "source_saga": welcome_quote.source_saga,
-            "avatar_path": f"/assets/avatars/{welcome_quote.character}.webp",
-        }
+    welcome_data = welcome_quote.as_detail() if welcome_quote else None
 
     roast_data = None
     if roast_quote:
         roast_data = {
-            "quote": {
-                "character": roast_quote.character,
-                "quote_text": roast_quote.quote_text,
-                "source_saga": roast_quote.source_saga,
-                "avatar_path": f"/assets/avatars/{roast_quote.character}.webp",
-            },
+            "quote": roast_quote.as_detail(),
             "severity": gap_info["severity"],
             "gap_days": gap_info["effective_gap"],
         }
 
     return {"welcome_back": welcome_data, "roast": roast_data}
+
+
+def get_welcome_status(db: Session, user_id: UUID, today_str: str) -> dict:
+    """Get welcome-back status for app load.
+
+    Returns dict with welcome_back (Goku quote) and roast (Vegeta quote + severity).
+    Both null when no gap exists.
+    """
+    gap_info = detect_absence_gap(db, user_id, today_str)
+    catalog = get_quote_catalog(db) if gap_info["severity"] is not None else None
+    return welcome_status(catalog, gap_info)
@@ -0,0 +1,365 @@
+"""Analytics rollups — weekly and monthly DailyLog totals, kept current on every flush.
+
+Every flush that inserts, changes or deletes DailyLog rows through the ORM
+(check_habit, check_habits_batch, mark_off_day) also applies the difference
+to the user's AnalyticsRollup row for that ISO week and that month, with one
+INSERT ... ON CONFLICT DO UPDATE in the same transaction. Every column is
+an integer (daily completion rates are summed in parts per million), so
+deltas add up exactly however many times a day is rewritten. Core-level bulk
+writes to daily_logs bypass the hooks; rebuild_rollups() recomputes
+everything from scratch.
+
+period_totals() answers any date range from the whole months and weeks it
+covers plus a scan of the few leftover days, so the analytics endpoints read
+a handful of rows however long a user has been tracking.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from itertools import chain
+from uuid import UUID
+
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    and_,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    inspect,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.dates import month_start, week_start
+from app.models.analytics_rollup import AnalyticsRollup
+from app.models.daily_log import DailyLog
+
+# Rollup columns, in the order of a contribution tuple
+ROLLUP_FIELDS = (
+    "days_tracked",
+    "habits_due",
+    "habits_completed",
+    "completion_rate_ppm_sum",
+    "xp_earned",
+    "perfect_days",
+)
+
+# DailyLog columns a contribution is derived from
+_SOURCE_FIELDS = (
+    "user_id",
+    "log_date",
+    "habits_due",
+    "habits_completed",
+    "habit_completion_rate",
+    "xp_earned",
+    "is_perfect_day",
+)
+
+# Daily habit_completion_rate is summed as round(rate * RATE_SCALE)
+RATE_SCALE = 1_000_000
+
+_PENDING_KEY = "analytics_rollup_deltas"
+# Rows per upsert statement; keeps rebuilds under SQLite's bound-parameter limit
+_UPSERT_CHUNK = 500
+
+
+@dataclass
+class RollupTotals:
+    days_tracked: int = 0
+    habits_due: int = 0
+    habits_completed: int = 0
+    completion_rate_ppm_sum: int = 0
+    xp_earned: int = 0
+    perfect_days: int = 0
+
+    @property
+    def avg_completion_rate(self) -> float:
+        """Mean of the tracked days' habit_completion_rate; 0.0 if none were tracked."""
+        if not self.days_tracked:
+            return 0.0
+        return self.completion_rate_ppm_sum / RATE_SCALE / self.days_tracked
+
+    def add(self, values) -> None:
+        for f, value in zip(fields(self), values):
+            setattr(self, f.name, getattr(self, f.name) + (value or 0))
+
+    @classmethod
+    def from_rows(cls, rows) -> "RollupTotals":
+        totals = cls()
+        for row in rows:
+            totals.add(row)
+        return totals
+
+
+def _rate_ppm(rate: float | None) -> int:
+    """A completion rate in parts per million, rounded half up like _DAILY_SUMS."""
+    return int((rate or 0.0) * RATE_SCALE + 0.5)
+
+
+def _contribution(values: dict) -> tuple:
+    """What one DailyLog adds to each of its rollups."""
+    return (
+        1,
+        values["habits_due"] or 0,
+        values["habits_completed"] or 0,
+        _rate_ppm(values["habit_completion_rate"]),
+        values["xp_earned"] or 0,
+        1 if values["is_perfect_day"] else 0,
+    )
+
+
+def _keys(user_id: UUID, log_date: str) -> tuple:
+    return (user_id, "week", week_start(log_date)), (user_id, "month", month_start(log_date))
+
+
+# ── Flush hooks ─────────────────────────────────────────────────────────
+
+
+def _old_values(log: DailyLog) -> dict | None:
+    """Pre-flush column values from attribute history; None if any was never loaded."""
+    attrs = inspect(log).attrs
+    values = {}
+    for name in _SOURCE_FIELDS:
+        history = attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            return None
+    return values
+
+
+def _accumulate(deltas: dict, values: dict, sign: int) -> None:
+    contribution = _contribution(values)
+    for key in _keys(values["user_id"], values["log_date"]):
+        deltas[key] = [d + sign * c for d, c in zip(deltas[key], contribution)]
+
+
+@event.listens_for(Session, "before_flush")
+def collect_rollup_deltas(session: Session, flush_context, instances) -> None:
+    """Work out how this flush's DailyLog writes move each rollup.
+
+    Old values come from attribute history; for rows whose columns were
+    expired before being changed they are read back from the database,
+    which still holds them until this flush runs.
+    """
+    deltas: dict[tuple, list] = defaultdict(lambda: [0] * len(ROLLUP_FIELDS))
+    unknown: list[DailyLog] = []
+
+    for log in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(log, DailyLog):
+            continue
+        if log not in session.new:
+            if log in session.dirty and not session.is_modified(log):
+                continue
+            old = _old_values(log)
+            if old is None:
+                unknown.append(log)
+            else:
+                _accumulate(deltas, old, -1)
+        if log not in session.deleted:
+            _accumulate(deltas, {name: getattr(log, name) for name in _SOURCE_FIELDS}, 1)
+
+    if unknown:
+        columns = [getattr(DailyLog, name) for name in _SOURCE_FIELDS]
+        with session.no_autoflush:
+            rows = session.execute(
+                select(*columns).where(DailyLog.id.in_([log.id for log in unknown]))
+            ).all()
+        for row in rows:
+            _accumulate(deltas, dict(zip(_SOURCE_FIELDS, row)), -1)
+
+    session.info[_PENDING_KEY] = {
+        key: values for key, values in deltas.items() if any(values)
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def apply_rollup_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if deltas:
+        _upsert(session.connection(), deltas)
+
+
+def _upsert(conn: Connection, deltas: dict[tuple, list]) -> None:
+    """Add each delta to its rollup row, creating the row if needed."""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = AnalyticsRollup.__table__
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "period": period,
+            "period_start": start,
+            **dict(zip(ROLLUP_FIELDS, values)),
+        }
+        for (user_id, period, start), values in deltas.items()
+    ]
+    for i in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert(table).values(rows[i : i + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "period", "period_start"],
+            set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_FIELDS},
+        )
+        conn.execute(stmt)
+
+
+def rebuild_rollups(conn: Connection) -> int:
+    """Recompute every rollup from daily_logs; returns the number of rows written."""
+    columns = [DailyLog.__table__.c[name] for name in _SOURCE_FIELDS]
+    deltas: dict[tuple, list] = defaultdict(lambda: [0] * len(ROLLUP_FIELDS))
+    for row in conn.execute(select(*columns)):
+        _accumulate(deltas, dict(zip(_SOURCE_FIELDS, row)), 1)
+
+    conn.execute(delete(AnalyticsRollup.__table__))
+    if deltas:
+        _upsert(conn, deltas)
+    return len(deltas)
+
+
+# ── Range queries ───────────────────────────────────────────────────────
+
+# Aggregate columns, built once; see habit_service for why
+_ROLLUP_SUMS = tuple(
+    func.coalesce(func.sum(getattr(AnalyticsRollup, name)), 0) for name in ROLLUP_FIELDS
+)
+
+# _rate_ppm() in SQL; NUMERIC round() goes half away from zero on SQLite and PostgreSQL
+_RATE_PPM = cast(
+    func.round(cast(func.coalesce(DailyLog.habit_completion_rate, 0.0) * RATE_SCALE, Numeric)),
+    Integer,
+)
+
+# The same totals computed from DailyLog rows, in ROLLUP_FIELDS order
+_DAILY_SUMS = (
+    func.count(DailyLog.id),
+    func.coalesce(func.sum(DailyLog.habits_due), 0),
+    func.coalesce(func.sum(DailyLog.habits_completed), 0),
+    func.coalesce(func.sum(_RATE_PPM), 0),
+    func.coalesce(func.sum(DailyLog.xp_earned), 0),
+    func.coalesce(func.sum(case((DailyLog.is_perfect_day, 1), else_=0)), 0),
+)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _weeks_and_days(first: date, last: date) -> tuple[list[str], list[tuple[str, str]]]:
+    """Split [first, last] into whole ISO weeks and the days around them."""
+    monday = first + timedelta(days=-first.weekday() % 7)
+    weeks = []
+    while monday + timedelta(days=6) <= last:
+        weeks.append(monday.isoformat())
+        monday += timedelta(days=7)
+    if not weeks:
+        return [], [(first.isoformat(), last.isoformat())]
+    days = []
+    first_monday = date.fromisoformat(weeks[0])
+    if first < first_monday:
+        days.append((first.isoformat(), (first_monday - timedelta(days=1)).isoformat()))
+    if monday <= last:
+        days.append((monday.isoformat(), last.isoformat()))
+    return weeks, days
+
+
+def split_range(start: str | None, end: str | None) -> tuple:
+    """Cover [start, end] (either end open) with months, ISO weeks and single days.
+
+    Returns ((first_month, last_month) or None, week starts, day ranges);
+    a month bound of None is open. Weeks and days only cover the partial
+    months at either end, so a range of any length needs at most one month
+    span, eight weeks and four day ranges.
+    """
+    start_d = date.fromisoformat(start) if start else None
+    end_d = date.fromisoformat(end) if end else None
+
+    first_month = None
+    if start_d is not None:
+        first_month = start_d if start_d.day == 1 else _next_month(start_d)
+    last_month = None
+    if end_d is not None:
+        last_month = end_d.replace(day=1)
+        if _next_month(end_d) - timedelta(days=1) != end_d:
+            last_month = (last_month - timedelta(days=1)).replace(day=1)
+
+    if first_month is not None and last_month is not None and first_month > last_month:
+        weeks, days = _weeks_and_days(start_d, end_d)
+        return None, weeks, days
+
+    weeks, days = [], []
+    if start_d is not None and start_d < first_month:
+        head_weeks, head_days = _weeks_and_days(start_d, first_month - timedelta(days=1))
+        weeks += head_weeks
+        days += head_days
+    if end_d is not None and _next_month(last_month) <= end_d:
+        tail_weeks, tail_days = _weeks_and_days(_next_month(last_month), end_d)
+        weeks += tail_weeks
+        days += tail_days
+    months = (
+        first_month.isoformat() if first_month else None,
+        last_month.isoformat() if last_month else None,
+    )
+    return months, weeks, days
+
+
+def period_totals_query(user_id: UUID, start: str | None = None, end: str | None = None):
+    """The one statement behind period_totals(), or None for an empty range.
+
+    Its rows fold into the totals with RollupTotals.from_rows(); async
+    callers execute it themselves.
+    """
+    months, weeks, days = split_range(start, end)
+
+    periods = []
+    if months is not None:
+        criteria = [AnalyticsRollup.period == "month"]
+        if months[0] is not None:
+            criteria.append(AnalyticsRollup.period_start >= months[0])
+        if months[1] is not None:
+            criteria.append(AnalyticsRollup.period_start <= months[1])
+        periods.append(and_(*criteria))
+    if weeks:
+        periods.append(
+            and_(AnalyticsRollup.period == "week", AnalyticsRollup.period_start.in_(weeks))
+        )
+    parts = []
+    if periods:
+        parts.append(
+            select(*_ROLLUP_SUMS).where(AnalyticsRollup.user_id == user_id, or_(*periods))
+        )
+    if days:
+        parts.append(
+            select(*_DAILY_SUMS).where(
+                DailyLog.user_id == user_id,
+                or_(*(DailyLog.log_date.between(first, last) for first, last in days)),
+            )
+        )
+    # Rollup rows and leftover days in one round trip
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else union_all(*parts)
+
+
+def period_totals(
+    db: Session, user_id: UUID, start: str | None = None, end: str | None = None
+) -> RollupTotals:
+    """DailyLog totals of a user for dates in [start, end]; None leaves an end open.
+
+    Always a single query, and never loads DailyLog objects.
+    """
+    query = period_totals_query(user_id, start, end)
+    return RollupTotals.from_rows(db.execute(query) if query is not None else [])
@@ -1,20 +1,39 @@
 """Streak management — overall streak, per-habit streak, and Zenkai recovery detection."""
 
 import uuid
-from datetime import date, timedelta
 from uuid import UUID
 
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 
 from app.core.constants import STREAK_MIN_COMPLETION
+from app.core.dates import to_day_number
 from app.models.off_day import OffDay
 from app.models.streak import Streak
 from app.models.habit_streak import HabitStreak
 
+# Prebuilt lookups; see habit_service for why these are module-level
+_STREAK_BY_USER = select(Streak).where(Streak.user_id == bindparam("user_id")).limit(1)
+
+_HABIT_STREAK = (
+    select(HabitStreak)
+    .where(
+        HabitStreak.user_id == bindparam("user_id"),
+        HabitStreak.habit_id == bindparam("habit_id"),
+    )
+    .limit(1)
+)
+
+_OFF_DAYS_BETWEEN = select(func.count(OffDay.id)).where(
+    OffDay.user_id == bindparam("user_id"),
+    OffDay.off_date > bindparam("after"),
+    OffDay.off_date < bindparam("before"),
+)
+
 
 def get_or_create_streak(db: Session, user_id: UUID) -> Streak:
     """Return existing Streak for user or create a new one."""
-    streak = db.query(Streak).filter(Streak.user_id == user_id).first()
+    streak = db.scalars(_STREAK_BY_USER, {"user_id": user_id}).first()
     if streak is None:
         streak = Streak(
             id=uuid.uuid4(),
@@ -31,11 +50,7 @@ def get_or_create_habit_streak(
     db: Session, user_id: UUID, habit_id: UUID
 ) -> HabitStreak:
     """Return existing HabitStreak for habit or create a new one."""
-    hs = (
-        db.query(HabitStreak)
-        .filter(HabitStreak.user_id == user_id, HabitStreak.habit_id == habit_id)
-        .first()
-    )
+    hs = db.scalars(_HABIT_STREAK, {"user_id": user_id, "habit_id": habit_id}).first()
     if hs is None:
         hs = HabitStreak(
             id=uuid.uuid4(),
@@ -60,23 +75,16 @@ def check_zenkai_recovery(
     if streak.last_active_date is None or streak.current_streak == 0:
         return {"zenkai_activated": False, "halved_from": 0, "new_streak": 0}
 
-    last_date = date.fromisoformat(streak.last_active_date)
-    today = date.fromisoformat(local_date)
-    gap_days = (today - last_date).days
+    gap_days = to_day_number(local_date) - to_day_number(streak.last_active_date)
 
     if gap_days <= 1:
         # Consecutive days or same day — no gap
         return {"zenkai_activated": False}
 
     # Count off days in the gap (exclusive of both endpoints)
-    off_day_count = (
-        db.query(OffDay)
-        .filter(
-            OffDay.user_id == user_id,
-            OffDay.off_date > streak.last_active_date,
-            OffDay.off_date < local_date,
-        )
-        .count()
+    off_day_count = db.scalar(
+        _OFF_DAYS_BETWEEN,
+        {"user_id": user_id, "after": streak.last_active_date, "before": local_date},
     )
 
     if off_day_count >= gap_days - 1:
@@ -99,14 +107,18 @@ def update_overall_streak(
     local_date: str,
     completion_rate: float,
     zenkai_info: dict,
+    streak: Streak | None = None,
 ) -> dict:
     """Update overall streak based on completion rate and Zenkai recovery.
 
     - If Zenkai activated, applies halved streak first.
     - Increments streak if completion_rate >= 80%.
     - Always sets last_active_date.
+
+    Pass an already-loaded streak to skip the lookup.
     """
-    streak = get_or_create_streak(db, user_id)
+    if streak is None:
+        streak = get_or_create_streak(db, user_id)
 
     # Apply Zenkai halving if activated
     if zenkai_info.get("zenkai_activated"):
@@ -133,13 +145,17 @@ def update_habit_streak(
     habit_id: UUID,
     local_date: str,
     is_checking: bool,
+    hs: HabitStreak | None = None,
 ) -> dict:
     """Update per-habit streak on check/uncheck.
 
     - Checking: increment current_streak, update best, set last_completed_date.
     - Unchecking: reset current_streak to 0.
+
+    Pass an already-loaded HabitStreak to skip the lookup.
     """
-    hs = get_or_create_habit_streak(db, user_id, habit_id)
+    if hs is None:
+        hs = get_or_create_habit_streak(db, user_id, habit_id)
 
     if is_checking:
         hs.current_streak += 1
@@ -0,0 +1,279 @@
+"""Benchmark the analytics endpoints' DailyLog reads over 1, 3 and 10 years of history.
+
+Each endpoint runs in up to three forms against an in-memory database holding one
+user's daily logs (and the matching rollups). For every form the benchmark
+reports statements issued, time per request and peak Python memory:
+
+- orm:       the previous implementation, loading DailyLog objects and
+             summing them in Python (four loads for completion-trend)
+- aggregate: one column-only aggregate over daily_logs, no rollups
+             (SUM(CASE WHEN ...) buckets for completion-trend)
+- endpoint:  the endpoint function as it ships (rollups for summary, one
+             bucketed aggregate for completion-trend, one grouped EXISTS
+             query for off-day-summary); summary's count includes its
+             Streak lookup
+
+rolling-completion compares per-day window sums over ORM objects (orm)
+with the NumPy engine behind the endpoint.
+
+The history also holds 30 off days per year of tracking, which the
+orm form of off-day-summary probes one by one.
+
+Usage (from backend/):
+    python -m benchmarks.analytics_queries [--years 1 3 10] [--repeat 20]
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import case, create_engine, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.v1 import analytics as analytics_api
+from app.database.base import Base
+from app.models.daily_log import DailyLog
+from app.models.off_day import OffDay
+from app.models.streak import Streak
+from app.models.user import User
+from app.services.rollup_service import rebuild_rollups
+
+import app.models  # noqa: F401
+
+
+def build(years: int):
+    """In-memory database with one user and a daily log for every day of `years`."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    user_id = uuid.uuid4()
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "username": "bench"}])
+        conn.execute(insert(Streak), [{"id": uuid.uuid4(), "user_id": user_id, "best_streak": 9}])
+        conn.execute(insert(DailyLog), [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "log_date": (today - timedelta(days=i)).isoformat(),
+                "habits_due": 5,
+                "habits_completed": i % 6,
+                "habit_completion_rate": min(i % 6, 5) / 5,
+                "is_perfect_day": i % 6 >= 5,
+                "xp_earned": 20 * (i % 6),
+            }
+            for i in range(365 * years)
+            if i % 12
+        ])
+        conn.execute(insert(OffDay), [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "off_date": (today - timedelta(days=i)).isoformat(),
+                "reason": "sick" if i % 24 else "vacation",
+            }
+            for i in range(0, 365 * years, 12)
+        ])
+        rebuild_rollups(conn)
+    return engine, user_id
+
+
+# ── The forms being compared ────────────────────────────────────────────
+
+
+def summary_orm(db: Session, user_id, start):
+    query = db.query(DailyLog).filter(DailyLog.user_id == user_id)
+    if start is not None:
+        query = query.filter(DailyLog.log_date >= start)
+    logs = query.all()
+    return (
+        sum(1 for dl in logs if dl.is_perfect_day),
+        sum(dl.habit_completion_rate for dl in logs) / len(logs) if logs else 0.0,
+        sum(dl.xp_earned for dl in logs),
+        len(logs),
+    )
+
+
+def summary_aggregate(db: Session, user_id, start):
+    query = select(
+        func.count(DailyLog.id),
+        func.sum(case((DailyLog.is_perfect_day, 1), else_=0)),
+        func.avg(DailyLog.habit_completion_rate),
+        func.coalesce(func.sum(DailyLog.xp_earned), 0),
+    ).where(DailyLog.user_id == user_id)
+    if start is not None:
+        query = query.where(DailyLog.log_date >= start)
+    return db.execute(query).one()
+
+
+def trend_orm(db: Session, user_id, windows):
+    results = []
+    for first, last in windows:
+        logs = (
+            db.query(DailyLog)
+            .filter(
+                DailyLog.user_id == user_id,
+                DailyLog.log_date >= first,
+                DailyLog.log_date <= last,
+            )
+            .all()
+        )
+        results.append((sum(dl.habits_due for dl in logs), sum(dl.habits_completed for dl in logs)))
+    return results
+
+
+def off_days_orm(db: Session, user_id):
+    off_days = db.query(OffDay).filter(OffDay.user_id == user_id).all()
+    logs = db.query(DailyLog).filter(DailyLog.user_id == user_id).all()
+    avg_daily_xp = sum(dl.xp_earned for dl in logs) / len(logs) if logs else 0
+    preserved = 0
+    for od in off_days:
+        od_date = date.fromisoformat(od.off_date)
+        for neighbour in (od_date - timedelta(days=1), od_date + timedelta(days=1)):
+            if (
+                db.query(DailyLog)
+                .filter(DailyLog.user_id == user_id, DailyLog.log_date == neighbour.isoformat())
+                .first()
+                is not None
+            ):
+                preserved += 1
+                break
+    reasons = (
+        db.query(OffDay.reason, func.count(OffDay.id))
+        .filter(OffDay.user_id == user_id)
+        .group_by(OffDay.reason)
+        .all()
+    )
+    return int(avg_daily_xp * len(off_days)), preserved, dict(reasons)
+
+
+def rolling_orm(db: Session, user_id, days: int):
+    today = date.today()
+    first = today - timedelta(days=days + 28)
+    logs = {
+        dl.log_date: dl
+        for dl in db.query(DailyLog).filter(
+            DailyLog.user_id == user_id, DailyLog.log_date >= first.isoformat()
+        )
+    }
+    points = []
+    for offset in range(days - 1, -1, -1):
+        day = today - timedelta(days=offset)
+        rates = []
+        for window in (7, 30):
+            due = completed = 0
+            for back in range(window):
+                dl = logs.get((day - timedelta(days=back)).isoformat())
+                if dl is not None:
+                    due += dl.habits_due
+                    completed += dl.habits_completed
+            rates.append(completed / due if due else 0.0)
+        points.append((day.isoformat(), *rates))
+    return points
+
+
+def _endpoint_summary(db, user_id, period):
+    return analytics_api.analytics_summary(period=period, db=db, user=SimpleNamespace(id=user_id))
+
+
+def _endpoint_trend(db, user_id):
+    return analytics_api.completion_trend(db=db, user=SimpleNamespace(id=user_id))
+
+
+def _endpoint_rolling(db, user_id, days):
+    return analytics_api.rolling_completion(days=days, db=db, user=SimpleNamespace(id=user_id))
+
+
+def _endpoint_off_days(db, user_id):
+    return analytics_api.off_day_summary(period="all", db=db, user=SimpleNamespace(id=user_id))
+
+
+# ── Measurement ─────────────────────────────────────────────────────────
+
+
+def measure(engine, fn, repeat: int) -> tuple[int, float, float]:
+    """(statements per call, ms per call, peak KiB of Python allocations per call)."""
+    statements = 0
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    with Session(engine) as db:
+        fn(db)  # warm caches
+        db.expunge_all()
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            began = time.perf_counter()
+            for _ in range(repeat):
+                fn(db)
+                db.expunge_all()
+            elapsed = (time.perf_counter() - began) / repeat
+            tracemalloc.start()
+            fn(db)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            db.expunge_all()
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+    return statements // (repeat + 1), elapsed * 1000, peak / 1024
+
+
+def run(years: int, repeat: int) -> None:
+    engine, user_id = build(years)
+    today = date.today()
+
+    def ago(days: int) -> str:
+        return (today - timedelta(days=days)).isoformat()
+
+    windows = [(ago(7), ago(0)), (ago(14), ago(8)), (ago(30), ago(0)), (ago(60), ago(31))]
+    cases = {
+        "summary?period=all": {
+            "orm": lambda db: summary_orm(db, user_id, None),
+            "aggregate": lambda db: summary_aggregate(db, user_id, None),
+            "endpoint": lambda db: _endpoint_summary(db, user_id, "all"),
+        },
+        "summary?period=month": {
+            "orm": lambda db: summary_orm(db, user_id, ago(30)),
+            "aggregate": lambda db: summary_aggregate(db, user_id, ago(30)),
+            "endpoint": lambda db: _endpoint_summary(db, user_id, "month"),
+        },
+        "completion-trend": {
+            "orm": lambda db: trend_orm(db, user_id, windows),
+            "endpoint": lambda db: _endpoint_trend(db, user_id),
+        },
+        "rolling-completion?days=all": {
+            "orm": lambda db: rolling_orm(db, user_id, 365 * years),
+            "endpoint": lambda db: _endpoint_rolling(db, user_id, 365 * years),
+        },
+        "off-day-summary?period=all": {
+            "orm": lambda db: off_days_orm(db, user_id),
+            "endpoint": lambda db: _endpoint_off_days(db, user_id),
+        },
+    }
+
+    print(f"== {years} year(s), {365 * years:,} days, one in 12 an off day")
+    for endpoint, forms in cases.items():
+        print(f"   {endpoint}")
+        for label, fn in forms.items():
+            statements, millis, peak_kib = measure(engine, fn, repeat)
+            print(
+                f"      {label:<10} {statements:3d} queries  {millis:8.2f} ms  "
+                f"{peak_kib:9.1f} KiB peak"
+            )
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for years in args.years:
+        run(years, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
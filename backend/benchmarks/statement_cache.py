@@ -0,0 +1,145 @@
+"""Benchmark Python-side statement overhead of the habit-check lookups.
+
+Runs the lookups of one habit check three ways against a small in-memory
+database, so the SQLite work is tiny and identical and the differences come
+from SQLAlchemy's statement handling:
+
+- uncached: legacy Query with the compiled cache disabled (full compile)
+- query:    legacy Query, as the services issued it before (builds the
+            Query and computes its cache key on every call)
+- prebuilt: the module-level select() statements the services use now,
+            whose cache key is memoized on the statement object
+
+Usage (from backend/):
+    python -m benchmarks.statement_cache [--checks 5000] [--habits 12]
+"""
+
+import argparse
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import and_, create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.database.base import Base
+from app.models.daily_log import DailyLog
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.habit_streak import HabitStreak
+from app.models.off_day import OffDay
+from app.models.streak import Streak
+from app.models.user import User
+from app.api.v1 import habits as habits_api
+from app.services import game_state, off_day_service, streak_service
+
+import app.models  # noqa: F401
+
+
+def build(habits: int):
+    """In-memory database with one user, their habits and 30 days of logs."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    user_id = uuid.uuid4()
+    days = [(date.today() - timedelta(days=i)).isoformat() for i in range(30)]
+    habit_ids = [uuid.uuid4() for _ in range(habits)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "username": "bench"}])
+        conn.execute(insert(Streak), [{"id": uuid.uuid4(), "user_id": user_id}])
+        conn.execute(insert(Habit), [
+            {"id": hid, "user_id": user_id, "title": f"Habit {i}", "attribute": "str",
+             "start_date": days[-1]}
+            for i, hid in enumerate(habit_ids)
+        ])
+        conn.execute(insert(HabitStreak), [
+            {"id": uuid.uuid4(), "user_id": user_id, "habit_id": hid} for hid in habit_ids
+        ])
+        conn.execute(insert(DailyLog), [
+            {"id": uuid.uuid4(), "user_id": user_id, "log_date": day} for day in days
+        ])
+        conn.execute(insert(HabitLog), [
+            {"id": uuid.uuid4(), "user_id": user_id, "habit_id": hid, "log_date": day,
+             "completed": True}
+            for hid in habit_ids for day in days
+        ])
+    return engine, user_id, habit_ids, days
+
+
+# ── The lookups of one habit check, in both forms ───────────────────────
+
+
+def query_lookups(db: Session, user_id, habit_id, local_date):
+    db.query(User, Streak, DailyLog, OffDay.id).outerjoin(
+        Streak, Streak.user_id == User.id
+    ).outerjoin(
+        DailyLog, and_(DailyLog.user_id == User.id, DailyLog.log_date == local_date)
+    ).outerjoin(
+        OffDay, and_(OffDay.user_id == User.id, OffDay.off_date == local_date)
+    ).filter(User.id == user_id).limit(1).one()
+    db.query(Habit, HabitLog, HabitStreak).outerjoin(
+        HabitLog, and_(HabitLog.habit_id == Habit.id, HabitLog.log_date == local_date)
+    ).outerjoin(HabitStreak, HabitStreak.habit_id == Habit.id).filter(
+        Habit.id.in_([habit_id]), Habit.user_id == user_id
+    ).all()
+    db.query(Habit).filter(
+        Habit.id == habit_id, Habit.user_id == user_id, Habit.is_active == True  # noqa: E712
+    ).first()
+    db.query(HabitLog).filter(
+        HabitLog.habit_id == habit_id,
+        HabitLog.log_date == local_date,
+        HabitLog.completed == True,  # noqa: E712
+    ).first()
+    db.query(DailyLog).filter(
+        DailyLog.user_id == user_id, DailyLog.log_date == local_date
+    ).first()
+    db.query(Streak).filter(Streak.user_id == user_id).first()
+
+
+def prebuilt_lookups(db: Session, user_id, habit_id, local_date):
+    day = {"user_id": user_id, "local_date": local_date}
+    db.execute(game_state._USER_DAY_STATE, day).one()
+    db.execute(game_state._HABIT_DAY_STATE, {**day, "habit_ids": [habit_id]}).all()
+    db.scalars(habits_api._ACTIVE_HABIT, {"habit_id": habit_id, "user_id": user_id}).first()
+    db.scalar(habits_api._COMPLETED_LOG_ID, {"habit_id": habit_id, "local_date": local_date})
+    db.scalars(off_day_service._DAILY_LOG, day).first()
+    db.scalars(streak_service._STREAK_BY_USER, {"user_id": user_id}).first()
+
+
+def time_checks(engine, lookups, user_id, habit_ids, days, checks: int) -> float:
+    """Microseconds per check (six lookups), varying habit and date."""
+    with Session(engine) as db:
+        lookups(db, user_id, habit_ids[0], days[0])  # warm the compiled cache
+        began = time.perf_counter()
+        for i in range(checks):
+            lookups(db, user_id, habit_ids[i % len(habit_ids)], days[i % len(days)])
+            db.expunge_all()
+        elapsed = time.perf_counter() - began
+    return elapsed / checks * 1e6
+
+
+def run(checks: int, habits: int) -> None:
+    engine, user_id, habit_ids, days = build(habits)
+    uncached = engine.execution_options(compiled_cache=None)
+    results = {
+        "uncached": time_checks(uncached, query_lookups, user_id, habit_ids, days, checks),
+        "query": time_checks(engine, query_lookups, user_id, habit_ids, days, checks),
+        "prebuilt": time_checks(engine, prebuilt_lookups, user_id, habit_ids, days, checks),
+    }
+    print(f"== {checks:,} checks x 6 lookups, in-memory SQLite")
+    for label, micros in results.items():
+        saved = results["uncached"] - micros
+        print(f"   {label:<9} {micros:8.1f} us/check   ({saved:7.1f} us below uncached)")
+    print(f"   prebuilt saves {results['query'] - results['prebuilt']:.1f} us/check over query")
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--habits", type=int, default=12)
+    args = parser.parse_args()
+    run(args.checks, args.habits)
+
+
+if __name__ == "__main__":
+    main()
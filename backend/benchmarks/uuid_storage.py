@@ -0,0 +1,138 @@
+"""Benchmark UUID storage on SQLite: 32-char hex text vs 16-byte BLOB.
+
+Builds the same synthetic multi-year dataset twice, once per storage mode,
+and reports database size plus primary/foreign key lookup timings.
+
+Usage (from backend/):
+    python -m benchmarks.uuid_storage [--years 3] [--users 5] [--habits 12] [--lookups 20000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import bindparam, create_engine, insert, select, text
+
+from app.core.dates import to_day_number
+from app.database.base import Base
+from app.database.types import use_binary_uuids
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+def build(path: str, binary: bool, years: int, habits_per_user: int, users: int):
+    """Create and populate a database; return (engine, habit ids, log ids)."""
+    engine = create_engine(f"sqlite:///{path}")
+    if binary:
+        use_binary_uuids(engine)
+    Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=365 * years)
+    days = [to_day_number(start + timedelta(days=i)) for i in range(365 * years)]
+    habit_ids, log_ids = [], []
+    with engine.begin() as conn:
+        for u in range(users):
+            user_id = uuid.uuid4()
+            conn.execute(insert(User), [{"id": user_id, "username": f"bench-{u}"}])
+            habits = [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "title": f"Habit {h}",
+                    "attribute": "str",
+                    "start_date": days[0],
+                }
+                for h in range(habits_per_user)
+            ]
+            conn.execute(insert(Habit), habits)
+            for habit in habits:
+                habit_ids.append(habit["id"])
+                rows = [
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "habit_id": habit["id"],
+                        "log_date": day,
+                        "completed": rng.random() < 0.7,
+                    }
+                    for day in days
+                ]
+                log_ids.extend(row["id"] for row in rows)
+                conn.execute(insert(HabitLog), rows)
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    return engine, habit_ids, log_ids
+
+
+def index_sizes(engine) -> dict[str, int]:
+    """Bytes used by each habit_logs b-tree, if SQLite was built with dbstat."""
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT name, SUM(pgsize) FROM dbstat"
+                " WHERE name LIKE '%habit_logs%' GROUP BY name"
+            )).all()
+    except Exception:
+        return {}
+    return dict(rows)
+
+
+def time_lookups(engine, statement, keys: list) -> float:
+    """Microseconds per single-row lookup over the given keys."""
+    with engine.connect() as conn:
+        began = time.perf_counter()
+        for key in keys:
+            conn.execute(statement, {"key": key}).first()
+        elapsed = time.perf_counter() - began
+    return elapsed / len(keys) * 1e6
+
+
+def run(years: int, habits_per_user: int, users: int, lookups: int) -> None:
+    rng = random.Random(7)
+    by_pk = select(HabitLog.completed).where(HabitLog.id == bindparam("key"))
+    by_fk = (
+        select(HabitLog.completed)
+        .where(HabitLog.habit_id == bindparam("key"))
+        .order_by(HabitLog.log_date.desc())
+        .limit(1)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, binary in (("text", False), ("blob", True)):
+            path = os.path.join(tmp, f"{label}.db")
+            engine, habit_ids, log_ids = build(path, binary, years, habits_per_user, users)
+            pk_keys = rng.sample(log_ids, min(lookups, len(log_ids)))
+            fk_keys = [rng.choice(habit_ids) for _ in range(lookups)]
+
+            with engine.connect() as conn:
+                page_count = conn.execute(text("PRAGMA page_count")).scalar()
+                page_size = conn.execute(text("PRAGMA page_size")).scalar()
+            print(f"== {label} UUIDs: {len(log_ids):,} habit_logs rows")
+            print(f"   file size   {os.path.getsize(path) / 1e6:8.2f} MB"
+                  f"  ({page_count:,} pages x {page_size} B)")
+            for name, size in sorted(index_sizes(engine).items()):
+                print(f"   {name:<40} {size / 1e6:8.2f} MB")
+            print(f"   PK lookup   {time_lookups(engine, by_pk, pk_keys):8.1f} us")
+            print(f"   FK lookup   {time_lookups(engine, by_fk, fk_keys):8.1f} us")
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--habits", type=int, default=12, help="habits per user")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.years, args.habits, args.users, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
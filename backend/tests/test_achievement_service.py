@@ -3,14 +3,17 @@
 import uuid
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.core.constants import STREAK_MILESTONES
+from app.models.achievement import Achievement
 from app.services.achievement_service import (
     calc_attribute_level_from_xp,
     detect_attribute_level_change,
     detect_streak_milestones,
     get_milestone_badge_name,
     record_achievement,
+    record_achievements,
 )
 
 
@@ -156,3 +159,43 @@ class TestRecordAchievement:
         )
         assert r1 is not None
         assert r2 is not None
+
+    def test_unique_index_rejects_duplicates(self, db, sample_user):
+        for _ in range(2):
+            db.add(Achievement(
+                id=uuid.uuid4(), user_id=sample_user.id,
+                achievement_type="transformation", achievement_key="ssj",
+            ))
+        with pytest.raises(IntegrityError):
+            db.flush()
+        db.rollback()
+
+
+class TestRecordAchievements:
+    def test_records_all_in_one_call(self, db, sample_user):
+        inserted = record_achievements(db, sample_user.id, [
+            {"achievement_type": "streak_milestone", "achievement_key": "overall_streak_3",
+             "milestone_type": "streak", "metadata": {"streak": 3}},
+            {"achievement_type": "transformation", "achievement_key": "ssj"},
+        ])
+        assert inserted == {
+            ("streak_milestone", "overall_streak_3"),
+            ("transformation", "ssj"),
+        }
+        rows = db.query(Achievement).filter(Achievement.user_id == sample_user.id).all()
+        assert len(rows) == 2
+        milestone = next(r for r in rows if r.achievement_key == "overall_streak_3")
+        assert milestone.milestone_type == "streak"
+        assert milestone.metadata_json == {"streak": 3}
+
+    def test_skips_already_unlocked(self, db, sample_user):
+        record_achievement(db, sample_user.id, "transformation", "ssj")
+        inserted = record_achievements(db, sample_user.id, [
+            {"achievement_type": "transformation", "achievement_key": "ssj"},
+            {"achievement_type": "transformation", "achievement_key": "ssj2"},
+        ])
+        assert inserted == {("transformation", "ssj2")}
+        assert db.query(Achievement).filter(Achievement.user_id == sample_user.id).count() == 2
+
+    def test_empty_is_noop(self, db, sample_user):
+        assert record_achievements(db, sample_user.id, []) == set()
@@ -0,0 +1,180 @@
+"""Tests for the columnar analytics engine — checked against plain Python loops."""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.dates import to_day_number
+from app.models.daily_log import DailyLog
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.services.analytics_engine import (
+    load_daily_series,
+    load_habit_matrix,
+    rolling_completion_rate,
+    trailing_sums,
+    weekday_totals,
+    weekdays,
+)
+from app.services.archive_service import compact_habit_logs, completed_days
+from app.services.habit_service import is_habit_due
+
+FIRST = date(2025, 1, 1)
+
+
+def _iso(offset: int) -> str:
+    return (FIRST + timedelta(days=offset)).isoformat()
+
+
+@pytest.fixture()
+def logs(db, sample_user):
+    """~300 random DailyLogs over 365 days, keyed by ISO date."""
+    rng = random.Random(11)
+    by_date = {}
+    for i in range(365):
+        if rng.random() < 0.2:
+            continue
+        due = rng.randint(0, 6)
+        done = rng.randint(0, due)
+        log = DailyLog(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            log_date=_iso(i),
+            habits_due=due,
+            habits_completed=done,
+            habit_completion_rate=done / due if due else 0.0,
+            is_perfect_day=due > 0 and done == due,
+            xp_earned=done * 15,
+        )
+        db.add(log)
+        by_date[log.log_date] = log
+    db.flush()
+    return by_date
+
+
+def test_weekdays_match_calendar():
+    days = [FIRST + timedelta(days=i) for i in range(20)]
+    numbers = np.array([to_day_number(d) for d in days])
+    assert weekdays(numbers).tolist() == [d.weekday() for d in days]
+
+
+def test_trailing_sums():
+    values = np.arange(1, 11)
+    assert trailing_sums(values, 3).tolist() == [
+        sum(values[max(i - 2, 0) : i + 1]) for i in range(10)
+    ]
+
+
+class TestDailySeries:
+    def test_dense_columns(self, db, sample_user, logs):
+        series = load_daily_series(db, sample_user.id, _iso(0), _iso(364))
+        assert len(series) == 365
+        assert series.dates()[0] == _iso(0)
+        for i, day in enumerate(series.dates()):
+            log = logs.get(day)
+            assert series.tracked[i] == (log is not None)
+            assert series.habits_due[i] == (log.habits_due if log else 0)
+            assert series.xp_earned[i] == (log.xp_earned if log else 0)
+
+    def test_rolling_rate(self, db, sample_user, logs):
+        series = load_daily_series(db, sample_user.id, _iso(0), _iso(364))
+        for window in (7, 30):
+            rates = rolling_completion_rate(series, window)
+            for i in range(0, 365, 17):
+                days = [_iso(j) for j in range(max(i - window + 1, 0), i + 1)]
+                due = sum(logs[d].habits_due for d in days if d in logs)
+                done = sum(logs[d].habits_completed for d in days if d in logs)
+                assert rates[i] == pytest.approx(done / due if due else 0.0)
+
+    def test_since(self, db, sample_user, logs):
+        series = load_daily_series(db, sample_user.id, _iso(0), _iso(364))
+        tail = series.since(_iso(300))
+        assert len(tail) == 65
+        assert tail.dates()[0] == _iso(300)
+        assert tail.xp_earned.tolist() == series.xp_earned[300:].tolist()
+
+    def test_weekday_totals(self, db, sample_user, logs):
+        series = load_daily_series(db, sample_user.id, _iso(0), _iso(364))
+        totals = weekday_totals(series)
+        for weekday in range(7):
+            day_logs = [
+                log for d, log in logs.items() if date.fromisoformat(d).weekday() == weekday
+            ]
+            assert totals["days_tracked"][weekday] == len(day_logs)
+            assert totals["habits_completed"][weekday] == sum(l.habits_completed for l in day_logs)
+            assert totals["perfect_days"][weekday] == sum(l.is_perfect_day for l in day_logs)
+
+    def test_empty(self, db, sample_user):
+        series = load_daily_series(db, sample_user.id, _iso(0), _iso(9))
+        assert not series.tracked.any()
+        assert rolling_completion_rate(series, 7).tolist() == [0.0] * 10
+
+
+class TestHabitMatrix:
+    @pytest.fixture()
+    def habits(self, db, sample_user):
+        specs = [
+            ("Daily", "daily", None, "2024-06-01", None),
+            ("MWF", "custom", [1, 3, 5], "2025-01-10", None),
+            ("Ended", "weekdays", None, "2024-01-01", "2025-02-15"),
+        ]
+        habits = []
+        for i, (title, frequency, custom_days, start, end) in enumerate(specs):
+            habit = Habit(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                title=title,
+                attribute="str",
+                frequency=frequency,
+                custom_days=custom_days,
+                start_date=start,
+                end_date=end,
+                sort_order=i,
+            )
+            db.add(habit)
+            habits.append(habit)
+        db.flush()
+
+        rng = random.Random(5)
+        for habit in habits:
+            for i in range(-40, 90):
+                if rng.random() < 0.5:
+                    db.add(HabitLog(
+                        id=uuid.uuid4(),
+                        user_id=sample_user.id,
+                        habit_id=habit.id,
+                        log_date=_iso(i),
+                        completed=rng.random() < 0.8,
+                        attribute_xp_awarded=10,
+                    ))
+        db.flush()
+        # Everything before February moves to the archive tier
+        compact_habit_logs(db, cutoff="2025-02-01")
+        return habits
+
+    def test_matches_row_by_row(self, db, sample_user, habits):
+        start, end = _iso(-20), _iso(80)
+        matrix = load_habit_matrix(db, sample_user.id, start, end)
+        assert matrix.titles == ["Daily", "MWF", "Ended"]
+        assert matrix.due.shape == matrix.completed.shape == (3, 101)
+
+        for row, habit in enumerate(habits):
+            done = completed_days(db, habit.id, start, end)
+            for i in range(101):
+                day = _iso(-20 + i)
+                assert matrix.due[row, i] == is_habit_due(habit, day)
+                assert matrix.completed[row, i] == (day in done)
+
+        expected = [
+            (matrix.completed[r] & matrix.due[r]).sum() / matrix.due[r].sum() for r in range(3)
+        ]
+        assert matrix.completion_rates().tolist() == pytest.approx(expected)
+
+    def test_no_habits(self, db, sample_user):
+        matrix = load_habit_matrix(db, sample_user.id, _iso(0), _iso(6))
+        assert matrix.habit_ids == []
+        assert matrix.due.shape == (0, 7)
+        assert matrix.completion_rates().tolist() == []
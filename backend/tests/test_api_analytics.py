@@ -4,6 +4,7 @@ import uuid
 from datetime import date, datetime, timedelta
 
 import pytest
+from sqlalchemy import event
 
 
 class TestAnalyticsSummary:
@@ -45,6 +46,53 @@ class TestAnalyticsSummary:
         assert data["total_xp"] == 200
         assert data["days_tracked"] == 1
 
+    def test_avg_completion_is_mean_of_daily_rates(self, client, db, sample_user):
+        """Uneven habits_due: each day counts once, however many habits were due."""
+        from app.models.daily_log import DailyLog
+
+        today = date.today()
+        counts = [(1, 1), (1, 10), (1, 3), (2, 7), (0, 4), (5, 6)] * 3
+        logs = [
+            DailyLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                log_date=(today - timedelta(days=5 * i)).isoformat(),
+                habits_due=due,
+                habits_completed=done,
+                habit_completion_rate=done / due,
+                xp_earned=10 * done,
+            )
+            for i, (done, due) in enumerate(counts)
+        ]
+        db.add_all(logs)
+        db.flush()
+
+        # The summary as computed before rollups: a plain mean over DailyLog rows
+        for period, days in [("week", 7), ("month", 30), ("all", None)]:
+            start = (today - timedelta(days=days)).isoformat() if days else ""
+            rates = [dl.habit_completion_rate for dl in logs if dl.log_date >= start]
+            resp = client.get(f"/api/v1/analytics/summary?period={period}")
+            assert resp.json()["avg_completion"] == round(sum(rates) / len(rates), 4)
+
+    def test_avg_completion_two_uneven_days(self, client, db, sample_user):
+        from app.models.daily_log import DailyLog
+
+        today = date.today()
+        db.add_all([
+            DailyLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                log_date=(today - timedelta(days=i)).isoformat(),
+                habits_due=due,
+                habits_completed=1,
+                habit_completion_rate=1 / due,
+            )
+            for i, due in enumerate([1, 10])
+        ])
+        db.flush()
+        resp = client.get("/api/v1/analytics/summary?period=all")
+        assert resp.json()["avg_completion"] == 0.55  # not the pooled 2/11
+
     def test_summary_period_filter(self, client, db, sample_user):
         """Logs at different dates should be filtered by period."""
         from app.models.daily_log import DailyLog
@@ -373,3 +421,164 @@ class TestCompletionTrend:
         assert resp.status_code == 200
         data = resp.json()
         assert data["weekly_rate"] == 0.0
+
+
+class TestAggregateQueries:
+    """Analytics endpoints issue a fixed number of aggregate queries, however long the history."""
+
+    @pytest.fixture()
+    def history(self, db, sample_user):
+        from app.models.daily_log import DailyLog
+
+        today = date.today()
+        db.add_all([
+            DailyLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                log_date=(today - timedelta(days=i)).isoformat(),
+                habits_due=4,
+                habits_completed=i % 5,
+                habit_completion_rate=(i % 5) / 4,
+                is_perfect_day=i % 5 == 4,
+                xp_earned=10 * (i % 5),
+            )
+            for i in range(400)
+        ])
+        db.flush()
+
+    def _statements(self, client, engine, url):
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            resp = client.get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert resp.status_code == 200
+        return resp.json(), [s for s in statements if "daily_logs" in s or "analytics_rollups" in s]
+
+    @pytest.mark.parametrize("period", ["week", "month", "all"])
+    def test_summary_single_query(self, client, engine, history, period):
+        data, statements = self._statements(
+            client, engine, f"/api/v1/analytics/summary?period={period}"
+        )
+        assert len(statements) == 1
+        assert "daily_logs.id," not in statements[0]  # column aggregates only
+        assert data["days_tracked"] == {"week": 8, "month": 31, "all": 400}[period]
+
+    def test_trend_single_query(self, client, engine, history):
+        data, statements = self._statements(client, engine, "/api/v1/analytics/completion-trend")
+        assert len(statements) == 1
+        assert "CASE WHEN" in statements[0]
+        assert data["weekly_habits_due"] == 32
+        assert data["monthly_habits_due"] == 124
+
+    def test_off_day_summary_constant_queries(self, client, db, engine, history, sample_user):
+        from app.models.off_day import OffDay
+
+        today = date.today()
+        # A long leave just before the tracked history; only its last day touches a log
+        db.add_all([
+            OffDay(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                off_date=(today - timedelta(days=i)).isoformat(),
+                reason="sick" if i < 430 else "vacation",
+            )
+            for i in range(400, 460)
+        ])
+        db.flush()
+
+        data, statements = self._statements(
+            client, engine, "/api/v1/analytics/off-day-summary?period=all"
+        )
+        # One grouped EXISTS query over off_days, one rollup aggregate for avg XP
+        assert len(statements) == 2
+        assert "EXISTS" in statements[0] and "off_days" in statements[0]
+        assert data == {
+            "total_off_days": 60,
+            "xp_impact_estimate": 1200,  # avg 20 XP over 400 days * 60
+            "streaks_preserved": 1,
+            "reason_breakdown": {"sick": 30, "vacation": 30},
+        }
+
+
+class TestRollingCompletion:
+    def test_rates(self, client, db, sample_user):
+        from app.models.daily_log import DailyLog
+
+        today = date.today()
+        # Every day of the last 40: 4 due, all done on the last 7 days, none before
+        db.add_all([
+            DailyLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                log_date=(today - timedelta(days=i)).isoformat(),
+                habits_due=4,
+                habits_completed=4 if i < 7 else 0,
+                habit_completion_rate=1.0 if i < 7 else 0.0,
+                xp_earned=0,
+            )
+            for i in range(40)
+        ])
+        db.flush()
+
+        resp = client.get("/api/v1/analytics/rolling-completion?days=10")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [d["date"] for d in data] == [
+            (today - timedelta(days=i)).isoformat() for i in range(9, -1, -1)
+        ]
+        assert data[-1] == {"date": today.isoformat(), "rate_7d": 1.0, "rate_30d": round(7 / 30, 4)}
+        assert data[0]["rate_7d"] == 0.0
+
+    def test_days_bounds(self, client, sample_user):
+        assert client.get("/api/v1/analytics/rolling-completion?days=0").status_code == 422
+        assert client.get("/api/v1/analytics/rolling-completion?days=3651").status_code == 422
+
+
+class TestWeekdayHeatmap:
+    def test_heatmap(self, client, db, sample_user):
+        from app.models.daily_log import DailyLog
+
+        today = date.today()
+        db.add_all([
+            DailyLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                log_date=(today - timedelta(days=i)).isoformat(),
+                habits_due=2,
+                habits_completed=2 if (today - timedelta(days=i)).weekday() == 0 else 1,
+                habit_completion_rate=1.0,
+                xp_earned=30,
+            )
+            for i in range(14)
+        ])
+        db.flush()
+
+        data = client.get("/api/v1/analytics/weekday-heatmap?days=14").json()
+        assert [d["weekday"] for d in data] == list(range(7))
+        assert all(d["days_tracked"] == 2 and d["avg_xp"] == 30.0 for d in data)
+        assert data[0]["completion_rate"] == 1.0
+        assert data[3]["completion_rate"] == 0.5
+
+
+class TestHabitMatrix:
+    def test_matrix(self, client, db, sample_user, sample_habit):
+        from app.services.habit_service import check_habit
+
+        today = date.today()
+        check_habit(db, sample_user.id, sample_habit.id, today.isoformat())
+        check_habit(db, sample_user.id, sample_habit.id, (today - timedelta(days=2)).isoformat())
+
+        resp = client.get("/api/v1/analytics/habit-matrix?days=4")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["start_date"] == (today - timedelta(days=3)).isoformat()
+        (row,) = data["habits"]
+        assert row["habit_id"] == str(sample_habit.id)
+        assert row["completed"] == [False, True, False, True]
+        assert (row["due_days"], row["completions"], row["completion_rate"]) == (4, 2, 0.5)
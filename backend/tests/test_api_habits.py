@@ -2,8 +2,10 @@
 
 import uuid
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event
 
 
 class TestHabitCRUD:
@@ -178,6 +180,114 @@ class TestCheckHabit:
         assert data["is_checking"] is False
 
 
+class TestCheckHabitBatch:
+    def _create(self, client, title, **extra):
+        resp = client.post("/api/v1/habits/", json={
+            "title": title,
+            "attribute": "str",
+            "start_date": "2026-01-01",
+            **extra,
+        })
+        return resp.json()["id"]
+
+    def test_batch_checks_all_habits(self, client, db, sample_user):
+        """One batch call checks every habit and settles the day once."""
+        today = date.today().isoformat()
+        ids = [self._create(client, f"Morning {i}") for i in range(3)]
+
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": today,
+            "habit_ids": ids,
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["log_date"] == today
+        assert [r["habit_id"] for r in data["results"]] == ids
+        assert all(r["is_checking"] for r in data["results"])
+        assert data["daily_log"]["habits_completed"] >= 3
+        # Streak settles once per batch, not once per habit
+        assert data["streak"]["current_streak"] <= 1
+        assert data["power_level"] > 0
+
+    def test_batch_toggles_back(self, client, db, sample_user):
+        today = date.today().isoformat()
+        ids = [self._create(client, f"Toggle {i}") for i in range(2)]
+        client.post("/api/v1/habits/check-batch", json={"local_date": today, "habit_ids": ids})
+
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": today,
+            "habit_ids": ids,
+        })
+        assert resp.status_code == 200
+        assert not any(r["is_checking"] for r in resp.json()["results"])
+
+    def test_batch_rejects_duplicates(self, client, db, sample_user):
+        today = date.today().isoformat()
+        habit_id = self._create(client, "Dup")
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": today,
+            "habit_ids": [habit_id, habit_id],
+        })
+        assert resp.status_code == 422
+
+    def test_batch_unknown_habit(self, client, db, sample_user):
+        today = date.today().isoformat()
+        habit_id = self._create(client, "Known")
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": today,
+            "habit_ids": [habit_id, str(uuid.uuid4())],
+        })
+        assert resp.status_code == 404
+
+    def test_batch_off_day(self, client, db, sample_user):
+        today = date.today().isoformat()
+        habit_id = self._create(client, "Off")
+        client.post("/api/v1/off-days/", json={"local_date": today})
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": today,
+            "habit_ids": [habit_id],
+        })
+        assert resp.status_code == 409
+
+    @patch("app.services.capsule_service.random")
+    def test_batch_enrichment_reads_rewards_once(self, mock_random, client, db, engine, sample_user, sample_reward):
+        """Capsules for every habit in a batch resolve without per-capsule queries."""
+        mock_random.random.return_value = 0.10
+        mock_random.choices.return_value = ["common"]
+        mock_random.choice.side_effect = lambda rewards: rewards[0]
+        today = date.today().isoformat()
+        ids = [self._create(client, f"Loot {i}") for i in range(3)]
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            resp = client.post("/api/v1/habits/check-batch", json={
+                "local_date": today,
+                "habit_ids": ids,
+            })
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert resp.status_code == 200
+        capsules = [r["capsule"] for r in resp.json()["results"]]
+        assert all(c["reward_title"] == "Test Reward" for c in capsules)
+        reward_reads = [s for s in statements if "FROM rewards" in s]
+        pool_loads = [s for s in reward_reads if "rewards.title" in s]
+        assert len(pool_loads) == 1
+        # Besides the pool load, only the drawn reward's check per drop
+        assert len(reward_reads) == 1 + len(capsules)
+
+    def test_batch_empty_list(self, client):
+        resp = client.post("/api/v1/habits/check-batch", json={
+            "local_date": date.today().isoformat(),
+            "habit_ids": [],
+        })
+        assert resp.status_code == 422
+
+
 class TestTodayList:
     def test_today_list(self, client, db, sample_user):
         today = date.today().isoformat()
@@ -36,6 +36,16 @@ class TestOffDayList:
         assert resp.status_code == 200
         assert len(resp.json()) == 1
 
+    def test_list_off_days_month_edges(self, client):
+        for day in ("2026-02-28", "2026-03-01", "2026-03-31", "2026-04-01"):
+            client.post("/api/v1/off-days/", json={"local_date": day})
+        resp = client.get("/api/v1/off-days/?month=2026-03")
+        assert sorted(od["off_date"] for od in resp.json()) == ["2026-03-01", "2026-03-31"]
+
+    def test_list_off_days_invalid_month(self, client):
+        resp = client.get("/api/v1/off-days/?month=2026-13")
+        assert resp.status_code == 422
+
 
 class TestOffDayCancel:
     def test_cancel_off_day(self, client):
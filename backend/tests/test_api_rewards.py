@@ -63,3 +63,24 @@ class TestRewardDelete:
     def test_delete_nonexistent(self, client):
         resp = client.delete("/api/v1/rewards/00000000-0000-0000-0000-000000000000")
         assert resp.status_code == 404
+
+
+class TestRewardPoolInvalidation:
+    """Reward CRUD endpoints refresh the cached capsule reward pool."""
+
+    def test_create_update_delete_refresh_pool(self, client, db, sample_user):
+        from app.services.capsule_service import get_reward_pool
+
+        assert get_reward_pool(db, sample_user.id) == {}
+
+        rid = client.post("/api/v1/rewards/", json={"title": "Pooled", "rarity": "rare"}).json()["id"]
+        assert [r.title for r in get_reward_pool(db, sample_user.id)["rare"]] == ["Pooled"]
+
+        client.put(f"/api/v1/rewards/{rid}", json={"is_active": False})
+        assert get_reward_pool(db, sample_user.id) == {}
+
+        client.put(f"/api/v1/rewards/{rid}", json={"is_active": True, "rarity": "epic"})
+        assert set(get_reward_pool(db, sample_user.id)) == {"epic"}
+
+        client.delete(f"/api/v1/rewards/{rid}")
+        assert get_reward_pool(db, sample_user.id) == {}
@@ -0,0 +1,233 @@
+"""Tests for the HabitLog archive — monthly compaction and reads across both tiers."""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.base import Base
+from app.database.maintenance import (
+    MaintenanceScheduler,
+    MaintenanceTask,
+    archive_habit_logs,
+    default_tasks,
+)
+from app.database.session import create_db_engine
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.habit_log_archive import HabitLogArchive
+from app.models.user import User
+from app.services import archive_service
+from app.services.archive_service import (
+    archive_cutoff,
+    compact_habit_logs,
+    completed_days,
+    completed_on,
+    completion_totals,
+    is_archived_date,
+)
+
+
+@pytest.fixture()
+def habit(db, sample_user):
+    habit = Habit(
+        id=uuid.uuid4(),
+        user_id=sample_user.id,
+        title="Archived Training",
+        attribute="str",
+        importance="normal",
+        start_date="2020-01-01",
+    )
+    db.add(habit)
+    db.flush()
+    return habit
+
+
+def _log(db, habit, day, completed=True, xp=15):
+    db.add(HabitLog(
+        id=uuid.uuid4(),
+        user_id=habit.user_id,
+        habit_id=habit.id,
+        log_date=day,
+        completed=completed,
+        attribute_xp_awarded=xp if completed else 0,
+    ))
+    db.flush()
+
+
+class TestCutoff:
+    def test_rounds_down_to_month_start(self, monkeypatch):
+        monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 30)
+        assert archive_cutoff(date(2026, 3, 15)) == "2026-02-01"
+        assert archive_cutoff(date(2026, 3, 31)) == "2026-03-01"
+
+    def test_zero_disables(self, monkeypatch):
+        monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 0)
+        assert archive_cutoff() is None
+        assert not is_archived_date("1999-01-01")
+
+
+class TestCompaction:
+    def test_folds_month_into_bitmap(self, db, habit):
+        _log(db, habit, "2025-01-01", xp=15)
+        _log(db, habit, "2025-01-31", xp=30)
+        _log(db, habit, "2025-01-15", completed=False)
+        _log(db, habit, "2025-02-28", xp=22)
+        _log(db, habit, "2025-03-01", xp=15)
+
+        result = compact_habit_logs(db, cutoff="2025-03-01")
+        assert result == {"archived_logs": 3, "dropped_logs": 1, "months": 2}
+
+        archives = {
+            a.month_start: a
+            for a in db.scalars(select(HabitLogArchive).where(HabitLogArchive.habit_id == habit.id))
+        }
+        january = archives["2025-01-01"]
+        assert january.completed_mask == 1 | 1 << 30
+        assert (january.completions, january.xp_total) == (2, 45)
+        assert len(january.day_xp) == 31 * 4
+        assert archives["2025-02-01"].completions == 1
+
+        live = db.scalars(select(HabitLog.log_date).where(HabitLog.habit_id == habit.id)).all()
+        assert live == ["2025-03-01"]
+
+    def test_merge_is_idempotent(self, db, habit):
+        _log(db, habit, "2025-01-10", xp=15)
+        compact_habit_logs(db, cutoff="2025-02-01")
+        # A late log for an already archived month merges into its row
+        _log(db, habit, "2025-01-11", xp=22)
+        compact_habit_logs(db, cutoff="2025-02-01")
+        assert compact_habit_logs(db, cutoff="2025-02-01")["months"] == 0
+
+        (archive,) = db.scalars(select(HabitLogArchive).where(HabitLogArchive.habit_id == habit.id))
+        assert (archive.completions, archive.xp_total) == (2, 37)
+
+    def test_works_through_habits_in_chunks(self, db, sample_user, habit, monkeypatch):
+        monkeypatch.setattr(archive_service, "_COMPACT_HABITS", 1)
+        other = Habit(
+            id=uuid.uuid4(), user_id=sample_user.id, title="Other", attribute="vit",
+            start_date="2020-01-01",
+        )
+        db.add(other)
+        db.flush()
+        for h in (habit, other):
+            _log(db, h, "2025-01-10")
+            _log(db, h, "2025-01-11", completed=False)
+
+        result = compact_habit_logs(db, cutoff="2025-02-01")
+        assert result == {"archived_logs": 2, "dropped_logs": 2, "months": 2}
+        remaining = select(func.count(HabitLog.id)).where(HabitLog.user_id == sample_user.id)
+        assert db.scalar(remaining) == 0
+
+    def test_disabled_is_noop(self, db, habit, monkeypatch):
+        monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 0)
+        _log(db, habit, "2020-01-10")
+        assert compact_habit_logs(db)["archived_logs"] == 0
+
+
+def test_archiving_is_opt_in(monkeypatch):
+    assert settings.HABIT_LOG_ARCHIVE_DAYS == 0
+    assert "archive_habit_logs" not in {t.name for t in default_tasks()}
+    monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 400)
+    assert "archive_habit_logs" in {t.name for t in default_tasks()}
+
+
+def test_maintenance_task_commits(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 60)
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as session:
+        user = User(username="archivist")
+        session.add(user)
+        session.flush()
+        habit = Habit(user_id=user.id, title="Old", attribute="str", start_date="2020-01-01")
+        session.add(habit)
+        session.flush()
+        _log(session, habit, "2020-01-02")
+        session.commit()
+
+    task = MaintenanceTask("archive", archive_habit_logs, 60.0, transactional=True)
+    MaintenanceScheduler(eng, [task]).run_task("archive")
+    assert task.last_result == {"archived_logs": 1, "dropped_logs": 0, "months": 1}
+    with Session(eng) as session:
+        assert session.scalar(select(func.count(HabitLog.id))) == 0
+        assert session.scalar(select(func.count(HabitLogArchive.id))) == 1
+    eng.dispose()
+
+
+class TestReadsAcrossTiers:
+    @pytest.fixture()
+    def tiers(self, db, habit):
+        _log(db, habit, "2025-01-05", xp=15)
+        _log(db, habit, "2025-02-10", xp=30)
+        compact_habit_logs(db, cutoff="2025-03-01")
+        _log(db, habit, "2025-03-02", xp=22)
+        return habit
+
+    def test_completed_days(self, db, tiers):
+        assert completed_days(db, tiers.id) == {
+            "2025-01-05": 15,
+            "2025-02-10": 30,
+            "2025-03-02": 22,
+        }
+        assert completed_days(db, tiers.id, start="2025-01-06", end="2025-03-01") == {
+            "2025-02-10": 30
+        }
+
+    def test_totals(self, db, tiers):
+        assert completion_totals(db, tiers.id) == (3, 67)
+
+    def test_completed_on(self, db, tiers):
+        assert completed_on(db, [tiers.id], "2025-02-10") == {tiers.id: 30}
+        assert completed_on(db, [tiers.id], "2025-02-11") == {}
+        assert completed_on(db, [tiers.id], "2025-03-02") == {tiers.id: 22}
+
+
+class TestEndpoints:
+    @pytest.fixture()
+    def archived(self, db, habit, monkeypatch):
+        """One completion in the archive (~120 days ago) and one live (yesterday)."""
+        monkeypatch.setattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 60)
+        old = (date.today() - timedelta(days=120)).isoformat()
+        recent = (date.today() - timedelta(days=1)).isoformat()
+        _log(db, habit, old, xp=30)
+        _log(db, habit, recent, xp=15)
+        compact_habit_logs(db)
+        assert is_archived_date(old)
+        return habit, old, recent
+
+    def test_calendar_and_graph(self, client, archived):
+        habit, old, recent = archived
+        days = client.get(
+            f"/api/v1/habits/{habit.id}/calendar?start_date={old}&end_date={recent}"
+        ).json()
+        completed = {d["date"]: d["attribute_xp_awarded"] for d in days if d["completed"]}
+        assert completed == {old: 30, recent: 15}
+
+        graph = client.get(f"/api/v1/habits/{habit.id}/contribution-graph?days=365").json()
+        assert {d["date"] for d in graph if d["completed"]} == {old, recent}
+
+    def test_stats(self, client, archived):
+        habit, _, _ = archived
+        data = client.get(f"/api/v1/habits/{habit.id}/stats").json()
+        assert data["total_completions"] == 2
+        assert data["total_xp_earned"] == 45
+        assert data["completion_rate_7d"] == round(1 / 7, 4)
+
+    def test_day_detail(self, client, archived):
+        habit, old, _ = archived
+        data = client.get(f"/api/v1/habits/calendar/day-detail?date={old}").json()
+        (detail,) = [h for h in data["habits"] if h["id"] == str(habit.id)]
+        assert detail["completed"] is True
+        assert detail["attribute_xp_awarded"] == 30
+
+    def test_archived_dates_are_read_only(self, client, archived):
+        habit, old, _ = archived
+        body = {"local_date": old}
+        assert client.post(f"/api/v1/habits/{habit.id}/check", json=body).status_code == 409
+        batch = {"local_date": old, "habit_ids": [str(habit.id)]}
+        assert client.post("/api/v1/habits/check-batch", json=batch).status_code == 409
+        assert client.post("/api/v1/off-days/", json=body).status_code == 409
@@ -0,0 +1,184 @@
+"""Tests for the optional async read endpoints — same responses as the sync routes,
+real awaited queries, read-only engine."""
+
+import asyncio
+import inspect
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.deps import get_current_user, get_db, get_read_db  # noqa: E402
+from app.api.v1 import async_reads  # noqa: E402
+from app.database.async_session import (  # noqa: E402
+    create_async_db_engine,
+    get_async_db,
+    to_async_url,
+)
+from app.database.base import Base  # noqa: E402
+from app.models.habit import Habit  # noqa: E402
+from app.models.off_day import OffDay  # noqa: E402
+from app.models.quote import Quote  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.habit_service import check_habit  # noqa: E402
+from app.services.quote_catalog import invalidate_quote_catalog  # noqa: E402
+
+import app.models  # noqa: E402, F401
+
+TODAY = date.today().isoformat()
+# Far enough out for a savage roast and a broken habit streak
+LATER = (date.today() + timedelta(days=10)).isoformat()
+
+READ_PATHS = [
+    "/api/v1/analytics/summary?period=month",
+    "/api/v1/analytics/summary?period=all",
+    "/api/v1/analytics/capsule-history",
+    "/api/v1/analytics/wish-history",
+    "/api/v1/analytics/off-day-summary",
+    "/api/v1/analytics/completion-trend",
+    f"/api/v1/habits/today/list?local_date={TODAY}",
+    f"/api/v1/habits/today/list?local_date={LATER}",
+    f"/api/v1/habits/calendar/all?month={TODAY[:7]}",
+    "/api/v1/habits/calendar/all?month=2026-01",
+    f"/api/v1/status/?local_date={TODAY}",
+    f"/api/v1/status/?local_date={LATER}",
+    "/api/v1/power/current",
+    "/api/v1/attributes/",
+]
+
+
+@pytest.fixture()
+def database_url(tmp_path):
+    """File database with one user who completed a habit today.
+
+    One quote per welcome/roast slot, so status picks are deterministic.
+    """
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    eng = create_engine(url)
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as session:
+        user = User(username="goku")
+        session.add(user)
+        session.flush()
+        habit = Habit(user_id=user.id, title="Train", attribute="str", start_date="2026-01-01")
+        session.add_all([
+            habit,
+            OffDay(user_id=user.id, off_date="2026-01-02", reason="rest"),
+            Quote(character="goku", quote_text="Welcome back!", source_saga="Saiyan",
+                  trigger_event="welcome_back"),
+            Quote(character="vegeta", quote_text="Pathetic.", source_saga="Saiyan",
+                  trigger_event="roast", severity="savage"),
+        ])
+        session.flush()
+        check_habit(session, user.id, habit.id, TODAY)
+        session.commit()
+    eng.dispose()
+    return url
+
+
+@pytest.fixture()
+def sync_client(database_url):
+    from app.api.router import api_router
+
+    eng = create_engine(database_url)
+    sync_app = FastAPI()
+    sync_app.include_router(api_router)
+
+    def override_get_db():
+        with Session(eng) as session:
+            yield session
+
+    def override_get_current_user():
+        with Session(eng, expire_on_commit=False) as session:
+            return session.query(User).first()
+
+    sync_app.dependency_overrides[get_db] = override_get_db
+    sync_app.dependency_overrides[get_read_db] = override_get_db
+    sync_app.dependency_overrides[get_current_user] = override_get_current_user
+    with TestClient(sync_app) as c:
+        yield c
+    eng.dispose()
+
+
+@pytest.fixture()
+def async_client(database_url):
+    eng = create_async_db_engine(database_url)
+    async_app = FastAPI()
+    api_router = APIRouter(prefix="/api/v1")
+    api_router.include_router(async_reads.router)
+    async_app.include_router(api_router)
+
+    async def override_get_async_db():
+        async with AsyncSession(eng, expire_on_commit=False) as session:
+            yield session
+
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(async_app) as c:
+        yield c
+
+
+def test_routes_are_coroutines():
+    for route in async_reads.router.routes:
+        assert inspect.iscoroutinefunction(route.endpoint), route.path
+
+
+@pytest.mark.parametrize("path", READ_PATHS)
+def test_matches_sync_route(sync_client, async_client, path):
+    expected = sync_client.get(path)
+    actual = async_client.get(path)
+    assert actual.status_code == expected.status_code == 200
+    assert actual.json() == expected.json()
+
+
+def test_validation_still_applies(async_client):
+    assert async_client.get("/api/v1/analytics/summary?period=year").status_code == 422
+    assert async_client.get("/api/v1/habits/calendar/all?month=2026-13").status_code == 422
+    assert async_client.get("/api/v1/status/?local_date=soon").status_code == 422
+
+
+def test_status_loads_quote_catalog(async_client):
+    invalidate_quote_catalog()
+    data = async_client.get(f"/api/v1/status/?local_date={LATER}").json()
+    assert data["welcome_back"]["quote_text"] == "Welcome back!"
+    assert data["roast"]["severity"] == "savage"
+    assert [b["habit_title"] for b in data["streak_breaks"]] == ["Train"]
+
+
+def test_routes_never_run_sync_code(monkeypatch, async_client):
+    """Queries are awaited directly, not wrapped in AsyncSession.run_sync()."""
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("run_sync used")
+
+    monkeypatch.setattr(AsyncSession, "run_sync", _fail)
+    for path in READ_PATHS:
+        assert async_client.get(path).status_code == 200, path
+
+
+def test_engine_is_read_only(database_url):
+    async def _write():
+        eng = create_async_db_engine(database_url)
+        try:
+            async with eng.connect() as conn:
+                await conn.execute(text("INSERT INTO users (id, username) VALUES ('x', 'y')"))
+        finally:
+            await eng.dispose()
+
+    with pytest.raises(OperationalError, match="readonly|read-only|query_only"):
+        asyncio.run(_write())
+
+
+def test_async_url():
+    assert to_async_url("sqlite:///saiyan_tracker.db") == "sqlite+aiosqlite:///saiyan_tracker.db"
+    assert to_async_url("postgresql://u:p@db/saiyan") == "postgresql+asyncpg://u:p@db/saiyan"
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@db/saiyan")
@@ -0,0 +1,126 @@
+"""Tests for online SQLite backups — snapshots, compression, retention, CLI, admin."""
+
+import gzip
+import sqlite3
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import backup
+from app.database.backup import backup_database, prune_backups, sqlite_path
+from app.database.base import Base
+from app.database.session import create_db_engine
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+@pytest.fixture()
+def live_db(tmp_path):
+    """A WAL-mode database with committed rows still sitting in the WAL."""
+    path = tmp_path / "live.db"
+    eng = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as session:
+        session.add_all([User(username=f"saiyan-{i}") for i in range(200)])
+        session.commit()
+    yield path, eng
+    eng.dispose()
+
+
+def _user_count(path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_snapshot_excludes_uncommitted_writes(live_db, tmp_path):
+    path, eng = live_db
+    with eng.connect() as writer:
+        writer.execute(text("DELETE FROM users"))
+        result = backup_database(path, tmp_path / "backups", compress=False, pages=4)
+        writer.rollback()
+
+    assert result.path.suffix == ".db"
+    assert result.pages > 0
+    assert _user_count(result.path) == 200
+    conn = sqlite3.connect(result.path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        conn.close()
+    assert not list((tmp_path / "backups").glob("*.partial"))
+
+
+def test_gzip_backup_restores(live_db, tmp_path):
+    path, _ = live_db
+    result = backup_database(path, tmp_path / "backups", compress=True)
+    assert result.path.name.endswith(".db.gz")
+
+    restored = tmp_path / "restored.db"
+    restored.write_bytes(gzip.decompress(result.path.read_bytes()))
+    assert _user_count(restored) == 200
+
+
+def test_retention_keeps_newest(live_db, tmp_path):
+    path, _ = live_db
+    dest = tmp_path / "backups"
+    made = [backup_database(path, dest, compress=False, keep=2).path for _ in range(4)]
+    assert sorted(dest.iterdir()) == made[-2:]
+
+
+def test_prune_ignores_other_files(tmp_path):
+    for name in ["live-1.db", "live-2.db.gz", "live-3.db", "other-1.db", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+    removed = prune_backups(tmp_path, "live", keep=1)
+    assert [p.name for p in removed] == ["live-1.db", "live-2.db.gz"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["live-3.db", "notes.txt", "other-1.db"]
+
+
+def test_sqlite_path():
+    assert sqlite_path("sqlite:////var/lib/saiyan/app.db").name == "app.db"
+    for url in ["sqlite://", "sqlite:///:memory:", "postgresql+psycopg://u:p@db/saiyan"]:
+        with pytest.raises(ValueError):
+            sqlite_path(url)
+
+
+def test_cli(live_db, tmp_path, monkeypatch, capsys):
+    path, _ = live_db
+    dest = tmp_path / "cli"
+    argv = ["backup", "--database", str(path), "--dest", str(dest), "--no-gzip", "--keep", "0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    backup.main()
+    (made,) = dest.iterdir()
+    assert _user_count(made) == 200
+    assert "Backed up" in capsys.readouterr().out
+
+
+class TestAdminEndpoint:
+    @pytest.fixture()
+    def configured(self, live_db, tmp_path, monkeypatch):
+        path, _ = live_db
+        monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{path}")
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "admin"))
+        monkeypatch.setattr(settings, "BACKUP_KEEP", 2)
+
+    def test_create_and_list(self, admin_client, configured):
+        for _ in range(3):
+            resp = admin_client.post("/api/v1/admin/backup")
+            assert resp.status_code == 201
+        data = resp.json()
+        assert data["path"].endswith(".db.gz")
+        assert data["pages"] > 0
+        assert len(data["removed"]) == 1
+
+        listed = admin_client.get("/api/v1/admin/backups").json()
+        assert len(listed) == 2
+        assert listed[0]["name"] == data["path"].rsplit("/", 1)[-1]
+
+    def test_rejects_non_sqlite(self, admin_client, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+psycopg://u:p@db/saiyan")
+        assert admin_client.post("/api/v1/admin/backup").status_code == 409
@@ -4,9 +4,17 @@ import uuid
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event
 
 from app.models.reward import Reward
-from app.services.capsule_service import roll_capsule_drop, select_rarity_tier
+from app.services.capsule_service import (
+    get_reward_pool,
+    invalidate_reward_pool,
+    lookup_rewards,
+    reward_pool_stats,
+    roll_capsule_drop,
+    select_rarity_tier,
+)
 
 
 class TestSelectRarityTier:
@@ -96,3 +104,157 @@ class TestRollCapsuleDrop:
         result = roll_capsule_drop(db, sample_user.id, sample_habit.id)
         assert result is not None
         assert result.reward_id == rare_reward.id
+
+
+class TestRewardPool:
+    """get_reward_pool caches active rewards per user, bucketed by rarity."""
+
+    def test_buckets_active_rewards_by_rarity(self, db, sample_user, sample_reward):
+        db.add_all([
+            Reward(id=uuid.uuid4(), user_id=sample_user.id, title="Epic", rarity="epic"),
+            Reward(id=uuid.uuid4(), user_id=sample_user.id, title="Off", rarity="rare", is_active=False),
+        ])
+        db.flush()
+        pool = get_reward_pool(db, sample_user.id)
+        assert set(pool) == {"common", "epic"}
+        assert [r.id for r in pool["common"]] == [sample_reward.id]
+        assert pool["epic"][0].title == "Epic"
+
+    def test_counts_hits_and_misses(self, db, sample_user, sample_reward):
+        get_reward_pool(db, sample_user.id)
+        get_reward_pool(db, sample_user.id)
+        get_reward_pool(db, sample_user.id)
+        stats = reward_pool_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["size"] == 1
+
+    @patch("app.services.capsule_service.random")
+    def test_cached_roll_only_checks_drawn_reward(self, mock_random, engine, db, sample_user, sample_habit, sample_reward):
+        mock_random.random.return_value = 0.10
+        mock_random.choices.return_value = ["common"]
+        mock_random.choice.side_effect = lambda rewards: rewards[0]
+        get_reward_pool(db, sample_user.id)
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            result = roll_capsule_drop(db, sample_user.id, sample_habit.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT REWARDS.ID")
+        assert result.reward_id == sample_reward.id
+
+    @pytest.mark.parametrize("deleted", [True, False])
+    @patch("app.services.capsule_service.random")
+    def test_reward_removed_by_another_worker(self, mock_random, db, sample_user, sample_habit, sample_reward, deleted):
+        """A pool cached before another process removed the drawn reward is reloaded."""
+        mock_random.random.return_value = 0.10
+        mock_random.choices.return_value = ["common"]
+        mock_random.choice.side_effect = lambda rewards: rewards[0]
+        get_reward_pool(db, sample_user.id)
+
+        # Core statements skip this process's invalidation, like another worker's commit
+        replacement = uuid.uuid4()
+        db.execute(Reward.__table__.insert().values(
+            id=replacement, user_id=sample_user.id, title="New", rarity="common",
+        ))
+        if deleted:
+            db.execute(Reward.__table__.delete().where(Reward.id == sample_reward.id))
+        else:
+            db.execute(Reward.__table__.update().where(Reward.id == sample_reward.id).values(is_active=False))
+
+        result = roll_capsule_drop(db, sample_user.id, sample_habit.id)
+        assert result.reward_id == replacement
+        assert [r.id for r in get_reward_pool(db, sample_user.id)["common"]] == [replacement]
+
+    @patch("app.services.capsule_service.random")
+    def test_no_drop_when_every_reward_is_gone(self, mock_random, db, sample_user, sample_habit, sample_reward):
+        mock_random.random.return_value = 0.10
+        mock_random.choices.return_value = ["common"]
+        mock_random.choice.side_effect = lambda rewards: rewards[0]
+        get_reward_pool(db, sample_user.id)
+        db.execute(Reward.__table__.delete().where(Reward.id == sample_reward.id))
+        assert roll_capsule_drop(db, sample_user.id, sample_habit.id) is None
+
+    def test_invalidate_reloads_pool(self, db, sample_user, sample_reward):
+        assert "rare" not in get_reward_pool(db, sample_user.id)
+        db.add(Reward(id=uuid.uuid4(), user_id=sample_user.id, title="Rare", rarity="rare"))
+        db.flush()
+        assert "rare" not in get_reward_pool(db, sample_user.id)  # still cached
+        invalidate_reward_pool(sample_user.id)
+        assert "rare" in get_reward_pool(db, sample_user.id)
+
+    @pytest.mark.parametrize("everyone", [False, True])
+    def test_invalidation_during_load_is_not_overwritten(self, db, sample_user, sample_reward, everyone):
+        """A reward change landing between the pool's read and its store must win."""
+        invalidated = []
+
+        def _invalidate_mid_load(orm_execute_state):
+            if not invalidated:
+                invalidated.append(True)
+                invalidate_reward_pool(None if everyone else sample_user.id)
+
+        event.listen(db, "do_orm_execute", _invalidate_mid_load)
+        try:
+            stale = get_reward_pool(db, sample_user.id)
+        finally:
+            event.remove(db, "do_orm_execute", _invalidate_mid_load)
+        assert invalidated
+        assert reward_pool_stats()["size"] == 0  # the stale pool was not cached
+
+        sample_reward.is_active = False
+        db.flush()
+        assert [r.id for r in stale["common"]] == [sample_reward.id]
+        assert get_reward_pool(db, sample_user.id) == {}
+
+
+class TestLookupRewards:
+    """lookup_rewards resolves ids from the pool and batches the misses."""
+
+    def test_cached_ids_need_no_query(self, engine, db, sample_user, sample_reward):
+        get_reward_pool(db, sample_user.id)
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            found = lookup_rewards(db, sample_user.id, {sample_reward.id})
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert statements == []
+        assert found[sample_reward.id].title == sample_reward.title
+
+    def test_misses_fetched_in_one_query(self, engine, db, sample_user, sample_reward):
+        inactive = [
+            Reward(id=uuid.uuid4(), user_id=sample_user.id, title=f"Old {i}", is_active=False)
+            for i in range(2)
+        ]
+        db.add_all(inactive)
+        db.flush()
+        get_reward_pool(db, sample_user.id)
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            found = lookup_rewards(
+                db, sample_user.id, {sample_reward.id, *(r.id for r in inactive)}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert len(statements) == 1
+        assert set(found) == {sample_reward.id, *(r.id for r in inactive)}
+
+    def test_empty(self, db, sample_user):
+        assert lookup_rewards(db, sample_user.id, set()) == {}
@@ -0,0 +1,121 @@
+"""Tests for CompactUuid storage — hex text by default, 16-byte BLOB when opted in."""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.database.base import Base
+from app.database.migrations import migrate_column_storage, run_migrations
+from app.database.types import use_binary_uuids
+from app.models.habit import Habit
+from app.models.habit_log import HabitLog
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+def _file_engine(path, binary: bool):
+    eng = create_engine(f"sqlite:///{path}")
+    if binary:
+        use_binary_uuids(eng)
+
+    @event.listens_for(eng, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return eng
+
+
+def _seed(eng) -> tuple[uuid.UUID, uuid.UUID]:
+    with Session(eng) as session:
+        user = User(username="kakarot")
+        session.add(user)
+        session.flush()
+        habit = Habit(user_id=user.id, title="Train", attribute="str", start_date="2026-01-01")
+        session.add(habit)
+        session.flush()
+        session.add(HabitLog(user_id=user.id, habit_id=habit.id, log_date="2026-03-04", completed=True))
+        session.commit()
+        return user.id, habit.id
+
+
+def _assert_readable(eng, user_id, habit_id):
+    with Session(eng) as session:
+        habit = session.get(Habit, habit_id)
+        assert habit.user_id == user_id
+        log = session.query(HabitLog).filter(HabitLog.habit_id == habit_id).one()
+        assert (log.user_id, log.habit_id) == (user_id, habit_id)
+        assert isinstance(log.id, uuid.UUID)
+
+
+class TestStorage:
+    def test_text_by_default(self, tmp_path):
+        eng = _file_engine(tmp_path / "text.db", binary=False)
+        Base.metadata.create_all(bind=eng)
+        user_id, habit_id = _seed(eng)
+        with eng.connect() as conn:
+            stored = conn.execute(text("SELECT typeof(id), id FROM users")).one()
+        assert stored == ("text", user_id.hex)
+        _assert_readable(eng, user_id, habit_id)
+
+    def test_binary_round_trip(self, tmp_path):
+        eng = _file_engine(tmp_path / "blob.db", binary=True)
+        Base.metadata.create_all(bind=eng)
+        user_id, habit_id = _seed(eng)
+        with eng.connect() as conn:
+            stored = conn.execute(text("SELECT typeof(user_id), user_id FROM habit_logs")).one()
+        assert stored == ("blob", user_id.bytes)
+        _assert_readable(eng, user_id, habit_id)
+        # Filtering with an IN list binds bytes too
+        with Session(eng) as session:
+            assert session.query(Habit.id).filter(Habit.id.in_([habit_id])).scalar() == habit_id
+
+
+class TestMigration:
+    def test_text_to_blob_and_back(self, tmp_path):
+        path = tmp_path / "switch.db"
+        text_engine = _file_engine(path, binary=False)
+        Base.metadata.create_all(bind=text_engine)
+        user_id, habit_id = _seed(text_engine)
+        text_engine.dispose()
+
+        blob_engine = _file_engine(path, binary=True)
+        run_migrations(blob_engine)
+        id_column = next(c for c in inspect(blob_engine).get_columns("users") if c["name"] == "id")
+        assert str(id_column["type"]) == "BLOB"
+        with blob_engine.connect() as conn:
+            assert conn.execute(text("SELECT DISTINCT typeof(habit_id) FROM habit_logs")).scalar() == "blob"
+            assert conn.execute(text("PRAGMA foreign_key_check")).all() == []
+        _assert_readable(blob_engine, user_id, habit_id)
+        assert migrate_column_storage(blob_engine) == []
+        blob_engine.dispose()
+
+        text_engine = _file_engine(path, binary=False)
+        run_migrations(text_engine)
+        with text_engine.connect() as conn:
+            assert conn.execute(text("SELECT id FROM users")).scalar() == user_id.hex
+        _assert_readable(text_engine, user_id, habit_id)
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_nullable_uuid_survives(self, tmp_path, binary):
+        """NULL foreign keys stay NULL through a conversion."""
+        path = tmp_path / "nullable.db"
+        eng = _file_engine(path, binary=not binary)
+        Base.metadata.create_all(bind=eng)
+        user_id, _ = _seed(eng)
+        with Session(eng) as session:
+            session.add(Habit(user_id=user_id, title="Loose", attribute="ki", start_date="2026-01-01"))
+            session.commit()
+        eng.dispose()
+
+        eng = _file_engine(path, binary=binary)
+        run_migrations(eng)
+        with Session(eng) as session:
+            habit = session.query(Habit).filter(Habit.title == "Loose").one()
+            assert habit.category_id is None
+            assert habit.user_id == user_id
@@ -11,8 +11,11 @@ class TestSettings:
     def _make_settings(self, monkeypatch, env_overrides: dict | None = None):
         """Create a fresh Settings instance with optional env var overrides."""
         # Clear any cached settings by removing env vars that might interfere
-        for key in ("APP_TITLE", "DATABASE_URL", "CORS_ORIGINS"):
+        for key in ("APP_TITLE", "DATABASE_URL", "CORS_ORIGINS", "SQLITE_PROFILE"):
             monkeypatch.delenv(key, raising=False)
+        for key in list(os.environ):
+            if key.startswith(("SQLITE_", "DB_")):
+                monkeypatch.delenv(key)
 
         # Apply overrides
         if env_overrides:
@@ -63,3 +66,53 @@ class TestSettings:
         """APP_TITLE defaults to 'Saiyan Tracker'."""
         settings = self._make_settings(monkeypatch)
         assert settings.APP_TITLE == "Saiyan Tracker"
+
+    def test_sqlite_profile_default_balanced(self, monkeypatch):
+        """SQLITE_PROFILE defaults to balanced (synchronous=NORMAL under WAL)."""
+        settings = self._make_settings(monkeypatch)
+        assert settings.SQLITE_PROFILE == "balanced"
+        assert settings.sqlite_pragmas["synchronous"] == "NORMAL"
+
+    def test_sqlite_profile_preset(self, monkeypatch):
+        """SQLITE_PROFILE selects a preset."""
+        from app.core.config import SQLITE_PROFILES
+
+        settings = self._make_settings(monkeypatch, {"SQLITE_PROFILE": "durable"})
+        assert settings.sqlite_pragmas == SQLITE_PROFILES["durable"]
+
+    def test_sqlite_pragma_overrides(self, monkeypatch):
+        """Individual SQLITE_* values override the preset."""
+        settings = self._make_settings(
+            monkeypatch,
+            {"SQLITE_PROFILE": "fast", "SQLITE_SYNCHRONOUS": "NORMAL", "SQLITE_CACHE_SIZE": "-32000"},
+        )
+        pragmas = settings.sqlite_pragmas
+        assert pragmas["synchronous"] == "NORMAL"
+        assert pragmas["cache_size"] == -32000
+        assert pragmas["temp_store"] == "MEMORY"
+
+    def test_sqlite_profile_invalid(self, monkeypatch):
+        """Unknown profiles are rejected at startup."""
+        from pydantic import ValidationError
+
+        with pytest.raises(ValidationError):
+            self._make_settings(monkeypatch, {"SQLITE_PROFILE": "reckless"})
+
+    def test_database_backend(self, monkeypatch):
+        """database_backend names the dialect of DATABASE_URL."""
+        assert self._make_settings(monkeypatch).database_backend == "sqlite"
+        settings = self._make_settings(
+            monkeypatch, {"DATABASE_URL": "postgresql+psycopg://saiyan:pw@localhost/saiyan"}
+        )
+        assert settings.database_backend == "postgresql"
+
+    def test_pool_options(self, monkeypatch):
+        """DB_* settings feed create_engine pool arguments."""
+        settings = self._make_settings(
+            monkeypatch, {"DB_POOL_SIZE": "20", "DB_POOL_PRE_PING": "false"}
+        )
+        options = settings.pool_options()
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 10
+        assert options["pool_pre_ping"] is False
+        assert settings.pool_options(pool_size=3)["pool_size"] == 3
@@ -0,0 +1,89 @@
+"""Tests for date helpers and the DayNumber column type."""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.core.dates import from_day_number, month_bounds, month_start, to_day_number, week_start
+from app.database.types import DayNumber
+from app.models.habit_log import HabitLog
+
+
+class TestDayNumbers:
+    def test_epoch_is_zero(self):
+        assert to_day_number("1970-01-01") == 0
+
+    def test_round_trip(self):
+        for iso in ("2026-01-01", "2026-02-28", "2024-02-29", "1999-12-31"):
+            assert from_day_number(to_day_number(iso)) == iso
+
+    def test_gap_is_subtraction(self):
+        assert to_day_number("2026-03-01") - to_day_number("2026-02-27") == 2
+
+
+class TestMonthBounds:
+    @pytest.mark.parametrize("month,expected", [
+        ("2026-01", ("2026-01-01", "2026-01-31")),
+        ("2026-02", ("2026-02-01", "2026-02-28")),
+        ("2024-02", ("2024-02-01", "2024-02-29")),
+        ("2026-12", ("2026-12-01", "2026-12-31")),
+    ])
+    def test_bounds(self, month, expected):
+        assert month_bounds(month) == expected
+
+
+class TestPeriodStarts:
+    @pytest.mark.parametrize("day,week,month", [
+        ("2026-03-04", "2026-03-02", "2026-03-01"),  # Wednesday
+        ("2026-03-02", "2026-03-02", "2026-03-01"),  # Monday
+        ("2026-03-01", "2026-02-23", "2026-03-01"),  # Sunday, week starts in February
+        ("2027-01-01", "2026-12-28", "2027-01-01"),
+    ])
+    def test_starts(self, day, week, month):
+        assert week_start(day) == week
+        assert month_start(day) == month
+
+
+class TestDayNumberType:
+    def test_bind_accepts_iso_and_int(self):
+        column_type = DayNumber()
+        assert column_type.process_bind_param("2026-03-04", None) == 20516
+        assert column_type.process_bind_param(20516, None) == 20516
+        assert column_type.process_bind_param(None, None) is None
+        with pytest.raises(TypeError):
+            column_type.process_bind_param(3.5, None)
+
+    @pytest.mark.sqlite_only  # typeof() and hex UUID parameters
+    def test_stored_as_integer_read_as_iso(self, db, sample_user, sample_habit):
+        log = HabitLog(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            habit_id=sample_habit.id,
+            log_date="2026-03-04",
+        )
+        db.add(log)
+        db.flush()
+        raw = db.execute(
+            text("SELECT log_date, typeof(log_date) FROM habit_logs WHERE id = :id"),
+            {"id": log.id.hex},
+        ).one()
+        assert tuple(raw) == (20516, "integer")
+
+        db.expire(log)
+        assert log.log_date == "2026-03-04"
+
+    def test_range_filter_uses_integers(self, db, sample_user, sample_habit):
+        for day in ("2026-02-28", "2026-03-01", "2026-03-31", "2026-04-01"):
+            db.add(HabitLog(
+                id=uuid.uuid4(), user_id=sample_user.id,
+                habit_id=sample_habit.id, log_date=day,
+            ))
+        db.flush()
+        dates = [
+            row.log_date
+            for row in db.query(HabitLog.log_date)
+            .filter(HabitLog.log_date.between(*month_bounds("2026-03")))
+            .order_by(HabitLog.log_date)
+        ]
+        assert dates == ["2026-03-01", "2026-03-31"]
@@ -0,0 +1,127 @@
+"""Tests for game_state — check-time unit of work loading and reuse."""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import NoResultFound
+
+from app.models.daily_log import DailyLog
+from app.models.habit_log import HabitLog
+from app.models.habit_streak import HabitStreak
+from app.models.off_day import OffDay
+from app.models.streak import Streak
+from app.services.game_state import load_game_state
+from app.services.habit_service import check_habit
+
+
+@pytest.fixture()
+def count_statements(engine):
+    """Collect every SQL statement executed while the fixture is active."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+class TestLoadGameState:
+    def test_empty_day(self, db, sample_user, sample_habit):
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        assert state.user is sample_user
+        assert state.streak is None
+        assert state.daily_log is None
+        assert state.is_off_day is False
+        assert state.habits == {sample_habit.id: sample_habit}
+        assert state.habit_logs == {}
+        assert state.habit_streaks == {}
+
+    def test_loads_existing_rows(self, db, sample_user, sample_habit):
+        streak = Streak(id=uuid.uuid4(), user_id=sample_user.id)
+        daily_log = DailyLog(id=uuid.uuid4(), user_id=sample_user.id, log_date="2026-03-04")
+        habit_log = HabitLog(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            habit_id=sample_habit.id,
+            log_date="2026-03-04",
+            completed=True,
+        )
+        habit_streak = HabitStreak(id=uuid.uuid4(), user_id=sample_user.id, habit_id=sample_habit.id)
+        db.add_all([streak, daily_log, habit_log, habit_streak])
+        db.flush()
+
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        assert state.streak is streak
+        assert state.daily_log is daily_log
+        assert state.habit_logs[sample_habit.id] is habit_log
+        assert state.habit_streaks[sample_habit.id] is habit_streak
+
+    def test_other_dates_not_loaded(self, db, sample_user, sample_habit):
+        db.add(DailyLog(id=uuid.uuid4(), user_id=sample_user.id, log_date="2026-03-03"))
+        db.add(
+            HabitLog(
+                id=uuid.uuid4(),
+                user_id=sample_user.id,
+                habit_id=sample_habit.id,
+                log_date="2026-03-03",
+                completed=True,
+            )
+        )
+        db.flush()
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        assert state.daily_log is None
+        assert state.habit_logs == {}
+
+    def test_off_day_flag(self, db, sample_user):
+        db.add(OffDay(id=uuid.uuid4(), user_id=sample_user.id, off_date="2026-03-04", reason="rest"))
+        db.flush()
+        assert load_game_state(db, sample_user.id, "2026-03-04", []).is_off_day is True
+
+    def test_foreign_habit_not_loaded(self, db, sample_user, sample_habit):
+        state = load_game_state(db, sample_user.id, "2026-03-04", [uuid.uuid4()])
+        assert state.habits == {}
+
+    def test_missing_user_raises(self, db):
+        with pytest.raises(NoResultFound):
+            load_game_state(db, uuid.uuid4(), "2026-03-04", [])
+
+    def test_get_or_create_reuses_state(self, db, sample_user, sample_habit):
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        streak = state.get_or_create_streak(db)
+        assert state.get_or_create_streak(db) is streak
+        hs = state.get_or_create_habit_streak(db, sample_habit.id)
+        assert state.get_or_create_habit_streak(db, sample_habit.id) is hs
+
+
+class TestCheckHabitWithState:
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_second_check_issues_no_lookups(self, mock_capsule, db, sample_user, sample_habit, count_statements):
+        check_habit(db, sample_user.id, sample_habit.id, "2026-03-04")
+        db.flush()
+
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        count_statements.clear()
+        check_habit(db, sample_user.id, sample_habit.id, "2026-03-04", state=state)
+        db.flush()
+
+        selects = [s for s in count_statements if s.lstrip().upper().startswith("SELECT")]
+        assert selects == []
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_first_check_creates_rows_in_state(self, mock_capsule, db, sample_user, sample_habit):
+        state = load_game_state(db, sample_user.id, "2026-03-04", [sample_habit.id])
+        result = check_habit(db, sample_user.id, sample_habit.id, "2026-03-04", state=state)
+        assert result["is_checking"] is True
+        assert state.daily_log is not None
+        assert state.streak is not None
+        assert state.habit_logs[sample_habit.id].completed is True
+        assert state.habit_streaks[sample_habit.id].current_streak == 1
+
+    def test_habit_missing_from_state_raises(self, db, sample_user, sample_habit):
+        state = load_game_state(db, sample_user.id, "2026-03-04", [])
+        with pytest.raises(NoResultFound):
+            check_habit(db, sample_user.id, sample_habit.id, "2026-03-04", state=state)
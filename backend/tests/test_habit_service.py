@@ -6,12 +6,19 @@ from unittest.mock import patch
 
 import pytest
 
+from app.models.achievement import Achievement
 from app.models.daily_log import DailyLog
 from app.models.habit import Habit
 from app.models.habit_log import HabitLog
 from app.models.off_day import OffDay
 from app.models.streak import Streak
-from app.services.habit_service import check_habit, get_habits_due_on_date
+from app.services.habit_service import (
+    check_habit,
+    check_habits_batch,
+    get_habits_due_on_date,
+    is_habit_due,
+)
+from app.services.streak_service import update_overall_streak
 
 
 # ── Fixtures ───────────────────────────────────────────────────────────────
@@ -162,6 +169,29 @@ class TestGetHabitsDueOnDate:
         habits = get_habits_due_on_date(db, sample_user.id, "2026-03-04")
         assert ended_habit not in habits
 
+    def test_includes_habit_on_its_end_date(self, db, sample_user, ended_habit):
+        habits = get_habits_due_on_date(db, sample_user.id, "2025-12-31")
+        assert ended_habit in habits
+
+    def test_schedule_change_updates_mask(self, db, sample_user, custom_habit):
+        # 2026-03-05 is Thursday = isoweekday 4
+        custom_habit.custom_days = [4]
+        db.flush()
+        assert custom_habit.schedule_mask == 0b0001000
+        habits = get_habits_due_on_date(db, sample_user.id, "2026-03-05")
+        assert custom_habit in habits
+
+
+class TestIsHabitDue:
+    def test_matches_sql_resolution(self, db, sample_user, daily_habit, weekday_habit,
+                                    custom_habit, future_habit, ended_habit):
+        all_habits = [daily_habit, weekday_habit, custom_habit, future_habit, ended_habit]
+        for day in range(1, 15):
+            local_date = f"2026-03-{day:02d}"
+            due = get_habits_due_on_date(db, sample_user.id, local_date)
+            expected = [h for h in all_habits if is_habit_due(h, local_date)]
+            assert set(h.id for h in due) == set(h.id for h in expected)
+
 
 # ── check_habit: checking ──────────────────────────────────────────────────
 
@@ -200,6 +230,17 @@ class TestCheckHabitChecking:
         result = check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
         assert sample_user.power_level > 0
 
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_power_level_matches_daily_xp_sum(self, mock_capsule, db, sample_user, daily_habit):
+        from app.services.power_service import recalculate_power_level
+
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-03")
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")  # uncheck
+        incremental = sample_user.power_level
+        db.flush()
+        assert recalculate_power_level(db, sample_user) == incremental
+
     @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
     def test_increments_overall_streak(self, mock_capsule, db, sample_user, daily_habit):
         result = check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
@@ -340,3 +381,148 @@ class TestCheckHabitZenkai:
         result = check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
         assert result["zenkai_activated"] is True
         assert result["daily_log"]["zenkai_bonus_applied"] is True
+
+
+# ── check_habit: achievements ─────────────────────────────────────────────
+
+
+class TestCheckHabitAchievements:
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_milestones_recorded_once(self, mock_capsule, db, sample_user, daily_habit):
+        for day in ("2026-03-02", "2026-03-03", "2026-03-04"):
+            result = check_habit(db, sample_user.id, daily_habit.id, day)
+        assert {e["scope"] for e in result["events"] if e["type"] == "streak_milestone"} == {"overall", "habit"}
+
+        # Uncheck and re-check the milestone day: events repeat, rows do not
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        keys = [
+            a.achievement_key
+            for a in db.query(Achievement).filter(Achievement.achievement_type == "streak_milestone")
+        ]
+        assert sorted(keys) == sorted(["overall_streak_3", f"habit_{daily_habit.id}_streak_3"])
+
+
+# ── check_habit: incremental DailyLog counters ───────────────────────────
+
+
+class TestCheckHabitIncrementalDailyLog:
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_second_check_skips_recount(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        with patch("app.services.habit_service.recount_daily_log") as mock_recount:
+            result = check_habit(db, sample_user.id, weekday_habit.id, "2026-03-04")
+            assert mock_recount.call_count == 0
+        assert result["daily_log"]["habits_due"] == 2
+        assert result["daily_log"]["habits_completed"] == 2
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_uncheck_decrements_completed(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        check_habit(db, sample_user.id, weekday_habit.id, "2026-03-04")
+        result = check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        assert result["daily_log"]["habits_completed"] == 1
+        assert result["daily_log"]["completion_rate"] == 0.5
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_new_habit_forces_recount(self, mock_capsule, db, sample_user, daily_habit):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        version = sample_user.schedule_version
+        extra = Habit(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            title="Added Mid-Day",
+            attribute="ki",
+            importance="normal",
+            frequency="daily",
+            start_date="2026-01-01",
+        )
+        db.add(extra)
+        db.flush()
+        assert sample_user.schedule_version == version + 1
+
+        result = check_habit(db, sample_user.id, extra.id, "2026-03-04")
+        assert result["daily_log"]["habits_due"] == 2
+        assert result["daily_log"]["habits_completed"] == 2
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_archiving_habit_forces_recount(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        weekday_habit.is_active = False
+        db.flush()
+        # Uncheck then re-check: recount sees a single due habit
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        result = check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        assert result["daily_log"]["habits_due"] == 1
+        assert result["is_perfect_day"] is True
+
+    @pytest.mark.parametrize("stored", [-2, 3])
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_out_of_range_counter_recounts(
+        self, mock_capsule, db, sample_user, daily_habit, weekday_habit, caplog, stored
+    ):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        daily_log = db.query(DailyLog).filter_by(log_date="2026-03-04").one()
+        daily_log.habits_completed = stored  # drifted from the habit logs
+        db.flush()
+
+        with caplog.at_level("WARNING", logger="app.services.habit_service"):
+            result = check_habit(db, sample_user.id, weekday_habit.id, "2026-03-04")
+        assert "recounting" in caplog.text
+        assert result["daily_log"]["habits_due"] == 2
+        assert result["daily_log"]["habits_completed"] == 2
+        assert result["is_perfect_day"] is True
+
+    def test_reorder_does_not_bump_version(self, db, sample_user, daily_habit):
+        version = sample_user.schedule_version
+        daily_habit.sort_order = 5
+        db.flush()
+        assert sample_user.schedule_version == version
+
+
+# ── check_habits_batch ────────────────────────────────────────────────────
+
+
+class TestCheckHabitsBatch:
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_checks_every_habit(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        result = check_habits_batch(
+            db, sample_user.id, [daily_habit.id, weekday_habit.id], "2026-03-04"
+        )
+        assert [r["is_checking"] for r in result["results"]] == [True, True]
+        assert result["daily_log"]["habits_completed"] == 2
+        assert result["is_perfect_day"] is True
+        # normal = 15 str XP, important = 22 int XP
+        assert sample_user.str_xp == 15
+        assert sample_user.int_xp == 22
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_settles_day_once(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        with patch(
+            "app.services.habit_service.update_overall_streak",
+            wraps=update_overall_streak,
+        ) as mock_streak:
+            result = check_habits_batch(
+                db, sample_user.id, [daily_habit.id, weekday_habit.id], "2026-03-04"
+            )
+            assert mock_streak.call_count == 1
+        assert result["streak"]["current_streak"] == 1
+        assert sample_user.dragon_balls_collected == 1
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_matches_power_level_sum(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        from app.services.power_service import recalculate_power_level
+
+        check_habits_batch(db, sample_user.id, [daily_habit.id, weekday_habit.id], "2026-03-04")
+        power = sample_user.power_level
+        assert power > 0
+        assert recalculate_power_level(db, sample_user) == power
+
+    @patch("app.services.habit_service.roll_capsule_drop", return_value=None)
+    def test_mixed_check_and_uncheck(self, mock_capsule, db, sample_user, daily_habit, weekday_habit):
+        check_habit(db, sample_user.id, daily_habit.id, "2026-03-04")
+        result = check_habits_batch(
+            db, sample_user.id, [daily_habit.id, weekday_habit.id], "2026-03-04"
+        )
+        assert [r["is_checking"] for r in result["results"]] == [False, True]
+        assert result["daily_log"]["habits_completed"] == 1
@@ -0,0 +1,51 @@
+"""Tests for hot-path indexes — EXPLAIN QUERY PLAN must use them."""
+
+import pytest
+from sqlalchemy import text
+
+pytestmark = pytest.mark.sqlite_only
+
+# (expected index, hot query) — parameters are placeholders, only the plan matters
+HOT_QUERIES = [
+    (
+        "ix_off_days_user_date",
+        "SELECT id FROM off_days WHERE user_id = :u AND off_date = :d",
+    ),
+    (
+        "ix_off_days_user_date",
+        "SELECT count(*) FROM off_days WHERE user_id = :u AND off_date > :a AND off_date < :b",
+    ),
+    (
+        "ix_habit_logs_user_date",
+        "SELECT * FROM habit_logs WHERE user_id = :u AND log_date >= :a AND log_date <= :b",
+    ),
+    (
+        "ix_habit_streaks_habit",
+        "SELECT * FROM habit_streaks WHERE habit_id = :h",
+    ),
+    (
+        "ix_achievements_user_unlocked",
+        "SELECT * FROM achievements WHERE user_id = :u ORDER BY unlocked_at DESC",
+    ),
+    (
+        "ix_capsule_drops_user_dropped",
+        "SELECT * FROM capsule_drops WHERE user_id = :u ORDER BY dropped_at DESC",
+    ),
+    (
+        "ix_quotes_trigger_character_severity",
+        "SELECT * FROM quotes WHERE trigger_event = :t AND character = :c AND severity = :s",
+    ),
+    (
+        "ix_habits_user_active_mask",
+        "SELECT * FROM habits WHERE user_id = :u AND is_active = 1",
+    ),
+]
+
+
+@pytest.mark.parametrize("index_name,query", HOT_QUERIES)
+def test_query_plan_uses_index(engine, index_name, query):
+    with engine.connect() as conn:
+        params = {name: "x" for name in text(query).compile().params}
+        plan = conn.execute(text(f"EXPLAIN QUERY PLAN {query}"), params).all()
+    details = " | ".join(row[-1] for row in plan)
+    assert index_name in details, details
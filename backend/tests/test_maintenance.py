@@ -0,0 +1,187 @@
+"""Tests for background database maintenance — tasks, idle scheduling, admin endpoint."""
+
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.base import Base
+from app.database.maintenance import (
+    ActivityMonitor,
+    MaintenanceScheduler,
+    MaintenanceTask,
+    incremental_vacuum,
+    optimize,
+    wal_checkpoint,
+)
+from app.database.session import create_db_engine
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+@pytest.fixture()
+def file_engine(tmp_path):
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'maint.db'}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as session:
+        session.add_all([User(username=f"saiyan-{i}") for i in range(500)])
+        session.commit()
+    yield eng
+    eng.dispose()
+
+
+def _run(eng, action) -> dict:
+    with eng.connect() as conn:
+        return action(conn.execution_options(isolation_level="AUTOCOMMIT"))
+
+
+def test_checkpoint_truncates_wal(file_engine, tmp_path):
+    wal = tmp_path / "maint.db-wal"
+    assert os.path.getsize(wal) > 0
+    result = _run(file_engine, wal_checkpoint)
+    assert result["busy"] is False
+    assert os.path.getsize(wal) == 0
+
+
+def test_optimize_collects_statistics(file_engine):
+    _run(file_engine, optimize)
+    with file_engine.connect() as conn:
+        tables = set(conn.execute(text("SELECT tbl FROM sqlite_stat1")).scalars())
+    assert "users" in tables
+
+
+def test_incremental_vacuum_frees_pages(file_engine):
+    with file_engine.begin() as conn:
+        conn.execute(text("DELETE FROM users"))
+    _run(file_engine, wal_checkpoint)
+    result = _run(file_engine, incremental_vacuum)
+    assert result["freed_pages"] > 0
+    assert result["free_pages"] == 0
+
+
+def test_incremental_vacuum_skipped_without_auto_vacuum(tmp_path):
+    from sqlalchemy import create_engine
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+    Base.metadata.create_all(bind=eng)
+    assert "skipped" in _run(eng, incremental_vacuum)
+    eng.dispose()
+
+
+class TestScheduler:
+    def _scheduler(self, eng, action, monitor=None, interval=60.0):
+        task = MaintenanceTask("probe", action, interval)
+        return MaintenanceScheduler(eng, [task], monitor, idle_seconds=0.05, jitter=0.1), task
+
+    def test_first_run_is_jittered(self, file_engine):
+        scheduler, task = self._scheduler(file_engine, wal_checkpoint, interval=100.0)
+        assert 89 < task.next_run - time.monotonic() <= 110
+
+    def test_run_task_records_timings(self, file_engine):
+        scheduler, task = self._scheduler(file_engine, wal_checkpoint)
+        scheduler.run_task("probe")
+        (status,) = scheduler.status()
+        assert status["runs"] == 1
+        assert status["last_duration_ms"] >= 0
+        assert status["last_result"]["busy"] is False
+        assert 50 < status["next_run_in_s"] <= 66
+
+    def test_failure_is_recorded(self, file_engine):
+        def broken(conn):
+            raise RuntimeError("disk on fire")
+
+        scheduler, task = self._scheduler(file_engine, broken)
+        scheduler.run_task("probe")
+        assert (task.runs, task.failures, task.last_error) == (1, 1, "disk on fire")
+
+    def test_due_task_waits_for_idle(self, file_engine):
+        monitor = ActivityMonitor()
+        monitor.watch(file_engine)
+        scheduler, task = self._scheduler(file_engine, wal_checkpoint, monitor)
+        task.next_run = time.monotonic()
+
+        conn = file_engine.connect()  # a request holding a connection
+        scheduler.start()
+        try:
+            time.sleep(0.2)
+            assert task.runs == 0
+            conn.close()
+            deadline = time.monotonic() + 5
+            while task.runs == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert task.runs == 1
+        finally:
+            scheduler.stop()
+
+    def test_overdue_task_runs_while_busy(self, file_engine):
+        monitor = ActivityMonitor()
+        monitor.watch(file_engine)
+        scheduler, task = self._scheduler(file_engine, wal_checkpoint, monitor)
+        task.next_run = time.monotonic() - task.interval
+
+        with file_engine.connect():
+            scheduler.start()
+            deadline = time.monotonic() + 5
+            while task.runs == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            scheduler.stop()
+        assert task.runs == 1
+
+
+class TestAdminEndpoint:
+    def test_status_lists_tasks(self, admin_client):
+        resp = admin_client.get("/api/v1/admin/maintenance")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["enabled"] is True
+        assert {t["name"] for t in data["tasks"]} == {
+            "wal_checkpoint",
+            "optimize",
+            "incremental_vacuum",
+            "verify_power_levels",
+        }
+
+    def test_run_now(self, admin_client):
+        resp = admin_client.post("/api/v1/admin/maintenance/wal_checkpoint")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["runs"] == 1
+        assert data["last_error"] is None
+        assert data["last_duration_ms"] >= 0
+
+    def test_unknown_task(self, admin_client):
+        assert admin_client.post("/api/v1/admin/maintenance/defrag").status_code == 404
+
+    def test_token_required_when_set(self, admin_client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+        assert admin_client.get("/api/v1/admin/maintenance").status_code == 403
+        wrong = {"X-Admin-Token": "guess"}
+        assert admin_client.get("/api/v1/admin/maintenance", headers=wrong).status_code == 403
+        right = {"X-Admin-Token": "s3cret"}
+        assert admin_client.get("/api/v1/admin/maintenance", headers=right).status_code == 200
+
+    def test_not_mounted_by_default(self, client):
+        assert client.get("/api/v1/admin/maintenance").status_code == 404
+        assert client.post("/api/v1/admin/backup").status_code == 404
+
+    @pytest.mark.parametrize("enabled", [False, True])
+    def test_mounted_only_when_enabled(self, monkeypatch, enabled):
+        import importlib
+
+        from app.api import router as router_module
+
+        monkeypatch.setattr(settings, "ADMIN_ENABLED", enabled)
+        try:
+            app = FastAPI()
+            app.include_router(importlib.reload(router_module).api_router)
+            paths = set(app.openapi()["paths"])
+        finally:
+            monkeypatch.undo()
+            importlib.reload(router_module)
+        assert ("/api/v1/admin/backup" in paths) is enabled
+        assert "/api/v1/habits/" in paths
@@ -0,0 +1,241 @@
+"""Tests for startup migrations — added, dropped and widened columns on pre-existing databases."""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import MetaData, String, create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.constants import STREAK_MILESTONES
+from app.database.base import Base
+from app.database.migrations import ADDED_COLUMNS, run_migrations, widen_columns
+from app.database.types import DayNumber
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+@pytest.fixture()
+def file_engine(tmp_path):
+    """File-based SQLite engine with the current schema."""
+    eng = create_engine(f"sqlite:///{os.path.join(str(tmp_path), 'old.db')}")
+    Base.metadata.create_all(bind=eng)
+    return eng
+
+
+def _columns(eng, table):
+    return {c["name"] for c in inspect(eng).get_columns(table)}
+
+
+def test_adds_missing_columns(file_engine):
+    """Columns missing from an older database are added."""
+    with Session(file_engine) as session:
+        session.add(User(username="legacy-user"))
+        session.commit()
+    with file_engine.begin() as conn:
+        conn.execute(text("ALTER TABLE users DROP COLUMN schedule_version"))
+        conn.execute(text("ALTER TABLE daily_logs DROP COLUMN schedule_version"))
+
+    run_migrations(file_engine)
+
+    assert "schedule_version" in _columns(file_engine, "users")
+    assert "schedule_version" in _columns(file_engine, "daily_logs")
+    with file_engine.connect() as conn:
+        assert conn.execute(text("SELECT schedule_version FROM users")).scalar() == 0
+
+
+def test_drops_removed_columns(file_engine):
+    """Columns a model no longer declares are dropped, so its inserts succeed."""
+    with file_engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE analytics_rollups ADD COLUMN completion_rate_sum FLOAT NOT NULL"
+        ))
+
+    run_migrations(file_engine)
+    run_migrations(file_engine)
+
+    assert "completion_rate_sum" not in _columns(file_engine, "analytics_rollups")
+
+
+def test_widens_columns(engine):
+    """Server databases get String columns widened to the model's length."""
+    if engine.dialect.name == "sqlite":
+        pytest.skip("SQLite does not enforce VARCHAR lengths")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE achievements ALTER COLUMN achievement_key TYPE VARCHAR(50)"
+        ))
+        assert widen_columns(conn) == ["achievements.achievement_key"]
+        assert widen_columns(conn) == []
+    key = {c["name"]: c["type"] for c in inspect(engine).get_columns("achievements")}
+    assert key["achievement_key"].length == 100
+
+
+def test_habit_milestone_keys_fit():
+    longest = f"habit_{uuid.uuid4()}_streak_{max(STREAK_MILESTONES)}"
+    assert len(longest) <= Base.metadata.tables["achievements"].c.achievement_key.type.length
+
+
+def test_migrations_idempotent(file_engine):
+    """Running migrations on an up-to-date database is a no-op."""
+    run_migrations(file_engine)
+    run_migrations(file_engine)
+    for table, column, _ in ADDED_COLUMNS:
+        assert column in _columns(file_engine, table)
+
+
+def test_backfills_schedule_mask(file_engine):
+    """Existing habits get a schedule_mask derived from their frequency."""
+    from app.models.habit import Habit
+
+    with Session(file_engine) as session:
+        user = User(username="legacy-user")
+        session.add(user)
+        session.flush()
+        session.add_all([
+            Habit(user_id=user.id, title="Daily", attribute="str",
+                  frequency="daily", start_date="2026-01-01"),
+            Habit(user_id=user.id, title="Weekdays", attribute="int",
+                  frequency="weekdays", start_date="2026-01-01"),
+            Habit(user_id=user.id, title="Mon/Wed/Fri", attribute="vit",
+                  frequency="custom", custom_days=[1, 3, 5], start_date="2026-01-01"),
+        ])
+        session.commit()
+    with file_engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_habits_user_active_mask"))
+        conn.execute(text("ALTER TABLE habits DROP COLUMN schedule_mask"))
+
+    run_migrations(file_engine)
+
+    with file_engine.connect() as conn:
+        masks = dict(conn.execute(text("SELECT title, schedule_mask FROM habits")).all())
+    assert masks == {"Daily": 0b1111111, "Weekdays": 0b0011111, "Mon/Wed/Fri": 0b0010101}
+    index_names = {ix["name"] for ix in inspect(file_engine).get_indexes("habits")}
+    assert "ix_habits_user_active_mask" in index_names
+
+
+def test_dedupes_achievements_before_unique_index(file_engine):
+    """Duplicate achievements are collapsed so the unique index can be built."""
+    with Session(file_engine) as session:
+        user = User(username="legacy-user")
+        session.add(user)
+        session.commit()
+        user_id = user.id.hex
+    with file_engine.begin() as conn:
+        conn.execute(text("DROP INDEX uq_achievements_user_type_key"))
+        for key in ("ssj", "ssj", "ssj2"):
+            conn.execute(
+                text(
+                    "INSERT INTO achievements (id, user_id, achievement_type, achievement_key, unlocked_at)"
+                    " VALUES (:id, :user_id, 'transformation', :key, '2026-01-01 00:00:00')"
+                ),
+                {"id": uuid.uuid4().hex, "user_id": user_id, "key": key},
+            )
+
+    run_migrations(file_engine)
+
+    with file_engine.connect() as conn:
+        keys = sorted(conn.execute(text("SELECT achievement_key FROM achievements")).scalars())
+    assert keys == ["ssj", "ssj2"]
+    index_names = {ix["name"] for ix in inspect(file_engine).get_indexes("achievements")}
+    assert "uq_achievements_user_type_key" in index_names
+
+
+def test_creates_missing_hot_path_indexes(file_engine):
+    """Indexes declared on models are added to databases created without them."""
+    names = [
+        ("off_days", "ix_off_days_user_date"),
+        ("habit_logs", "ix_habit_logs_user_date"),
+        ("habit_streaks", "ix_habit_streaks_habit"),
+        ("achievements", "ix_achievements_user_unlocked"),
+        ("capsule_drops", "ix_capsule_drops_user_dropped"),
+        ("quotes", "ix_quotes_trigger_character_severity"),
+    ]
+    with file_engine.begin() as conn:
+        for _, index_name in names:
+            conn.execute(text(f"DROP INDEX {index_name}"))
+
+    run_migrations(file_engine)
+
+    inspector = inspect(file_engine)
+    for table, index_name in names:
+        assert index_name in {ix["name"] for ix in inspector.get_indexes(table)}
+
+
+@pytest.fixture()
+def legacy_date_engine(tmp_path):
+    """File-based SQLite engine whose date columns are String(10) ISO text."""
+    eng = create_engine(f"sqlite:///{os.path.join(str(tmp_path), 'legacy.db')}")
+    legacy = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(legacy)
+        for column in copy.columns:
+            if isinstance(column.type, DayNumber):
+                column.type = String(10)
+    legacy.create_all(bind=eng)
+    return eng
+
+
+def test_converts_text_dates_to_day_numbers(legacy_date_engine):
+    """ISO text dates become integer day numbers; the ORM still sees ISO strings."""
+    from app.models.daily_log import DailyLog
+    from app.models.habit import Habit
+    from app.models.habit_log import HabitLog
+    from app.models.off_day import OffDay
+    from app.models.streak import Streak
+
+    eng = legacy_date_engine
+    with Session(eng) as session:
+        user = User(username="legacy-user")
+        session.add(user)
+        session.flush()
+        habit = Habit(user_id=user.id, title="Daily", attribute="str", start_date="2026-01-01")
+        session.add(habit)
+        session.flush()
+        session.add_all([
+            HabitLog(user_id=user.id, habit_id=habit.id, log_date="2026-03-04", completed=True),
+            DailyLog(user_id=user.id, log_date="2026-03-04"),
+            OffDay(user_id=user.id, off_date="2026-03-05"),
+            Streak(user_id=user.id, last_active_date="2026-03-04"),
+        ])
+        session.commit()
+        habit_id = habit.id
+    # Rewrite every date as the ISO text an old database holds
+    with eng.begin() as conn:
+        conn.execute(text("UPDATE habits SET start_date = '2026-01-01', end_date = '2026-12-31'"))
+        conn.execute(text("UPDATE habit_logs SET log_date = '2026-03-04'"))
+        conn.execute(text("UPDATE daily_logs SET log_date = '2026-03-04'"))
+        conn.execute(text("UPDATE off_days SET off_date = '2026-03-05'"))
+        conn.execute(text("UPDATE streaks SET last_active_date = '2026-03-04'"))
+
+    run_migrations(eng)
+
+    inspector = inspect(eng)
+    log_date = next(c for c in inspector.get_columns("habit_logs") if c["name"] == "log_date")
+    assert str(log_date["type"]) == "INTEGER"
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT log_date FROM habit_logs")).scalar() == 20516
+        assert conn.execute(text("SELECT end_date FROM habits")).scalar() == 20818
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA foreign_key_check")).all() == []
+    with Session(eng) as session:
+        habit = session.get(Habit, habit_id)
+        assert (habit.start_date, habit.end_date) == ("2026-01-01", "2026-12-31")
+        log = session.query(HabitLog).filter(HabitLog.log_date >= "2026-03-01").one()
+        assert log.log_date == "2026-03-04"
+        assert session.query(OffDay.off_date).scalar() == "2026-03-05"
+        assert session.query(Streak.last_active_date).scalar() == "2026-03-04"
+
+    # Rebuilt tables keep their constraints and get their indexes back
+    assert "ix_habit_logs_user_date" in {ix["name"] for ix in inspector.get_indexes("habit_logs")}
+    assert {"habit_id", "log_date"} in [
+        set(uc["column_names"]) for uc in inspect(eng).get_unique_constraints("habit_logs")
+    ]
+    fks = inspect(eng).get_foreign_keys("habit_logs")
+    assert {fk["referred_table"] for fk in fks} == {"users", "habits"}
+
+    # Already converted: a second run rebuilds nothing
+    from app.database.migrations import migrate_column_storage
+
+    assert migrate_column_storage(eng) == []
@@ -5,7 +5,7 @@ import uuid
 from app.database.base import Base
 from app.models.user import User
 from app.models.category import Category
-from app.models.habit import Habit
+from app.models.habit import Habit, compute_schedule_mask
 from app.models.habit_log import HabitLog
 from app.models.daily_log import DailyLog
 
@@ -181,3 +181,28 @@ def test_category_fields(db, sample_user):
 
     column_names = [c.name for c in Category.__table__.columns]
     assert "point_multiplier" not in column_names
+
+
+# --- Habit schedule mask ---
+
+def test_compute_schedule_mask():
+    """Weekday bitmask uses date.weekday() bits (Mon=bit 0)."""
+    assert compute_schedule_mask("daily", None) == 0b1111111
+    assert compute_schedule_mask("weekdays", None) == 0b0011111
+    assert compute_schedule_mask("custom", [1, 7]) == 0b1000001
+    assert compute_schedule_mask("custom", None) == 0
+
+
+def test_schedule_mask_set_on_insert(db, sample_user):
+    """schedule_mask is derived from frequency/custom_days when flushed."""
+    habit = Habit(
+        user_id=sample_user.id,
+        title="Weekend",
+        attribute="vit",
+        frequency="custom",
+        custom_days=[6, 7],
+        start_date="2026-03-04",
+    )
+    db.add(habit)
+    db.flush()
+    assert habit.schedule_mask == 0b1100000
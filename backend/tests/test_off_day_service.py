@@ -12,6 +12,7 @@ from app.services.off_day_service import (
     cancel_off_day,
     is_off_day,
 )
+from app.services.power_service import recalculate_power_level
 
 
 class TestIsOffDay:
@@ -90,11 +91,21 @@ class TestMarkOffDay:
         mark_off_day(db, sample_user.id, "2026-03-01")
         assert sample_user.dragon_balls_collected == 2
 
-    def test_recalculates_power_level(self, db, sample_user):
+    def test_subtracts_day_xp_from_power_level(self, db, sample_user):
+        db.add(DailyLog(
+            id=uuid.uuid4(), user_id=sample_user.id,
+            log_date="2026-02-28", xp_earned=300,
+        ))
+        db.add(DailyLog(
+            id=uuid.uuid4(), user_id=sample_user.id,
+            log_date="2026-03-01", xp_earned=200,
+        ))
         sample_user.power_level = 500
-        # No daily logs left after off day, power should drop to 0
+        db.flush()
+        # Only the off day's XP is removed; the other day's XP stays
         mark_off_day(db, sample_user.id, "2026-03-01")
-        assert sample_user.power_level == 0
+        assert sample_user.power_level == 300
+        assert recalculate_power_level(db, sample_user) == 300
 
 
 class TestCancelOffDay:
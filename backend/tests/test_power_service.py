@@ -3,12 +3,20 @@
 import uuid
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
+from app.database.base import Base
+from app.database.maintenance import MaintenanceScheduler, MaintenanceTask, verify_power_levels
+from app.database.session import create_db_engine
 from app.models.daily_log import DailyLog
+from app.models.user import User
 from app.services.power_service import (
+    apply_power_delta,
     check_transformation_change,
     get_transformation_for_power,
     recalculate_power_level,
+    repair_power_levels,
 )
 
 
@@ -103,3 +111,75 @@ class TestRecalculatePowerLevel:
 
         recalculate_power_level(db, sample_user)
         assert sample_user.power_level == 5000
+
+
+class TestRepairPowerLevels:
+    """repair_power_levels finds and fixes counters that drifted from DailyLog."""
+
+    def test_fixes_only_drifted_users(self, db, sample_user):
+        other = User(id=uuid.uuid4(), username="krillin", power_level=0)
+        db.add(other)
+        db.add(DailyLog(
+            id=uuid.uuid4(), user_id=sample_user.id, log_date="2026-01-01", xp_earned=300,
+        ))
+        sample_user.power_level = 999  # drifted
+        db.flush()
+
+        result = repair_power_levels(db)
+        assert result["repaired"] >= 1
+        assert result["users_checked"] >= 2
+        assert sample_user.power_level == 300
+        assert other.power_level == 0
+        assert repair_power_levels(db)["repaired"] == 0
+
+    def test_maintenance_task_commits(self, tmp_path):
+        eng = create_db_engine(f"sqlite:///{tmp_path / 'power.db'}")
+        Base.metadata.create_all(bind=eng)
+        with Session(eng) as session:
+            user = User(username="yamcha", power_level=50)
+            session.add(user)
+            session.flush()
+            session.add(DailyLog(user_id=user.id, log_date="2026-01-01", xp_earned=20))
+            session.commit()
+
+        task = MaintenanceTask("power", verify_power_levels, 60.0, transactional=True)
+        MaintenanceScheduler(eng, [task]).run_task("power")
+        assert task.last_result == {"users_checked": 1, "repaired": 1}
+        with Session(eng) as session:
+            assert session.scalar(select(User.power_level)) == 20
+        eng.dispose()
+
+
+class TestApplyPowerDelta:
+    """apply_power_delta shifts the stored power level by one day's XP change."""
+
+    def test_adds_positive_delta(self, sample_user):
+        sample_user.power_level = 1000
+        assert apply_power_delta(sample_user, 150) == 1150
+        assert sample_user.power_level == 1150
+
+    def test_subtracts_negative_delta(self, sample_user):
+        sample_user.power_level = 1000
+        assert apply_power_delta(sample_user, -400) == 600
+
+    def test_floors_at_zero(self, sample_user):
+        sample_user.power_level = 100
+        assert apply_power_delta(sample_user, -500) == 0
+
+    def test_matches_full_recalculation(self, db, sample_user):
+        log = DailyLog(
+            id=uuid.uuid4(),
+            user_id=sample_user.id,
+            log_date="2026-01-01",
+            xp_earned=100,
+        )
+        db.add(log)
+        db.flush()
+        recalculate_power_level(db, sample_user)
+
+        # Same day re-scored from 100 to 250 XP
+        log.xp_earned = 250
+        apply_power_delta(sample_user, 250 - 100)
+        db.flush()
+        assert sample_user.power_level == 250
+        assert recalculate_power_level(db, sample_user) == 250
@@ -0,0 +1,173 @@
+"""Tests for quote_catalog — indexed lookup, shuffle-bag selection, reload on change."""
+
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.services.quote_catalog as quote_catalog
+from app.database.base import Base
+from app.models.quote import Quote
+from app.services.quote_catalog import (
+    CatalogQuote,
+    QuoteCatalog,
+    choose_quote,
+    get_quote_catalog,
+    load_quote_catalog,
+)
+
+
+def _quote(trigger_event, character="goku", severity=None, transformation_level=None, text=None):
+    return CatalogQuote(
+        id=uuid.uuid4(),
+        character=character,
+        quote_text=text or f"{character} {trigger_event}",
+        source_saga="Test Saga",
+        trigger_event=trigger_event,
+        transformation_level=transformation_level,
+        severity=severity,
+    )
+
+
+@pytest.fixture()
+def catalog():
+    return QuoteCatalog([
+        _quote("habit_complete"),
+        _quote("habit_complete", character="vegeta"),
+        _quote("roast", character="vegeta", severity="mild"),
+        _quote("roast", character="vegeta", severity="savage"),
+        _quote("transformation", transformation_level="ssj"),
+    ])
+
+
+class TestQuoteCatalogFind:
+    def test_all_quotes_without_filters(self, catalog):
+        assert len(catalog.find()) == 5
+        assert len(catalog) == 5
+
+    def test_single_field(self, catalog):
+        assert len(catalog.find(trigger_event="habit_complete")) == 2
+        assert len(catalog.find(character="vegeta")) == 3
+
+    def test_combined_fields(self, catalog):
+        found = catalog.find(trigger_event="roast", character="vegeta", severity="savage")
+        assert [q.severity for q in found] == ["savage"]
+        assert catalog.find(trigger_event="transformation", transformation_level="ssj")
+
+    def test_none_is_a_value(self, catalog):
+        """severity=None matches quotes without a severity, not every quote."""
+        assert len(catalog.find(severity=None)) == 3
+
+    def test_no_match(self, catalog):
+        assert catalog.find(trigger_event="nonexistent") == ()
+        assert catalog.choose(trigger_event="nonexistent") is None
+
+    def test_unknown_filter_raises(self, catalog):
+        with pytest.raises(TypeError):
+            catalog.find(context="slacking")
+
+
+class TestQuoteCatalogChoose:
+    def test_choose_returns_match(self, catalog):
+        quote = catalog.choose(trigger_event="roast", severity="mild")
+        assert quote.severity == "mild"
+
+    def test_shuffle_bag_deals_each_quote_once(self):
+        quotes = [_quote("habit_complete", text=f"q{i}") for i in range(6)]
+        catalog = QuoteCatalog(quotes)
+        dealt = [catalog.choose(no_repeat=True, trigger_event="habit_complete") for _ in range(6)]
+        assert {q.id for q in dealt} == {q.id for q in quotes}
+
+    def test_shuffle_bag_never_repeats_back_to_back(self):
+        catalog = QuoteCatalog([_quote("habit_complete", text=f"q{i}") for i in range(3)])
+        dealt = [catalog.choose(no_repeat=True, trigger_event="habit_complete") for _ in range(60)]
+        assert all(a.id != b.id for a, b in zip(dealt, dealt[1:]))
+
+    def test_as_detail(self):
+        detail = _quote("zenkai", character="vegeta").as_detail()
+        assert detail["avatar_path"] == "/assets/avatars/vegeta.webp"
+        assert set(detail) == {"character", "quote_text", "source_saga", "avatar_path"}
+
+
+class TestProcessCatalog:
+    def test_loads_lazily_then_serves_from_memory(self, engine, db):
+        db.add(Quote(
+            id=uuid.uuid4(), character="goku", quote_text="Kamehameha!",
+            source_saga="Saiyan Saga", trigger_event="test_lazy_load",
+        ))
+        db.flush()
+        assert choose_quote(db, trigger_event="test_lazy_load").quote_text == "Kamehameha!"
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            choose_quote(db, trigger_event="test_lazy_load")
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert statements == []
+
+    def test_quote_commit_invalidates_catalog(self):
+        eng = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=eng)
+        with Session(eng) as session:
+            assert len(load_quote_catalog(session)) == 0
+            session.add(Quote(
+                character="vegeta", quote_text="Hmph.", source_saga="Buu Saga",
+                trigger_event="roast", severity="mild",
+            ))
+            session.commit()
+            assert quote_catalog._catalog is None
+            assert len(get_quote_catalog(session)) == 1
+
+    def test_catalog_expires_after_ttl(self, db, monkeypatch):
+        """Quote changes made through another worker show up once the TTL passes."""
+        now = [1000.0]
+        monkeypatch.setattr(quote_catalog.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(quote_catalog.settings, "QUOTE_CATALOG_TTL", 60.0)
+        catalog = get_quote_catalog(db)
+
+        # Core insert: no flush hook, like a commit in another process
+        db.execute(Quote.__table__.insert().values(
+            id=uuid.uuid4(), character="goku", quote_text="Kaio-ken!",
+            source_saga="Saiyan Saga", trigger_event="test_ttl",
+        ))
+        now[0] += 59
+        assert get_quote_catalog(db) is catalog
+        now[0] += 2
+        assert get_quote_catalog(db).find(trigger_event="test_ttl")
+
+    def test_ttl_zero_never_expires(self, db, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(quote_catalog.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(quote_catalog.settings, "QUOTE_CATALOG_TTL", 0.0)
+        catalog = get_quote_catalog(db)
+        now[0] += 10**6
+        assert get_quote_catalog(db) is catalog
+
+    def test_rolled_back_quote_write_keeps_catalog(self):
+        eng = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=eng)
+        with Session(eng) as session:
+            catalog = load_quote_catalog(session)
+            session.add(Quote(
+                character="vegeta", quote_text="Hmph.", source_saga="Buu Saga",
+                trigger_event="roast",
+            ))
+            session.flush()
+            session.rollback()
+            session.commit()
+            assert quote_catalog._catalog is catalog
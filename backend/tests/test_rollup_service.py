@@ -0,0 +1,231 @@
+"""Tests for analytics rollups — range splitting, flush hooks, backfill."""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from app.database.base import Base
+from app.database.migrations import run_migrations
+from app.database.session import create_db_engine
+from app.models.analytics_rollup import AnalyticsRollup
+from app.models.daily_log import DailyLog
+from app.models.user import User
+from app.services.habit_service import check_habit
+from app.services.off_day_service import mark_off_day
+from app.services.rollup_service import (
+    RATE_SCALE,
+    RollupTotals,
+    period_totals,
+    rebuild_rollups,
+    split_range,
+)
+
+
+def _covered_days(start, end) -> list[str]:
+    """Expand split_range's output back into individual days (bounded ranges only)."""
+    months, weeks, days = split_range(start, end)
+    covered = []
+    if months is not None:
+        month = date.fromisoformat(months[0])
+        while month <= date.fromisoformat(months[1]):
+            nxt = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+            covered += [(month + timedelta(days=i)).isoformat() for i in range((nxt - month).days)]
+            month = nxt
+    for monday in weeks:
+        first = date.fromisoformat(monday)
+        assert first.weekday() == 0
+        covered += [(first + timedelta(days=i)).isoformat() for i in range(7)]
+    for first, last in days:
+        d = date.fromisoformat(first)
+        while d <= date.fromisoformat(last):
+            covered.append(d.isoformat())
+            d += timedelta(days=1)
+    return covered
+
+
+def _expected(db, user_id, start=None, end=None) -> RollupTotals:
+    """Brute-force totals straight from DailyLog objects."""
+    query = select(DailyLog).where(DailyLog.user_id == user_id)
+    if start is not None:
+        query = query.where(DailyLog.log_date >= start)
+    if end is not None:
+        query = query.where(DailyLog.log_date <= end)
+    totals = RollupTotals()
+    for dl in db.scalars(query):
+        rate_ppm = int(dl.habit_completion_rate * RATE_SCALE + 0.5)
+        totals.add((1, dl.habits_due, dl.habits_completed, rate_ppm,
+                    dl.xp_earned, int(dl.is_perfect_day)))
+    return totals
+
+
+def _add_logs(db, user_id, first: date, days: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(days):
+        if rng.random() < 0.2:
+            continue
+        due = rng.randint(1, 5)
+        done = rng.randint(0, due)
+        db.add(DailyLog(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            log_date=(first + timedelta(days=i)).isoformat(),
+            habits_due=due,
+            habits_completed=done,
+            habit_completion_rate=done / due,
+            is_perfect_day=done == due,
+            xp_earned=done * 10,
+        ))
+    db.flush()
+
+
+def _assert_close(actual: RollupTotals, expected: RollupTotals):
+    # Integer sums only, so rollups must match the brute-force totals exactly
+    assert actual == expected
+
+
+class TestSplitRange:
+    @pytest.mark.parametrize("start,end", [
+        ("2026-03-04", "2026-03-04"),
+        ("2026-03-01", "2026-03-31"),
+        ("2026-02-25", "2026-03-09"),
+        ("2025-11-13", "2026-04-02"),
+        ("2024-02-29", "2026-12-31"),
+    ])
+    def test_covers_each_day_once(self, start, end):
+        covered = _covered_days(start, end)
+        assert len(covered) == len(set(covered))
+        assert min(covered) == start
+        assert max(covered) == end
+        assert len(covered) == (date.fromisoformat(end) - date.fromisoformat(start)).days + 1
+
+    def test_random_ranges(self):
+        rng = random.Random(42)
+        for _ in range(300):
+            start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 900))
+            end = start + timedelta(days=rng.randint(0, 400))
+            covered = _covered_days(start.isoformat(), end.isoformat())
+            assert sorted(covered) == [
+                (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+            ]
+
+    def test_open_ends(self):
+        assert split_range(None, None) == ((None, None), [], [])
+        months, weeks, days = split_range("2026-03-04", None)
+        assert months == ("2026-04-01", None)
+        assert weeks == ["2026-03-09", "2026-03-16", "2026-03-23"]
+        assert days == [("2026-03-04", "2026-03-08"), ("2026-03-30", "2026-03-31")]
+
+
+class TestFlushHooks:
+    def test_totals_match_daily_logs(self, db, sample_user):
+        _add_logs(db, sample_user.id, date(2025, 1, 1), 500)
+        for start, end in [(None, None), ("2025-02-14", None), ("2025-03-03", "2025-09-17"),
+                           ("2025-06-01", "2025-06-30"), ("2025-12-30", "2026-01-02")]:
+            _assert_close(
+                period_totals(db, sample_user.id, start, end),
+                _expected(db, sample_user.id, start, end),
+            )
+
+    def test_update_and_delete(self, db, sample_user):
+        _add_logs(db, sample_user.id, date(2026, 1, 1), 60)
+        logs = db.scalars(select(DailyLog).where(DailyLog.user_id == sample_user.id)).all()
+        logs[0].xp_earned += 100
+        logs[1].is_perfect_day = not logs[1].is_perfect_day
+        db.delete(logs[2])
+        db.expire(logs[3])  # old values must be read back from the database
+        logs[3].habits_due = 99
+        db.flush()
+        _assert_close(period_totals(db, sample_user.id), _expected(db, sample_user.id))
+
+    def test_date_change_moves_between_periods(self, db, sample_user):
+        _add_logs(db, sample_user.id, date(2026, 1, 20), 20)
+        logs = db.scalars(select(DailyLog).where(DailyLog.user_id == sample_user.id)).all()
+        logs[0].log_date = "2026-04-15"
+        db.flush()
+        for start, end in [(None, None), ("2026-01-01", "2026-01-31"), ("2026-04-01", None)]:
+            _assert_close(
+                period_totals(db, sample_user.id, start, end),
+                _expected(db, sample_user.id, start, end),
+            )
+
+    def test_repeated_rewrites_stay_exact(self, db, sample_user, sample_habit):
+        for _ in range(7):
+            check_habit(db, sample_user.id, sample_habit.id, "2026-03-04")
+        totals = period_totals(db, sample_user.id, "2026-03-01", "2026-03-31")
+        assert totals == _expected(db, sample_user.id, "2026-03-01", "2026-03-31")
+        assert totals.avg_completion_rate == 1.0
+
+    def test_check_uncheck_and_off_day(self, db, sample_user, sample_habit):
+        check_habit(db, sample_user.id, sample_habit.id, "2026-03-04")
+        totals = period_totals(db, sample_user.id, "2026-03-01", "2026-03-31")
+        assert (totals.days_tracked, totals.habits_completed, totals.perfect_days) == (1, 1, 1)
+
+        check_habit(db, sample_user.id, sample_habit.id, "2026-03-04")
+        totals = period_totals(db, sample_user.id, "2026-03-01", "2026-03-31")
+        assert (totals.days_tracked, totals.habits_completed, totals.perfect_days) == (1, 0, 0)
+
+        check_habit(db, sample_user.id, sample_habit.id, "2026-03-04")
+        mark_off_day(db, sample_user.id, "2026-03-04")
+        rollups = db.scalars(
+            select(AnalyticsRollup).where(AnalyticsRollup.user_id == sample_user.id)
+        ).all()
+        assert {r.period: r.period_start for r in rollups} == {
+            "week": "2026-03-02",
+            "month": "2026-03-01",
+        }
+        assert all(r.days_tracked == 0 and r.xp_earned == 0 for r in rollups)
+
+
+def test_backfill_on_migration(tmp_path):
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(bind=eng)
+    user_id = uuid.uuid4()
+    with eng.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": user_id, "username": "legacy"}])
+        # Core inserts bypass the flush hooks, like rows written before rollups existed
+        conn.execute(DailyLog.__table__.insert(), [
+            {"id": uuid.uuid4(), "user_id": user_id, "log_date": f"2026-01-{d:02d}",
+             "habits_due": 2, "habits_completed": 1, "habit_completion_rate": 0.5,
+             "xp_earned": 10}
+            for d in range(1, 11)
+        ])
+
+    run_migrations(eng)
+    run_migrations(eng)  # existing rollups are left alone
+    with eng.begin() as conn:
+        rows = conn.execute(select(AnalyticsRollup.period, AnalyticsRollup.days_tracked)).all()
+        # 2026-01-01 is a Thursday: weeks of Dec 29 (4 days) and Jan 5 (6 days)
+        assert sorted(rows) == [("month", 10), ("week", 4), ("week", 6)]
+        assert rebuild_rollups(conn) == 3
+    eng.dispose()
+
+
+def test_rate_column_migration_rebuilds(tmp_path):
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(bind=eng)
+    user_id = uuid.uuid4()
+    with eng.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": user_id, "username": "legacy"}])
+        conn.execute(DailyLog.__table__.insert(), [
+            {"id": uuid.uuid4(), "user_id": user_id, "log_date": f"2026-01-{d:02d}",
+             "habits_due": 3, "habits_completed": 1, "habit_completion_rate": 1 / 3,
+             "xp_earned": 10}
+            for d in range(1, 11)
+        ])
+        rebuild_rollups(conn)
+        # The rollup schema before rates were summed as integers
+        conn.execute(text("ALTER TABLE analytics_rollups DROP COLUMN completion_rate_ppm_sum"))
+        conn.execute(text(
+            "ALTER TABLE analytics_rollups ADD COLUMN completion_rate_sum FLOAT NOT NULL DEFAULT 0"
+        ))
+
+    run_migrations(eng)
+    with eng.begin() as conn:
+        sums = conn.execute(
+            select(AnalyticsRollup.period, AnalyticsRollup.completion_rate_ppm_sum)
+        ).all()
+        assert sorted(sums) == [("month", 3333330), ("week", 1333332), ("week", 1999998)]
+    eng.dispose()
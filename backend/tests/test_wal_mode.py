@@ -4,27 +4,37 @@ import os
 
 import pytest
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import SQLITE_PROFILES
+from app.database.session import (
+    apply_sqlite_pragmas,
+    create_db_engine,
+    create_read_engine,
+    get_db,
+    get_read_db,
+    read_only_url,
+)
 
-def _apply_sqlite_pragmas(dbapi_connection, connection_record):
-    """Mirror the pragma handler from app.database.session."""
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.close()
 
-
-@pytest.fixture()
-def wal_engine(tmp_path):
-    """Create a file-based SQLite engine with pragma event handler."""
+def _make_engine(tmp_path, pragmas):
+    """Create a file-based SQLite engine applying the given pragma profile."""
     db_path = os.path.join(str(tmp_path), "test.db")
     url = f"sqlite:///{db_path}"
     eng = create_engine(url, echo=False)
-    event.listen(eng, "connect", _apply_sqlite_pragmas)
+    event.listen(
+        eng, "connect", lambda dbapi_conn, record: apply_sqlite_pragmas(dbapi_conn, pragmas)
+    )
     return eng
 
 
+@pytest.fixture()
+def wal_engine(tmp_path):
+    """Create a file-based SQLite engine with the balanced profile."""
+    return _make_engine(tmp_path, SQLITE_PROFILES["balanced"])
+
+
 def test_wal_mode_active(wal_engine):
     """WAL journal mode should be set on file-based databases."""
     with wal_engine.connect() as conn:
@@ -37,3 +47,141 @@ def test_foreign_keys_enabled(wal_engine):
     with wal_engine.connect() as conn:
         result = conn.execute(text("PRAGMA foreign_keys")).scalar()
         assert result == 1
+
+
+@pytest.mark.parametrize("profile", sorted(SQLITE_PROFILES))
+def test_profile_pragmas_applied(tmp_path, profile):
+    """Every preset's pragmas take effect on new connections, alongside WAL."""
+    pragmas = SQLITE_PROFILES[profile]
+    eng = _make_engine(tmp_path, pragmas)
+    synchronous = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+    temp_store = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+    with eng.connect() as conn:
+        def pragma(name):
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == synchronous[pragmas["synchronous"]]
+        assert pragma("temp_store") == temp_store[pragmas["temp_store"]]
+        assert pragma("cache_size") == pragmas["cache_size"]
+        assert pragma("busy_timeout") == pragmas["busy_timeout"]
+        assert pragma("wal_autocheckpoint") == pragmas["wal_autocheckpoint"]
+        assert pragma("journal_size_limit") == pragmas["journal_size_limit"]
+
+
+def test_read_sqlite_pragmas_names_values(tmp_path, monkeypatch):
+    """Startup read-back reports enum pragmas by name."""
+    from app.core.config import settings
+    from app.database.session import read_sqlite_pragmas
+
+    monkeypatch.setattr(settings, "SQLITE_PROFILE", "balanced")
+    monkeypatch.setattr(settings, "SQLITE_SYNCHRONOUS", None)
+    monkeypatch.setattr(settings, "SQLITE_TEMP_STORE", None)
+    eng = _make_engine(tmp_path, settings.sqlite_pragmas)
+    effective = read_sqlite_pragmas(eng)
+    assert effective["journal_mode"] == "wal"
+    assert effective["synchronous"] == "NORMAL"
+    assert effective["temp_store"] == "MEMORY"
+
+
+# ── Read-only engine ──────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("url,expected", [
+    ("sqlite:///saiyan_tracker.db", "file:saiyan_tracker.db"),
+    ("sqlite:////var/lib/saiyan/saiyan.db", "file:/var/lib/saiyan/saiyan.db"),
+    ("sqlite://", None),
+    ("sqlite:///:memory:", None),
+    ("postgresql://saiyan:pw@localhost/saiyan", None),
+])
+def test_read_only_url(url, expected):
+    ro_url = read_only_url(url)
+    if expected is None:
+        assert ro_url is None
+    else:
+        assert ro_url.database == expected
+        assert dict(ro_url.query) == {"mode": "ro", "uri": "true"}
+
+
+def test_read_engine_rejects_writes(wal_engine):
+    with wal_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE scores (value INTEGER)"))
+        conn.execute(text("INSERT INTO scores VALUES (9001)"))
+    reader = create_read_engine(str(wal_engine.url), wal_engine)
+    assert reader is not wal_engine
+    with reader.connect() as conn:
+        assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+        assert conn.execute(text("SELECT value FROM scores")).scalar() == 9001
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO scores VALUES (1)"))
+
+
+def test_read_engine_reads_during_write(wal_engine):
+    """A reader sees the last committed state while a write transaction is open."""
+    with wal_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE scores (value INTEGER)"))
+        conn.execute(text("INSERT INTO scores VALUES (1)"))
+    reader = create_read_engine(str(wal_engine.url), wal_engine)
+    with wal_engine.begin() as writer:
+        writer.execute(text("INSERT INTO scores VALUES (2)"))
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM scores")).scalar() == 1
+
+
+def test_read_engine_falls_back_for_memory():
+    writer = create_engine("sqlite://")
+    assert create_read_engine("sqlite://", writer) is writer
+
+
+def _dependency_calls(dependant):
+    """Every dependency callable a route resolves, including sub-dependencies."""
+    calls = set()
+    for dep in dependant.dependencies:
+        calls.add(dep.call)
+        calls |= _dependency_calls(dep)
+    return calls
+
+
+@pytest.mark.parametrize("module", ["achievements", "analytics", "power"])
+def test_report_routes_use_read_db(module):
+    """Every GET route in the report modules reads through get_read_db only."""
+    import importlib
+
+    router = importlib.import_module(f"app.api.v1.{module}").router
+    for route in router.routes:
+        calls = _dependency_calls(route.dependant)
+        assert get_read_db in calls, route.path
+        assert get_db not in calls, route.path
+
+
+@pytest.mark.parametrize("module", ["achievements", "analytics", "habits", "power"])
+def test_read_routes_resolve_user_on_read_db(module):
+    """A route on get_read_db must not check out a write session for the user."""
+    import importlib
+
+    router = importlib.import_module(f"app.api.v1.{module}").router
+    for route in router.routes:
+        calls = _dependency_calls(route.dependant)
+        if get_read_db in calls:
+            assert get_db not in calls, route.path
+
+
+# ── Engine factory ────────────────────────────────────────────────────────
+
+
+def test_create_db_engine_applies_pragmas_to_sqlite(tmp_path):
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'factory.db'}")
+    with eng.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+
+def test_statement_timeout_only_for_postgres(monkeypatch):
+    from sqlalchemy.engine import make_url
+
+    from app.database import session as session_module
+
+    monkeypatch.setattr(session_module.settings, "DB_STATEMENT_TIMEOUT_MS", 15000)
+    pg = session_module._server_connect_args(make_url("postgresql+psycopg://u:p@db/saiyan"))
+    assert pg == {"options": "-c statement_timeout=15000"}
+    assert session_module._server_connect_args(make_url("sqlite:///x.db")) == {}
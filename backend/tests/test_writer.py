@@ -0,0 +1,242 @@
+"""Tests for the single-writer executor — group commit, isolation, backpressure."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database.base import Base
+from app.database.writer import WriteExecutor, WriterBusy, create_writer_engine
+from app.models.category import Category
+from app.models.user import User
+
+import app.models  # noqa: F401
+
+
+@pytest.fixture()
+def writer_engine(tmp_path):
+    eng = create_writer_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as session:
+        session.add(User(username="vegeta"))
+        session.commit()
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture()
+def make_executor(writer_engine):
+    started = []
+
+    def factory(**kwargs) -> WriteExecutor:
+        ex = WriteExecutor(
+            sessionmaker(bind=writer_engine, autoflush=False, expire_on_commit=False),
+            **kwargs,
+        )
+        ex.start()
+        started.append(ex)
+        return ex
+
+    yield factory
+    for ex in started:
+        ex.stop()
+
+
+def _add_category(name: str):
+    def job(db: Session) -> str:
+        user = db.query(User).one()
+        db.add(Category(user_id=user.id, name=name, color_code="#FF0000", icon="*"))
+        db.flush()
+        return name
+
+    return job
+
+
+def _category_names(eng) -> set[str]:
+    with eng.connect() as conn:
+        return set(conn.execute(text("SELECT name FROM categories")).scalars())
+
+
+def _blocker(release: threading.Event, running: threading.Event):
+    def job(db: Session) -> None:
+        running.set()
+        release.wait(5)
+
+    return job
+
+
+def test_runs_job_and_commits(writer_engine, make_executor):
+    ex = make_executor()
+    assert ex.run(_add_category("Training")) == "Training"
+    assert _category_names(writer_engine) == {"Training"}
+    stats = ex.stats()
+    assert (stats["jobs"], stats["commits"]) == (1, 1)
+    assert stats["run_ms_max"] >= 0
+
+
+def test_jobs_queued_together_share_one_commit(writer_engine, make_executor):
+    ex = make_executor()
+    release, running = threading.Event(), threading.Event()
+    first = ex.submit(_blocker(release, running))
+    running.wait(5)
+    futures = [ex.submit(_add_category(f"Cat {i}")) for i in range(5)]
+    release.set()
+
+    assert [f.result(5) for f in futures] == [f"Cat {i}" for i in range(5)]
+    first.result(5)
+    stats = ex.stats()
+    assert stats["commits"] == 2
+    assert stats["max_batch"] == 5
+    assert stats["max_depth"] == 5
+    assert len(_category_names(writer_engine)) == 5
+
+
+def test_failed_job_rolls_back_only_itself(writer_engine, make_executor):
+    ex = make_executor()
+    release, running = threading.Event(), threading.Event()
+    ex.submit(_blocker(release, running))
+    running.wait(5)
+
+    def failing(db: Session):
+        _add_category("Doomed")(db)
+        raise HTTPException(status_code=409, detail="nope")
+
+    ok_before = ex.submit(_add_category("Kept 1"))
+    bad = ex.submit(failing)
+    ok_after = ex.submit(_add_category("Kept 2"))
+    release.set()
+
+    assert ok_before.result(5) == "Kept 1"
+    assert ok_after.result(5) == "Kept 2"
+    with pytest.raises(HTTPException):
+        bad.result(5)
+    assert _category_names(writer_engine) == {"Kept 1", "Kept 2"}
+
+
+def test_failing_check_leaves_other_jobs_in_batch(writer_engine, make_executor):
+    """A check on an unknown habit, or a job rolling back the whole session,
+    must not take healthy jobs in the same batch down with it."""
+    import uuid
+
+    from sqlalchemy.exc import NoResultFound
+
+    from app.services.habit_service import check_habit
+
+    ex = make_executor()
+    release, running = threading.Event(), threading.Event()
+    ex.submit(_blocker(release, running))
+    running.wait(5)
+
+    def bad_check(db: Session):
+        user = db.query(User).one()
+        return check_habit(db, user.id, uuid.uuid4(), "2026-03-04")
+
+    def rolls_back_session(db: Session):
+        _add_category("Doomed")(db)
+        db.rollback()
+        raise HTTPException(status_code=409, detail="nope")
+
+    ok_first = ex.submit(_add_category("Kept 1"))
+    check = ex.submit(bad_check)
+    ok_middle = ex.submit(_add_category("Kept 2"))
+    rogue = ex.submit(rolls_back_session)
+    ok_last = ex.submit(_add_category("Kept 3"))
+    release.set()
+
+    assert [f.result(5) for f in (ok_first, ok_middle, ok_last)] == ["Kept 1", "Kept 2", "Kept 3"]
+    with pytest.raises(NoResultFound):
+        check.result(5)
+    with pytest.raises(HTTPException):
+        rogue.result(5)
+    assert _category_names(writer_engine) == {"Kept 1", "Kept 2", "Kept 3"}
+    assert ex.stats()["jobs"] == 6
+
+
+def test_full_queue_rejects(make_executor):
+    ex = make_executor(max_queue=1)
+    release, running = threading.Event(), threading.Event()
+    ex.submit(_blocker(release, running))
+    running.wait(5)
+    ex.submit(_add_category("Queued"))
+    with pytest.raises(WriterBusy):
+        ex.submit(_add_category("Rejected"))
+    release.set()
+    assert ex.stats()["rejected"] == 1
+
+
+def test_timed_out_job_never_runs(writer_engine, make_executor):
+    ex = make_executor(timeout=0.05)
+    release, running = threading.Event(), threading.Event()
+    ex.submit(_blocker(release, running))
+    running.wait(5)
+    with pytest.raises(WriterBusy):
+        ex.run(_add_category("Too late"))
+    release.set()
+    ex.run(_add_category("On time"))
+    assert _category_names(writer_engine) == {"On time"}
+    assert ex.stats()["timed_out"] == 1
+
+
+def test_concurrent_writers_never_lock(writer_engine, make_executor):
+    ex = make_executor()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        names = list(pool.map(lambda i: ex.run(_add_category(f"Cat {i}")), range(64)))
+    assert len(set(names)) == 64
+    assert len(_category_names(writer_engine)) == 64
+    assert ex.stats()["jobs"] == 64
+
+
+def test_write_endpoints_use_executor(tmp_path):
+    """With an executor installed, check requests commit through it."""
+    from fastapi.testclient import TestClient
+
+    import app.database.writer as writer_module
+    from app.api.deps import get_current_user, get_db
+    from app.main import app as fastapi_app
+    from app.models.habit import Habit
+
+    eng = create_writer_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng, expire_on_commit=False) as session:
+        user = User(username="goku")
+        session.add(user)
+        session.flush()
+        habit = Habit(user_id=user.id, title="Train", attribute="str", start_date="2026-01-01")
+        session.add(habit)
+        session.commit()
+
+    ex = WriteExecutor(sessionmaker(bind=eng, autoflush=False, expire_on_commit=False))
+    ex.start()
+    def override_get_db():
+        with Session(eng) as session:
+            yield session
+
+    fastapi_app.dependency_overrides[get_db] = override_get_db
+    fastapi_app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(fastapi_app) as client:
+            writer_module._executor, previous = ex, writer_module._executor
+            try:
+                resp = client.post(
+                    f"/api/v1/habits/{habit.id}/check", json={"local_date": "2026-03-04"}
+                )
+                missing = client.post(
+                    "/api/v1/habits/00000000-0000-0000-0000-000000000000/check",
+                    json={"local_date": "2026-03-04"},
+                )
+            finally:
+                writer_module._executor = previous
+    finally:
+        fastapi_app.dependency_overrides.clear()
+        ex.stop()
+
+    assert resp.status_code == 200
+    assert resp.json()["is_checking"] is True
+    assert missing.status_code == 404
+    assert ex.stats()["jobs"] == 2
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM habit_logs")).scalar() == 1
+    eng.dispose()
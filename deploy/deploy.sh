@@ -7,10 +7,12 @@ DB_FILE="${BACKEND_DIR}/saiyan_tracker.db"
 
 echo "=== Saiyan Tracker Deploy ==="
 
-# Backup database
+# Backup database — online snapshot through the SQLite backup API, which
+# includes commits still in the WAL and does not stop the running service
 if [ -f "$DB_FILE" ]; then
-    cp "$DB_FILE" "${DB_FILE}.bak"
-    echo "Database backed up to ${DB_FILE}.bak"
+    cd "$BACKEND_DIR"
+    sudo -u saiyan "${PROJECT_DIR}/venv/bin/python" -m app.database.backup \
+        --database "$DB_FILE" --dest "${BACKEND_DIR}/backups"
 fi
 
 # Pull latest code